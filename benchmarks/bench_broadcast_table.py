@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the broadcast representation: one beautified dict per
+broadcast (the former PVRChannelList.beautifyBroadcasts) against
+resources.lib.broadcast_table, on a synthetic EPG.
+
+Both paths start from the parsed JSON-RPC broadcast dicts. The table
+formats only the rows emitted to ListItems (the next EMITTED broadcasts
+of every channel). Memory is what stays allocated after the build.
+
+Run from the addon root:
+    python3 benchmarks/bench_broadcast_table.py [channels] [days]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from resources.lib.broadcast_table import BroadcastTable
+from resources.lib.timeutils import epgToEpoch, formatTime
+
+EMITTED = 20
+TITLES = ['News', 'Weather', 'Tagesschau', 'Sports', 'Movie of the week', 'Documentary'] + \
+         [f'Series {n}' for n in range(200)]
+
+def syntheticEpg(channels, days):
+    start_of_day = int(time.time()) // 86400 * 86400
+    epg = {}
+    for channelid in range(1, channels + 1):
+        start = start_of_day
+        broadcasts = []
+        while start < start_of_day + days * 86400:
+            end = start + random.choice((15, 30, 45, 60, 90, 120)) * 60
+            broadcasts.append({
+                'broadcastid': channelid * 100000 + len(broadcasts),
+                'title': random.choice(TITLES),
+                'episodename': random.choice(('', 'Pilot', 'Part 2')),
+                'runtime': (end - start) // 60,
+                'starttime': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(start)),
+                'endtime': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(end)),
+            })
+            start = end
+        epg[channelid] = broadcasts
+    return epg
+
+def dicts(epg, now):
+    result = {}
+    for channelid, broadcasts in epg.items():
+        beautified = []
+        for bc in broadcasts:
+            starttime = epgToEpoch(bc.get('starttime'))
+            endtime = epgToEpoch(bc.get('endtime'))
+            if starttime is None or endtime is None or endtime < now:
+                continue
+            beautified.append({
+                'id': bc.get('broadcastid', ''),
+                'channel_id': channelid,
+                'title': bc.get('title', ''),
+                'episodename': bc.get('episodename', ''),
+                'runtime': bc.get('runtime', 0),
+                'date': formatTime(starttime, '%a %d.%b'),
+                'starttime': formatTime(starttime),
+                'endtime': formatTime(endtime),
+            })
+        result[channelid] = beautified
+    return result
+
+def table(epg, now):
+    result = {}
+    for channelid, broadcasts in epg.items():
+        result[channelid] = BroadcastTable().extend(channelid, broadcasts)
+    emitted = [result[channelid].format(row) for channelid in result for row in result[channelid].since(now)[:EMITTED]]
+    return result, emitted
+
+def measure(func, epg, now):
+    # timed without tracemalloc, it slows allocations down
+    begin = time.perf_counter()
+    result = func(epg, now)
+    elapsed = time.perf_counter() - begin
+    del result
+    tracemalloc.start()
+    result = func(epg, now)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+def main():
+    channels = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    random.seed(1)
+    epg = syntheticEpg(channels, days)
+    rows = sum(len(broadcasts) for broadcasts in epg.values())
+    now = time.time()
+
+    sample = dict(list(epg.items())[:5])
+    tables, _ = table(sample, now)
+    assert dicts(sample, now) == {channelid: [t.format(row) for row in t.since(now)] for channelid, t in tables.items()}
+
+    print(f'{channels} channels x {days} days, {rows} broadcasts')
+    for name, func in (('dict per broadcast', dicts), ('BroadcastTable', table)):
+        elapsed, retained = measure(func, epg, now)
+        print(f'  {name:<20} build {elapsed * 1000:8.1f} ms   retained {retained / 2**20:7.1f} MiB')
+
+if __name__ == '__main__':
+    main()
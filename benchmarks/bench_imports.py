@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import cost of the addon entry points.
+
+Kodi starts a fresh interpreter for every plugin and script invocation, so
+the modules imported by an entry point are paid for on each widget load.
+Every case is imported in a new interpreter and the best wall time of a
+few runs is reported. The former eager imports of default.py are listed as
+a baseline.
+
+The Kodi modules (xbmc, xbmcgui, ...) are taken from the stand-ins in
+benchmarks/kodi, another directory providing them can be passed with
+--kodi-path or KODI_PATH.
+
+Run from the addon root:
+    python3 benchmarks/bench_imports.py [--kodi-path DIR] [runs]
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+KODI_STANDIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kodi')
+
+# modules imported by an invocation: the entry point and the handler of the route
+CASES = {
+    'plugin.py getnextepisodes': ['plugin', 'resources.lib.next_episodes'],
+    'plugin.py getrunningat': ['plugin', 'resources.lib.pvr_running_at', 'resources.lib.widget_scheduler'],
+    'plugin.py gettimers': ['plugin', 'resources.lib.pvr_timers', 'resources.lib.pvr_channels', 'resources.lib.widget_scheduler'],
+    'plugin.py getbroadcasts': ['plugin', 'resources.lib.pvr_channellist'],
+    'default.py refresh_timers': ['default', 'resources.lib.pvr_timers'],
+    'default.py loadchannelids': ['default', 'resources.lib.pvr_channellist'],
+    'default.py check_includes': ['default', 'resources.lib.menu_datastore', 'resources.lib.widgets_datastore'],
+    'default.py configure_widgets': ['default', 'resources.lib.gui_widgets'],
+    'default.py channelguide': ['default', 'resources.lib.gui_channelguide'],
+    'service.py': ['service'],
+    'eager default.py (baseline)': ['resources.lib.helper', 'resources.lib.gui_menu', 'resources.lib.menu_datastore',
+                                    'resources.lib.gui_widgets', 'resources.lib.widgets_datastore',
+                                    'resources.lib.pvr_running_at', 'resources.lib.pvr_timers',
+                                    'resources.lib.gui_channelguide', 'resources.lib.pvr_channellist'],
+}
+
+TIMER = '''
+import os, sys, time
+os.environ['KODI_STANDIN_ABORT'] = '1'
+sys.path[:0] = {paths!r}
+sys.argv = ['plugin://script.unfussy.helper/', '-1', '']
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+print(time.perf_counter() - start)
+'''
+
+def importTime(modules, paths):
+    script = TIMER.format(paths=paths, modules=modules)
+    proc = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return float(proc.stdout)
+
+def main():
+    args = sys.argv[1:]
+    kodi_path = os.environ.get('KODI_PATH', KODI_STANDIN)
+    if '--kodi-path' in args:
+        pos = args.index('--kodi-path')
+        kodi_path = args[pos + 1]
+        del args[pos:pos + 2]
+    runs = int(args[0]) if args else 5
+    paths = [os.path.abspath(ROOT)] + ([os.path.abspath(kodi_path)] if kodi_path else [])
+
+    print(f'import time per invocation, best of {runs} fresh interpreters')
+    for name, modules in CASES.items():
+        try:
+            best = min(importTime(modules, paths) for _ in range(runs))
+        except RuntimeError as e:
+            print(f'  {name:<32} failed: {e}')
+            continue
+        print(f'  {name:<32} {best * 1000:8.1f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of building the ListItems of the plugin routes.
+
+For every row type of resources.lib.listitems, rows are taken from a
+FakeBackend with the properties the widget projection requests and with
+all properties of the type. Reported per type are items/sec of
+listitems.build for the widget projection and for all fields, and the
+JSON size of a row in both cases. The size of a row is what Kodi
+serializes and the addon parses per row. For movies, tvshows and broadcasts
+the former parsers are measured as well. They set a setInfo dict and join
+the genre, studio and country lists for every row.
+
+The ListItems are the stand-ins of benchmarks/kodi. The times are the
+Python side of the build, Kodi's own work in the setters is not included.
+
+Run from the addon root:
+    python3 benchmarks/bench_listitems.py [rows] [repeat]
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from offline import install
+
+BACKEND = install('medium')
+
+import xbmcgui
+
+from resources.lib import listitems
+from resources.lib.timeutils import epgToEpoch, formatTime
+
+# --- the former parsers of helper.append_items ---
+
+def parse_movies(li, item):
+    cast = [c['name'] for c in item.get('cast', [])]
+    resume = item.get('resume', {})
+    li_item = xbmcgui.ListItem(label=item['title'])
+    li_item.setInfo('video', {
+        'Title': item['title'],
+        'OriginalTitle': item.get('originaltitle', ''),
+        'Year': item.get('year', ''),
+        'Genre': ', '.join(item.get('genre', [])),
+        'Studio': ', '.join(item.get('studio', [])),
+        'Country': ', '.join(item.get('country', [])),
+        'Plot': item.get('plot', ''),
+        'Rating': str(item.get('rating', '')),
+        'Votes': item.get('votes', ''),
+        'MPAA': item.get('mpaa', ''),
+        'Playcount': item.get('playcount', 0),
+        'Cast': cast,
+        'Trailer': item.get('trailer', ''),
+    })
+    li_item.setProperty('resumetime', str(resume.get('position', 0)))
+    li_item.setProperty('totaltime', str(resume.get('total', 0)))
+    li_item.setArt(item.get('art', {}))
+    li.append((item['file'], li_item, False))
+
+def parse_tvshows(li, item):
+    li_item = xbmcgui.ListItem(label=item['title'])
+    li_item.setInfo('video', {
+        'Title': item['title'],
+        'Year': item.get('year', ''),
+        'Genre': ', '.join(item.get('genre', [])),
+        'Plot': item.get('plot', ''),
+        'Rating': str(item.get('rating', '')),
+        'Votes': item.get('votes', ''),
+        'MPAA': item.get('mpaa', ''),
+        'Playcount': item.get('playcount', 0),
+        'Season': item.get('season', 0),
+        'Episode': item.get('episode', 0),
+    })
+    li_item.setArt(item.get('art', {}))
+    li.append((f'videodb://tvshows/titles/{item["tvshowid"]}/', li_item, True))
+
+def parse_broadcast(li, item):
+    li_item = xbmcgui.ListItem(label=item['title'])
+    li_item.setInfo('video', {
+        'Title': item['title'],
+        'Plot': item.get('plot', ''),
+    })
+    li_item.setArt({'icon': item.get('thumbnail', '')})
+    li.append(('', li_item, False))
+
+FORMER = {'movies': parse_movies, 'tvshows': parse_tvshows, 'broadcasts': parse_broadcast}
+
+# --- rows ---
+
+def records(type, count):
+    """count backend records of type, as stored, before projection."""
+    if type == 'movies':
+        source = list(BACKEND.movies.values())
+    elif type in ('tvshows', 'seasons'):
+        source = [dict(show, season=1 + show['tvshowid'] % 5, episode=10, watchedepisodes=3)
+                  for show in BACKEND.tvshows.values()]
+    elif type == 'episodes':
+        source = list(BACKEND.episodes.values())
+    elif type == 'cast':
+        source = next(iter(BACKEND.movies.values()))['cast']
+    elif type == 'timers':
+        source = [dict(timer, channelicon=BACKEND.channels[timer['channelid']]['icon']) for timer in BACKEND.timers.values()]
+    else:
+        source = [bc for channelid in list(BACKEND.channels)[:10] for bc in BACKEND.broadcasts(channelid)]
+    return [dict(source[index % len(source)]) for index in range(count)]
+
+def shape(type, record, properties):
+    """The row as the fetch of the route hands it to listitems.build."""
+    if type == 'broadcasts_short':
+        start = epgToEpoch(record['starttime'])
+        return {'id': record['broadcastid'], 'channel_id': record['channelid'], 'title': record['title'],
+                'episodename': record['episodename'], 'runtime': record['runtime'], 'date': formatTime(start, '%a %d.%b'),
+                'starttime': formatTime(start), 'endtime': formatTime(epgToEpoch(record['endtime']))}
+    if type == 'cast':
+        return record
+    row = BACKEND.project(record, properties, ('label',))
+    for key in ('timerid', 'channelicon', 'seasonid'):
+        if key in record:
+            row[key] = record[key]
+    if type == 'broadcasts':
+        if 'starttime' in row:
+            row['date'] = formatTime(epgToEpoch(row['starttime']), '%d.%m')
+            row['starttime'] = formatTime(epgToEpoch(row['starttime']))
+        if 'endtime' in row:
+            row['endtime'] = formatTime(epgToEpoch(row['endtime']))
+        row['channel'] = BACKEND.channels[record['channelid']]
+    return row
+
+def allProperties(type):
+    return listitems.properties(type, tuple(listitems.FIELDS[type]))
+
+def rate(build, rows, repeat):
+    best = None
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        build(rows)
+        elapsed = time.perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    return len(rows) / best if best else 0.0
+
+def former(type):
+    parser = FORMER[type]
+    def build(rows):
+        items = []
+        for row in rows:
+            parser(items, row)
+        return items
+    return build
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print(f'{count} rows per type, best of {repeat}, items/sec on the stand-in ListItems')
+    print(f'{"type":<17} {"widget/s":>10} {"all/s":>10} {"former/s":>10} {"row B":>8} {"full B":>8} {"fields":>7}')
+    for type in listitems.TYPES:
+        source = records(type, count)
+        projected = [shape(type, record, listitems.properties(type)) for record in source]
+        full = [shape(type, record, allProperties(type)) for record in source]
+        widget_rate = rate(lambda rows: listitems.build(type, rows), projected, repeat)
+        all_rate = rate(lambda rows: listitems.build(type, rows, tuple(listitems.FIELDS[type])), full, repeat)
+        former_rate = f'{rate(former(type), full, repeat):>10.0f}' if type in FORMER else f'{"-":>10}'
+        row_bytes = len(json.dumps(projected)) / count
+        full_bytes = len(json.dumps(full)) / count
+        fields = f'{len(listitems.projection(type))}/{len(listitems.FIELDS[type])}'
+        print(f'{type:<17} {widget_rate:>10.0f} {all_rate:>10.0f} {former_rate} {row_bytes:>8.0f} {full_bytes:>8.0f} {fields:>7}')
+
+if __name__ == '__main__':
+    main()
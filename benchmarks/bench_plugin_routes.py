@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmark of the plugin.py info routes on the offline stand-ins.
+
+Every route is run through plugin.Main as Kodi would invoke it, against a
+FakeBackend at small, medium and large scale, with a JSON-RPC latency per
+call. Each run starts cold (window properties, response cache, channel
+table and index cache cleared), a warm run right after it is served from
+the widget cache like the next refresh of a widget. Reported per route:
+JSON-RPC calls, requests and bytes in both directions, wall time (min and
+median of the cold runs, warm run), peak traced memory and the number of
+ListItems handed to Kodi. The backend answers in the same process, the
+time it spends building responses is part of the wall time and reported
+as backend_ms (last cold run), Kodi does that work outside the addon.
+
+Each scale runs once per jsonrpc_workers value in a fresh interpreter, the
+setting is read when the addon modules are imported. Results are written
+as JSON; with --baseline a previous result file is compared and the exit
+status is 1 if a route got slower than the tolerance or needs more calls.
+
+Run from the addon root:
+    python3 benchmarks/bench_plugin_routes.py [--scales small,medium,large]
+        [--workers 1,4] [--latency 0.002] [--repeat 3]
+        [--output plugin_routes.json] [--baseline FILE] [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ROUTES = ('getnextepisodes', 'getcast', 'getrunningat', 'gettimers', 'getbroadcasts')
+
+# channels a getrunningat widget asks for
+RUNNINGAT_CHANNELS = 50
+
+def routeParams(info, backend):
+    if info == 'getcast':
+        return {'movie': '1'}
+    if info == 'getrunningat':
+        channels = sorted(backend.channels)[:RUNNINGAT_CHANNELS]
+        pointintime = time.strftime('%H:%M', time.localtime(backend.now + 3600))
+        return {'pointintime': pointintime, 'channels': '-'.join(str(channelid) for channelid in channels)}
+    if info == 'getbroadcasts':
+        return {'channelnum': '1', 'channelids': json.dumps({'1': 1})}
+    return {}
+
+def resetSession():
+    """Forgets everything a previous invocation left behind."""
+    import xbmcgui
+    import xbmcplugin
+    from resources.lib.helper import JSON_CACHE
+    from resources.lib.broadcast_index import INDEX_CACHE
+    from resources.lib.pvr_channels import CHANNELS
+    xbmcgui.WINDOWS.clear()
+    xbmcplugin.DIRECTORIES.clear()
+    JSON_CACHE.clear()
+    INDEX_CACHE.indexes.clear()
+    CHANNELS.clear()
+
+def invoke(info, params, handle=1):
+    """One plugin.py invocation, returns the number of ListItems."""
+    import xbmcplugin
+    import plugin
+    sys.argv = ['plugin://script.unfussy.helper/', str(handle), '?' + urlencode(dict(params, info=info))]
+    xbmcplugin.DIRECTORIES.pop(handle, None)
+    plugin.Main()
+    return len(xbmcplugin.DIRECTORIES.get(handle, []))
+
+def measureRoute(info, backend, repeat):
+    params = routeParams(info, backend)
+    cold = []
+    for _ in range(repeat):
+        resetSession()
+        backend.reset()
+        begin = time.perf_counter()
+        listitems = invoke(info, params)
+        cold.append(time.perf_counter() - begin)
+    stats = dict(backend.stats)
+
+    begin = time.perf_counter()
+    invoke(info, params)
+    warm = time.perf_counter() - begin
+
+    # traced separately, tracemalloc slows allocations down
+    resetSession()
+    tracemalloc.start()
+    invoke(info, params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'route': info,
+        'listitems': listitems,
+        'jsonrpc_calls': stats['calls'],
+        'jsonrpc_requests': stats['requests'],
+        'bytes_in': stats['bytes_in'],
+        'bytes_out': stats['bytes_out'],
+        'methods': stats['methods'],
+        'wall_ms_min': round(min(cold) * 1000, 2),
+        'wall_ms_median': round(statistics.median(cold) * 1000, 2),
+        'warm_ms': round(warm * 1000, 2),
+        'backend_ms': round(stats['seconds'] * 1000, 2),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+def runConfiguration(scale, workers, latency, repeat):
+    sys.path.insert(0, BENCH_DIR)
+    from offline import install
+    backend = install(scale, latency, settings={'jsonrpc_workers': workers})
+    results = []
+    for info in ROUTES:
+        result = measureRoute(info, backend, repeat)
+        result.update({'scale': scale, 'workers': workers})
+        results.append(result)
+    return results
+
+def spawn(scale, workers, latency, repeat):
+    command = [sys.executable, os.path.abspath(__file__), '--child', scale, str(workers), str(latency), str(repeat)]
+    proc = subprocess.run(command, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f'{scale}/{workers} workers failed:\n{proc.stderr}')
+    return json.loads(proc.stdout.splitlines()[-1])
+
+def compare(results, baseline, tolerance):
+    """Routes slower than the baseline by more than tolerance or doing more calls."""
+    previous = {(r['scale'], r['workers'], r['route']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get((result['scale'], result['workers'], result['route']))
+        if not before:
+            continue
+        name = f"{result['scale']}/{result['workers']}/{result['route']}"
+        if result['wall_ms_median'] > before['wall_ms_median'] * (1 + tolerance):
+            regressions.append(f"{name}: {before['wall_ms_median']} -> {result['wall_ms_median']} ms")
+        if result['jsonrpc_calls'] > before['jsonrpc_calls']:
+            regressions.append(f"{name}: {before['jsonrpc_calls']} -> {result['jsonrpc_calls']} calls")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark of the plugin.py info routes')
+    parser.add_argument('--scales', default='small,medium,large')
+    parser.add_argument('--workers', default='1,4', help='jsonrpc_workers values to compare')
+    parser.add_argument('--latency', type=float, default=0.002, help='seconds per JSON-RPC call')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='plugin_routes.json')
+    parser.add_argument('--baseline', help='result file of an earlier run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--child', nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        scale, workers, latency, repeat = args.child
+        print(json.dumps(runConfiguration(scale, int(workers), float(latency), int(repeat))))
+        return 0
+
+    results = []
+    print(f'{"scale":<7} {"workers":>7} {"route":<16} {"items":>6} {"calls":>6} {"reqs":>6} '
+          f'{"KiB out":>9} {"min ms":>9} {"med ms":>9} {"warm ms":>8} {"backend":>8} {"peak KiB":>9}')
+    for scale in args.scales.split(','):
+        for workers in (int(value) for value in args.workers.split(',')):
+            for r in spawn(scale, workers, args.latency, args.repeat):
+                results.append(r)
+                print(f"{r['scale']:<7} {r['workers']:>7} {r['route']:<16} {r['listitems']:>6} {r['jsonrpc_calls']:>6} "
+                      f"{r['jsonrpc_requests']:>6} {r['bytes_out'] / 1024:>9.1f} {r['wall_ms_min']:>9.1f} "
+                      f"{r['wall_ms_median']:>9.1f} {r['warm_ms']:>8.1f} {r['backend_ms']:>8.1f} {r['peak_kib']:>9.1f}")
+
+    report = {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'latency': args.latency,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=2)
+    print(f'results written to {args.output}')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        if baseline['meta'].get('latency') != args.latency:
+            print(f"baseline was run with latency {baseline['meta'].get('latency')}, times are not comparable")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
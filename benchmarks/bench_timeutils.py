@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of EPG time handling: the former strptime + utc offset +
+strftime path against resources.lib.timeutils.
+
+Run from the addon root:
+    python3 benchmarks/bench_timeutils.py [rows]
+"""
+
+import calendar
+import os
+import random
+import sys
+import time
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from resources.lib.timeutils import epgToEpoch, formatTime
+
+def syntheticEpg(rows):
+    # broadcasts of 5-120 minutes, one week starting at a full hour
+    start = int(time.time()) // 3600 * 3600
+    times = []
+    for _ in range(rows):
+        end = start + random.randint(1, 24) * 300
+        times.append((time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(start)),
+                      time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(end))))
+        start = end
+    return times
+
+def legacy(times):
+    result = []
+    for str_start, str_end in times:
+        utc_offset = datetime.now() - datetime.utcnow()
+        start = datetime.strptime(str_start, '%Y-%m-%d %H:%M:%S') + utc_offset
+        end = datetime.strptime(str_end, '%Y-%m-%d %H:%M:%S') + utc_offset
+        result.append((start.strftime('%a %d.%b'), start.strftime('%H:%M'), end.strftime('%H:%M')))
+    return result
+
+def reference(times):
+    # exact local times; the legacy path can be off by a minute because
+    # now() - utcnow() is not an exact offset
+    result = []
+    for str_start, str_end in times:
+        start = time.localtime(calendar.timegm(time.strptime(str_start, '%Y-%m-%d %H:%M:%S')))
+        end = time.localtime(calendar.timegm(time.strptime(str_end, '%Y-%m-%d %H:%M:%S')))
+        result.append((time.strftime('%a %d.%b', start), time.strftime('%H:%M', start), time.strftime('%H:%M', end)))
+    return result
+
+def fast(times):
+    result = []
+    for str_start, str_end in times:
+        start = epgToEpoch(str_start)
+        end = epgToEpoch(str_end)
+        result.append((formatTime(start, '%a %d.%b'), formatTime(start), formatTime(end)))
+    return result
+
+def fastParseOnly(times):
+    for str_start, str_end in times:
+        epgToEpoch(str_start)
+        epgToEpoch(str_end)
+
+def legacyParseOnly(times):
+    for str_start, str_end in times:
+        datetime.strptime(str_start, '%Y-%m-%d %H:%M:%S')
+        datetime.strptime(str_end, '%Y-%m-%d %H:%M:%S')
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    times = syntheticEpg(rows)
+    assert reference(times[:1000]) == fast(times[:1000])
+
+    print(f'{rows} EPG rows, best of 5 runs')
+    for name, func in (('strptime parse', legacyParseOnly), ('slice parse', fastParseOnly),
+                       ('strptime parse+format', legacy), ('timeutils parse+format', fast)):
+        best = min(timeit.repeat(lambda: func(times), number=1, repeat=5))
+        print(f'  {name:<24} {best * 1000:9.1f} ms  {rows / best:12,.0f} rows/s')
+
+if __name__ == '__main__':
+    main()
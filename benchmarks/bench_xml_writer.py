@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the include generation: the former ElementTree + indent()
+path against menu_datastore.MenuXMLWriter as shipped, on the stand-ins of
+benchmarks/kodi.
+
+The menu is the default menu of the addon repeated to the requested size,
+labels carry XML special characters. The ElementTree path is the former
+MenuXMLWriter.save, it uses the same action manager, labels and thumb
+sizes as the shipped writer, and both outputs must be identical. The former
+code escaped labels before ElementTree escaped them again, the reference
+leaves the escaping to ElementTree.
+
+Run from the addon root:
+    python3 benchmarks/bench_xml_writer.py [items] [subitems]
+"""
+
+import json
+import os
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from offline import install, ROOT
+
+install()
+
+from resources.lib.menu_actionmanager import MenuActionManager
+from resources.lib.menu_datastore import MenuXMLWriter
+
+def syntheticMenu(items, subitems):
+    """items main menu entries with subitems submenu entries each, cycled
+    from the default menu."""
+    with open(os.path.join(ROOT, 'resources', 'menu_default.json'), encoding='utf-8') as fh:
+        default = json.load(fh)
+    entries = [entry for item in default for entry in [item] + item.get('submenu', [])]
+    def entry(n):
+        return dict(entries[n % len(entries)], label=f'Menu & item <{n}>', submenu=None)
+    return [dict(entry(i), submenu=[entry(i * 1000 + j) for j in range(subitems)]) for i in range(items)]
+
+# --- the former MenuXMLWriter.save ---
+
+def indent(elem, level=0):
+    i = "\n" + level * "  "
+    if len(elem):
+        if not elem.text or not elem.text.strip():
+            elem.text = i + "  "
+        for child in elem:
+            indent(child, level + 1)
+        if not child.tail or not child.tail.strip():
+            child.tail = i
+    if level and (not elem.tail or not elem.tail.strip()):
+        elem.tail = i
+
+def etMenuItem(writer, parent, item, sub_id):
+    am = writer.am
+    actiontype = item.get('actiontype', -1)
+    action = item.get('action', -1)
+    xml_item = ET.SubElement(parent, 'item')
+    ET.SubElement(xml_item, 'label').text = writer.getLabel(item.get('label', ''))
+    ET.SubElement(xml_item, 'thumb').text = item.get('thumb', '')
+    if actiontype > 3:
+        ET.SubElement(xml_item, 'onclick').text = am.getOnClick(actiontype, action)
+    else:
+        ET.SubElement(xml_item, 'onclick', condition=am.getOnClickCond(actiontype)).text = am.getOnClick(actiontype, action)
+        ET.SubElement(xml_item, 'onclick', condition='!' + am.getOnClickCond(actiontype)).text = am.getOnClickAlt(actiontype)
+    ET.SubElement(xml_item, 'property', name='thumbsize').text = f'$NUMBER[{writer.getThumbsize(item)}]'
+    if sub_id != -1:
+        ET.SubElement(xml_item, 'property', name='submenu_id').text = f'$NUMBER[{sub_id}]'
+
+def elementTree(writer, menu):
+    root = ET.Element('includes')
+    content = ET.SubElement(ET.SubElement(root, 'include', name='home_mainmenu_content'), 'content')
+    submenus = ET.SubElement(root, 'include', name='home_mainmenu_submenus')
+    submenu_id = 10
+    for item in menu:
+        if not item.get('visible', True):
+            continue
+        if not item.get('submenu'):
+            etMenuItem(writer, content, item, 0)
+            continue
+        etMenuItem(writer, content, item, submenu_id)
+        ET.SubElement(ET.SubElement(submenus, 'include', content='home_submenu'), 'param', name='id').text = str(submenu_id)
+        sub_content = ET.SubElement(ET.SubElement(root, 'include', name=f'home_submenu_content_id_{submenu_id}'), 'content')
+        for subitem in item['submenu']:
+            if subitem.get('visible', True):
+                etMenuItem(writer, sub_content, subitem, -1)
+        submenu_id += 10
+    indent(root)
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True, method="xml")
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    subitems = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    menu = syntheticMenu(items, subitems)
+    writer = MenuXMLWriter(MenuActionManager())
+    assert elementTree(writer, menu) == writer.build(menu), 'MenuXMLWriter output differs from the ElementTree path'
+
+    print(f'{items} menu items with {subitems} submenu items each, best of 5 runs')
+    for name, func in (('ElementTree + indent', lambda: elementTree(writer, menu)),
+                       ('MenuXMLWriter.build', lambda: writer.build(menu))):
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print(f'  {name:<22} {best * 1000:9.1f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synthetic JSON-RPC backend behind the stand-in xbmc.executeJSONRPC.
+
+FakeBackend generates channels, channel groups, an EPG, timers, a video
+library and a few addons at a configurable scale and answers the JSON-RPC
+methods the addon uses from them, single requests as well as batches.
+Records are projected to the requested properties like Kodi does, so
+response sizes follow the property lists of the addon.
+
+Every executeJSONRPC call sleeps for the configured latency (seconds, or a
+dict by method with a 'default' entry for batches and unlisted methods),
+which releases the GIL like a real round trip to Kodi. Calls, requests,
+bytes in both directions and the seconds spent building the responses
+(without latency) are counted in stats. Methods can be overridden
+or added by assigning handlers: backend.handlers['PVR.GetTimers'] = func,
+where func takes the params dict and returns the result object.
+
+EPG times are UTC strings in the JSON-RPC format, the schedule starts
+PAST_HOURS before the creation of the backend.
+"""
+
+import json
+import random
+import threading
+import time
+
+# channels, EPG days, timers, movies, tv shows, episodes per show
+SCALES = {
+    'small': {'channels': 30, 'days': 2, 'timers': 10, 'movies': 100, 'tvshows': 20, 'episodes': 20},
+    'medium': {'channels': 200, 'days': 7, 'timers': 50, 'movies': 1000, 'tvshows': 100, 'episodes': 40},
+    'large': {'channels': 1000, 'days': 14, 'timers': 200, 'movies': 5000, 'tvshows': 500, 'episodes': 60},
+}
+
+PAST_HOURS = 6
+GROUP_SIZES = (0.2, 0.5)
+INPROGRESS_SHARE = 0.3
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+DURATIONS = (15, 30, 30, 45, 60, 60, 90, 120)
+TITLES = ['News', 'Weather', 'Tagesschau', 'Sports', 'Movie of the week', 'Documentary', 'Quiz'] + \
+         [f'Series {n}' for n in range(300)]
+GENRES = ['Drama', 'Comedy', 'Action', 'Thriller', 'Documentary', 'Animation', 'Crime']
+NAMES = ['Alex', 'Kim', 'Sam', 'Robin', 'Jo', 'Chris', 'Toni', 'Luca', 'Maxi', 'Nico']
+PLOT = 'A synthetic plot line to give the records a realistic size. ' * 4
+
+# ids Kodi always returns in list and detail results
+ID_FIELDS = ('channelid', 'channelgroupid', 'broadcastid', 'timerid', 'movieid', 'tvshowid', 'episodeid', 'addonid', 'type')
+
+def error(code, message):
+    return {'code': code, 'message': message}
+
+class JSONRPCError(Exception):
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+class FakeBackend:
+
+    def __init__(self, scale='small', latency=0.0, seed=1, **sizes):
+        self.sizes = dict(SCALES[scale] if isinstance(scale, str) else scale, **sizes)
+        self.latency = latency
+        self.seed = seed
+        self.now = int(time.time()) // 60 * 60
+        self.epg_start = (self.now - PAST_HOURS * 3600) // 900 * 900
+        self.handlers = {
+            'JSONRPC.Ping': lambda params: 'pong',
+            'PVR.GetChannelGroups': self.getChannelGroups,
+            'PVR.GetChannels': self.getChannels,
+            'PVR.GetChannelDetails': self.getChannelDetails,
+            'PVR.GetBroadcasts': self.getBroadcasts,
+            'PVR.GetBroadcastDetails': self.getBroadcastDetails,
+            'PVR.GetTimers': self.getTimers,
+            'PVR.GetTimerDetails': self.getTimerDetails,
+            'PVR.AddTimer': self.addTimer,
+            'PVR.DeleteTimer': self.deleteTimer,
+            'VideoLibrary.GetMovieDetails': self.getMovieDetails,
+            'VideoLibrary.GetTVShows': self.getTVShows,
+            'VideoLibrary.GetEpisodes': self.getEpisodes,
+            'VideoLibrary.GetEpisodeDetails': self.getEpisodeDetails,
+            'Addons.GetAddons': self.getAddons,
+        }
+        self.lock = threading.Lock()
+        self.epg = {}
+        self.generate()
+        self.reset()
+
+    def reset(self):
+        """Clears the counters in stats."""
+        with self.lock:
+            self.stats = {'calls': 0, 'requests': 0, 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0, 'methods': {}}
+
+    #######################################################################################
+    # Transport
+    #######################################################################################
+
+    def executeJSONRPC(self, raw):
+        begin = time.perf_counter()
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            payload = None
+        if isinstance(payload, list):
+            response = [self.answer(request) for request in payload] if payload else \
+                       {'jsonrpc': '2.0', 'id': None, 'error': error(-32600, 'Invalid request')}
+            methods = [request.get('method') for request in payload if isinstance(request, dict)]
+        elif isinstance(payload, dict):
+            response = self.answer(payload)
+            methods = [payload.get('method')]
+        else:
+            response = {'jsonrpc': '2.0', 'id': None, 'error': error(-32700, 'Parse error')}
+            methods = []
+        text = json.dumps(response)
+        busy = time.perf_counter() - begin
+
+        delay = self.delay(methods)
+        if delay:
+            time.sleep(delay)
+        with self.lock:
+            self.stats['calls'] += 1
+            self.stats['requests'] += len(methods)
+            self.stats['bytes_in'] += len(raw.encode('utf-8'))
+            self.stats['bytes_out'] += len(text.encode('utf-8'))
+            self.stats['seconds'] += busy
+            for method in methods:
+                self.stats['methods'][method] = self.stats['methods'].get(method, 0) + 1
+        return text
+
+    def delay(self, methods):
+        if not isinstance(self.latency, dict):
+            return self.latency
+        if len(methods) == 1:
+            return self.latency.get(methods[0], self.latency.get('default', 0))
+        return self.latency.get('default', 0)
+
+    def answer(self, request):
+        if not isinstance(request, dict) or 'method' not in request:
+            return {'jsonrpc': '2.0', 'id': None, 'error': error(-32600, 'Invalid request')}
+        handler = self.handlers.get(request['method'])
+        if handler is None:
+            return {'jsonrpc': '2.0', 'id': request.get('id'), 'error': error(-32601, 'Method not found.')}
+        try:
+            result = handler(request.get('params') or {})
+        except JSONRPCError as e:
+            return {'jsonrpc': '2.0', 'id': request.get('id'), 'error': error(e.code, str(e))}
+        except (KeyError, TypeError, ValueError) as e:
+            return {'jsonrpc': '2.0', 'id': request.get('id'), 'error': error(-32602, f'Invalid params: {e}')}
+        return {'jsonrpc': '2.0', 'id': request.get('id'), 'result': result}
+
+    #######################################################################################
+    # Data
+    #######################################################################################
+
+    def generate(self):
+        rnd = random.Random(self.seed)
+        self.channels = {}
+        for number in range(1, self.sizes['channels'] + 1):
+            self.channels[number] = {
+                'channelid': number,
+                'label': f'Channel {number}',
+                'channel': f'Channel {number}',
+                'channelnumber': number,
+                'uniqueid': 1000 + number,
+                'icon': f'special://profile/icons/channel_{number}.png',
+                'channeltype': 'tv',
+                'hidden': False,
+                'locked': False,
+            }
+        channelids = list(self.channels)
+        self.groups = {'alltv': {'channelgroupid': 'alltv', 'label': 'All channels', 'channeltype': 'tv', 'channels': channelids}}
+        for index, share in enumerate(GROUP_SIZES, 1):
+            members = sorted(rnd.sample(channelids, max(1, int(len(channelids) * share))))
+            self.groups[index] = {'channelgroupid': index, 'label': f'Group {index}', 'channeltype': 'tv', 'channels': members}
+
+        self.timers = {}
+        for timerid in range(1, self.sizes['timers'] + 1):
+            broadcast = rnd.choice(self.broadcasts(rnd.choice(channelids)))
+            self.addTimerFor(broadcast, timerid)
+
+        self.movies = {}
+        for movieid in range(1, self.sizes['movies'] + 1):
+            self.movies[movieid] = self.mediaRecord(rnd, {'movieid': movieid, 'title': f'Movie {movieid}'})
+        self.tvshows = {}
+        self.episodes = {}
+        episodeid = 0
+        for tvshowid in range(1, self.sizes['tvshows'] + 1):
+            show = self.mediaRecord(rnd, {'tvshowid': tvshowid, 'title': f'Show {tvshowid}', 'lastplayed': ''})
+            show['episodeids'] = []
+            played = rnd.randrange(self.sizes['episodes']) if rnd.random() < INPROGRESS_SHARE else 0
+            for index in range(self.sizes['episodes']):
+                episodeid += 1
+                lastplayed = time.strftime(TIME_FORMAT, time.gmtime(self.now - (tvshowid * 1000 - index) * 60)) if index < played else ''
+                self.episodes[episodeid] = self.mediaRecord(rnd, {
+                    'episodeid': episodeid,
+                    'tvshowid': tvshowid,
+                    'showtitle': show['title'],
+                    'title': f'Episode {index + 1}',
+                    'season': index // 10 + 1,
+                    'episode': index % 10 + 1,
+                    'playcount': 1 if index < played else 0,
+                    'lastplayed': lastplayed,
+                    'firstaired': '2020-01-01',
+                })
+                show['episodeids'].append(episodeid)
+                show['lastplayed'] = max(show['lastplayed'], lastplayed)
+            show['inprogress'] = 0 < played < self.sizes['episodes']
+            self.tvshows[tvshowid] = show
+
+        self.addons = [{'addonid': f'pvr.synthetic{n}', 'type': 'xbmc.pvrclient', 'name': f'PVR {n}', 'enabled': n == 0,
+                        'thumbnail': '', 'path': ''} for n in range(2)] + \
+                      [{'addonid': f'plugin.video.synthetic{n}', 'type': 'xbmc.addon.video', 'name': f'Video addon {n}',
+                        'enabled': True, 'thumbnail': f'special://home/addons/plugin.video.synthetic{n}/icon.png',
+                        'path': ''} for n in range(10)]
+
+    def mediaRecord(self, rnd, record):
+        record.setdefault('label', record['title'])
+        record.update({
+            'originaltitle': record['title'],
+            'year': rnd.randrange(1960, 2025),
+            'genre': rnd.sample(GENRES, 2),
+            'studio': ['Studio'],
+            'country': ['Germany'],
+            'plot': PLOT,
+            'plotoutline': PLOT[:60],
+            'tagline': '',
+            'rating': round(rnd.uniform(3, 9), 1),
+            'votes': str(rnd.randrange(10, 100000)),
+            'mpaa': 'FSK 12',
+            'runtime': rnd.choice(DURATIONS) * 60,
+            'file': f'/media/{record["title"].replace(" ", "_")}.mkv',
+            'trailer': '',
+            'dateadded': '2024-01-01 12:00:00',
+            'imdbnumber': f'tt{rnd.randrange(10**6, 10**7)}',
+            'director': [rnd.choice(NAMES)],
+            'writer': [rnd.choice(NAMES)],
+            'cast': [{'name': f'{rnd.choice(NAMES)} {n}', 'role': f'Role {n}', 'order': n,
+                      'thumbnail': f'image://actor_{n}.jpg/'} for n in range(10)],
+            'art': {'poster': f'image://poster_{record["title"]}.jpg/', 'fanart': f'image://fanart_{record["title"]}.jpg/'},
+            'resume': {'position': 0, 'total': 0},
+            'streamdetails': {'audio': [], 'subtitle': [], 'video': []},
+        })
+        record.setdefault('playcount', 0)
+        record.setdefault('lastplayed', '')
+        return record
+
+    def broadcasts(self, channelid):
+        """EPG of a channel, generated on first use."""
+        epg = self.epg.get(channelid)
+        if epg is not None:
+            return epg
+        rnd = random.Random(self.seed * 100003 + channelid)
+        epg = []
+        start = self.epg_start
+        end_of_epg = self.epg_start + self.sizes['days'] * 86400
+        while start < end_of_epg:
+            runtime = rnd.choice(DURATIONS)
+            end = start + runtime * 60
+            epg.append({
+                'broadcastid': channelid * 100000 + len(epg),
+                'channelid': channelid,
+                'label': rnd.choice(TITLES),
+                'starttime': time.strftime(TIME_FORMAT, time.gmtime(start)),
+                'endtime': time.strftime(TIME_FORMAT, time.gmtime(end)),
+                'start': start,
+                'end': end,
+                'runtime': runtime,
+                'episodename': rnd.choice(('', '', 'Pilot', 'Part 2')),
+                'plot': PLOT,
+                'plotoutline': PLOT[:60],
+                'genre': [rnd.choice(GENRES)],
+                'episodenum': 0,
+                'episodepart': 0,
+                'firstaired': '',
+                'thumbnail': '',
+                'cast': '',
+                'director': '',
+                'year': 0,
+            })
+            epg[-1]['title'] = epg[-1]['label']
+            start = end
+        with self.lock:
+            self.epg[channelid] = epg
+        return epg
+
+    def broadcast(self, broadcastid):
+        channelid, index = divmod(broadcastid, 100000)
+        if channelid not in self.channels:
+            raise JSONRPCError(-32602, 'Invalid params.')
+        epg = self.broadcasts(channelid)
+        if index >= len(epg):
+            raise JSONRPCError(-32602, 'Invalid params.')
+        return epg[index]
+
+    def airing(self, broadcast):
+        now = time.time()
+        runtime = broadcast['end'] - broadcast['start']
+        progress = max(0, min(runtime, now - broadcast['start']))
+        record = dict(broadcast)
+        record.update({
+            'progress': int(progress),
+            'progresspercentage': 100.0 * progress / runtime if runtime else 0.0,
+            'isactive': broadcast['start'] <= now < broadcast['end'],
+            'wasactive': broadcast['end'] <= now,
+            'hastimer': any(timer['broadcastid'] == broadcast['broadcastid'] for timer in self.timers.values()),
+        })
+        return record
+
+    def addTimerFor(self, broadcast, timerid=None):
+        timerid = timerid or max(self.timers, default=0) + 1
+        self.timers[timerid] = {
+            'timerid': timerid,
+            'label': broadcast['label'],
+            'title': broadcast['title'],
+            'summary': '',
+            'channelid': broadcast['channelid'],
+            'broadcastid': broadcast['broadcastid'],
+            'isradio': False,
+            'starttime': broadcast['starttime'],
+            'endtime': broadcast['endtime'],
+            'runtime': broadcast['runtime'],
+            'state': 'scheduled',
+            'istimerrule': False,
+            'ismanual': False,
+            'epgsearchstring': '',
+        }
+        return timerid
+
+    #######################################################################################
+    # Methods
+    #######################################################################################
+
+    def getChannelGroups(self, params):
+        if params.get('channeltype', 'tv') != 'tv':
+            return {'channelgroups': [], 'limits': self.limits(0, 0, 0)}
+        groups = [{'channelgroupid': group['channelgroupid'], 'label': group['label'], 'channeltype': 'tv'}
+                  for group in self.groups.values()]
+        return self.listResult('channelgroups', groups, params, ('label', 'channeltype'))
+
+    def getChannels(self, params):
+        group = self.groups.get(params['channelgroupid'])
+        if group is None:
+            raise JSONRPCError(-32602, 'Invalid params.')
+        channels = [self.channels[channelid] for channelid in group['channels']]
+        return self.listResult('channels', channels, params, ('label',))
+
+    def getChannelDetails(self, params):
+        channel = self.channels.get(params['channelid'])
+        if channel is None:
+            raise JSONRPCError(-32602, 'Invalid params.')
+        record = dict(channel)
+        properties = params.get('properties', [])
+        if 'broadcastnow' in properties or 'broadcastnext' in properties:
+            now = time.time()
+            epg = self.broadcasts(channel['channelid'])
+            current = next((index for index, bc in enumerate(epg) if bc['start'] <= now < bc['end']), None)
+            if current is not None:
+                record['broadcastnow'] = self.project(self.airing(epg[current]), ['title', 'starttime', 'endtime', 'progresspercentage'], ('label',))
+                if current + 1 < len(epg):
+                    record['broadcastnext'] = self.project(self.airing(epg[current + 1]), ['title', 'starttime', 'endtime'], ('label',))
+        return {'channeldetails': self.project(record, properties, ('label',))}
+
+    def getBroadcasts(self, params):
+        if params['channelid'] not in self.channels:
+            raise JSONRPCError(-32602, 'Invalid params.')
+        properties = params.get('properties', [])
+        epg = self.broadcasts(params['channelid'])
+        if any(name in properties for name in ('progress', 'progresspercentage', 'isactive', 'wasactive', 'hastimer')):
+            epg = [self.airing(broadcast) for broadcast in epg]
+        return self.listResult('broadcasts', epg, params, ('label',))
+
+    def getBroadcastDetails(self, params):
+        broadcast = self.airing(self.broadcast(params['broadcastid']))
+        return {'broadcastdetails': self.project(broadcast, params.get('properties', []), ('label',))}
+
+    def getTimers(self, params):
+        return self.listResult('timers', list(self.timers.values()), params, ('label',))
+
+    def getTimerDetails(self, params):
+        timer = self.timers.get(params['timerid'])
+        if timer is None:
+            raise JSONRPCError(-32602, 'Invalid params.')
+        return {'timerdetails': self.project(timer, params.get('properties', []), ('label',))}
+
+    def addTimer(self, params):
+        self.addTimerFor(self.broadcast(params['broadcastid']))
+        return 'OK'
+
+    def deleteTimer(self, params):
+        if self.timers.pop(params['timerid'], None) is None:
+            raise JSONRPCError(-32602, 'Invalid params.')
+        return 'OK'
+
+    def getMovieDetails(self, params):
+        movie = self.movies.get(params['movieid'])
+        if movie is None:
+            raise JSONRPCError(-32602, 'Invalid params.')
+        return {'moviedetails': self.project(movie, params.get('properties', []), ('label',))}
+
+    def getTVShows(self, params):
+        shows = list(self.tvshows.values())
+        query_filter = params.get('filter')
+        if query_filter:
+            shows = [show for show in shows if self.matches(show, query_filter)]
+        sort = params.get('sort')
+        if sort:
+            shows.sort(key=lambda show: show.get(sort['method'], ''), reverse=sort.get('order') == 'descending')
+        return self.listResult('tvshows', shows, params, ('label',))
+
+    def getEpisodes(self, params):
+        show = self.tvshows.get(params.get('tvshowid'))
+        episodes = [self.episodes[episodeid] for episodeid in show['episodeids']] if show else list(self.episodes.values())
+        return self.listResult('episodes', episodes, params, ('label',))
+
+    def getEpisodeDetails(self, params):
+        episode = self.episodes.get(params['episodeid'])
+        if episode is None:
+            raise JSONRPCError(-32602, 'Invalid params.')
+        return {'episodedetails': self.project(episode, params.get('properties', []), ('label',))}
+
+    def getAddons(self, params):
+        addons = [addon for addon in self.addons if params.get('type') in (None, 'unknown', addon['type'])]
+        return self.listResult('addons', addons, params)
+
+    #######################################################################################
+    # Helpers
+    #######################################################################################
+
+    def matches(self, record, query_filter):
+        field, operator = query_filter['field'], query_filter['operator']
+        if field == 'inprogress':
+            return record.get('inprogress', False) == (operator == 'true')
+        if operator == 'is':
+            return str(record.get(field, '')) == str(query_filter['value'])
+        if operator == 'contains':
+            return str(query_filter['value']).lower() in str(record.get(field, '')).lower()
+        raise JSONRPCError(-32602, f'Unsupported filter operator {operator}')
+
+    def project(self, record, properties, always=()):
+        projected = {name: record[name] for name in ID_FIELDS + tuple(always) if name in record}
+        for name in properties:
+            if name in record:
+                projected[name] = record[name]
+        return projected
+
+    def limits(self, start, end, total):
+        return {'start': start, 'end': end, 'total': total}
+
+    def listResult(self, key, records, params, always=()):
+        limits = params.get('limits') or {}
+        start = limits.get('start', 0)
+        end = limits.get('end', -1)
+        end = len(records) if end < 0 else min(end, len(records))
+        properties = params.get('properties', [])
+        return {key: [self.project(record, properties, always) for record in records[start:end]],
+                'limits': self.limits(start, max(start, end), len(records))}
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for the xbmc module, the subset used by the addon.
+
+executeJSONRPC is answered by the FakeBackend in backend (a small one is
+created on first use). Log lines, builtins and conditions are kept in
+module level lists/dicts so runs can be inspected: LOG_LINES, BUILTINS,
+CONDITIONS (condition -> bool) and INFO_LABELS (label -> str). Log lines
+at or above LOG_ECHO are also printed to stderr.
+
+abort_event is what Monitor.abortRequested reports, it starts set if
+KODI_STANDIN_ABORT is set so service.py returns from its loop right away.
+
+notify() posts a notification to all Monitors. Like in Kodi, a Monitor only
+gets its onNotification callbacks while its thread is in waitForAbort.
+"""
+
+import os
+import sys
+import threading
+import time
+import weakref
+
+import xbmcvfs
+
+LOGDEBUG = 0
+LOGINFO = 1
+LOGWARNING = 2
+LOGERROR = 3
+LOGFATAL = 4
+LOGNONE = 7
+
+ISO_639_1 = 0
+ISO_639_2 = 1
+ENGLISH_NAME = 2
+
+LOG_ECHO = LOGERROR
+LOG_LINES = []
+BUILTINS = []
+CONDITIONS = {}
+INFO_LABELS = {}
+
+backend = None
+MONITORS = weakref.WeakSet()
+abort_event = threading.Event()
+if os.environ.get('KODI_STANDIN_ABORT'):
+    abort_event.set()
+
+def getBackend():
+    global backend
+    if backend is None:
+        # imported on first use, the import benchmark doesn't pay for it
+        from kodi_backend import FakeBackend
+        backend = FakeBackend()
+    return backend
+
+def notify(sender, method, data):
+    for monitor in list(MONITORS):
+        monitor._post(sender, method, data)
+
+def executeJSONRPC(jsonrpccommand):
+    return getBackend().executeJSONRPC(jsonrpccommand)
+
+def log(msg, level=LOGDEBUG):
+    LOG_LINES.append((level, msg))
+    if level >= LOG_ECHO:
+        print(msg, file=sys.stderr)
+
+def executebuiltin(function, wait=False):
+    BUILTINS.append(function)
+
+def getCondVisibility(condition):
+    return CONDITIONS.get(condition, False)
+
+def getInfoLabel(cLine):
+    return INFO_LABELS.get(cLine, '')
+
+def getLocalizedString(id):
+    return f'#{id}'
+
+def getLanguage(format=ENGLISH_NAME, region=False):
+    return {ISO_639_1: 'en', ISO_639_2: 'eng'}.get(format, 'English')
+
+def sleep(timemillis):
+    time.sleep(timemillis / 1000.0)
+
+def translatePath(path):
+    return xbmcvfs.translatePath(path)
+
+class Actor:
+
+    def __init__(self, name='', role='', order=-1, thumbnail=''):
+        self.name = name
+        self.role = role
+        self.order = order
+        self.thumbnail = thumbnail
+
+class Monitor:
+
+    # slice of waitForAbort between two abort checks
+    POLL = 0.05
+
+    def __init__(self):
+        self._pending = []
+        self._posted = threading.Event()
+        MONITORS.add(self)
+
+    def _post(self, sender, method, data):
+        self._pending.append((sender, method, data))
+        self._posted.set()
+
+    def _dispatch(self):
+        self._posted.clear()
+        while self._pending:
+            self.onNotification(*self._pending.pop(0))
+
+    def abortRequested(self):
+        return abort_event.is_set()
+
+    def waitForAbort(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            self._dispatch()
+            if abort_event.is_set():
+                return True
+            remaining = self.POLL if deadline is None else deadline - time.time()
+            if remaining <= 0:
+                return False
+            self._posted.wait(min(remaining, self.POLL))
+
+    def onNotification(self, sender, method, data):
+        pass
+
+    def onSettingsChanged(self):
+        pass
+
+class Player:
+
+    def isPlaying(self):
+        return False
+
+    def isPlayingVideo(self):
+        return False
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for the xbmcaddon module.
+
+Addon() describes the addon of this repository: its info comes from
+addon.xml, settings default to resources/settings.xml and can be
+overridden in SETTINGS (id -> value, before the addon modules are
+imported), strings come from the en_gb strings.po.
+"""
+
+import os
+import re
+import xml.etree.ElementTree as ET
+
+ADDON_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+SETTINGS = {}
+
+_info = None
+_strings = None
+
+def addonInfo():
+    global _info
+    if _info is None:
+        root = ET.parse(os.path.join(ADDON_PATH, 'addon.xml')).getroot()
+        _info = {'id': root.get('id'), 'name': root.get('name'), 'version': root.get('version'),
+                 'author': root.get('provider-name'), 'path': ADDON_PATH,
+                 'profile': f'special://profile/addon_data/{root.get("id")}/'}
+        for setting in ET.parse(os.path.join(ADDON_PATH, 'resources', 'settings.xml')).iter('setting'):
+            SETTINGS.setdefault(setting.get('id'), setting.get('default', ''))
+    return _info
+
+def strings():
+    global _strings
+    if _strings is None:
+        path = os.path.join(ADDON_PATH, 'resources', 'language', 'resource.language.en_gb', 'strings.po')
+        with open(path, encoding='utf-8') as fh:
+            _strings = {int(number): text for number, text in re.findall(r'msgctxt "#(\d+)"\s*\nmsgid "(.*)"', fh.read())}
+    return _strings
+
+class Addon:
+
+    def __init__(self, id=None):
+        self.info = addonInfo()
+
+    def getAddonInfo(self, id):
+        return self.info.get(id, '')
+
+    def getLocalizedString(self, id):
+        return strings().get(id, '')
+
+    def getSetting(self, id):
+        return str(SETTINGS.get(id, ''))
+
+    def getSettingBool(self, id):
+        value = SETTINGS.get(id, False)
+        return value if isinstance(value, bool) else str(value).lower() == 'true'
+
+    def getSettingInt(self, id):
+        try:
+            return int(float(SETTINGS.get(id, 0)))
+        except ValueError:
+            return 0
+
+    def getSettingString(self, id):
+        return self.getSetting(id)
+
+    def setSetting(self, id, value):
+        SETTINGS[id] = value
+
+    def setSettingBool(self, id, value):
+        SETTINGS[id] = bool(value)
+
+    def setSettingInt(self, id, value):
+        SETTINGS[id] = int(value)
+
+    def openSettings(self):
+        pass
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for the xbmcgui module.
+
+Window properties are shared per window id in WINDOWS, like the real
+window properties are shared between the Python invocations of a Kodi
+session. Dialogs answer from DIALOG_ANSWERS (method name -> value, or a
+callable taking the call arguments), otherwise like a cancelled dialog,
+and record their calls in DIALOG_CALLS. WindowXMLDialog.doModal runs
+onInit and returns, so the data paths of a GUI can be driven by calling
+its handlers with Action and control ids.
+"""
+
+INPUT_ALPHANUM = 0
+INPUT_NUMERIC = 1
+INPUT_DATE = 2
+INPUT_TIME = 3
+INPUT_IPADDRESS = 4
+INPUT_PASSWORD = 5
+
+NOTIFICATION_INFO = 'info'
+NOTIFICATION_WARNING = 'warning'
+NOTIFICATION_ERROR = 'error'
+
+WINDOWS = {}
+DIALOG_ANSWERS = {}
+DIALOG_CALLS = []
+
+class Window:
+
+    def __init__(self, existingWindowId=-1):
+        self.properties = WINDOWS.setdefault(existingWindowId, {})
+
+    def getProperty(self, key):
+        return self.properties.get(key.lower(), '')
+
+    def setProperty(self, key, value):
+        self.properties[key.lower()] = str(value)
+
+    def clearProperty(self, key):
+        self.properties.pop(key.lower(), None)
+
+    def clearProperties(self):
+        self.properties.clear()
+
+class Action:
+
+    def __init__(self, id, buttoncode=0):
+        self.id = id
+        self.buttoncode = buttoncode
+
+    def getId(self):
+        return self.id
+
+    def getButtonCode(self):
+        return self.buttoncode
+
+class InfoTagVideo:
+    """Keeps whatever its setters are called with, setTitle('x') is read
+    back with getTitle() or values['title']."""
+
+    def __init__(self):
+        self.values = {}
+
+    def __getattr__(self, name):
+        # accessors are added to the class on first use, later lookups cost
+        # what a method lookup on the real InfoTagVideo does
+        key = name[3:].lower()
+        if name.startswith('set'):
+            def accessor(self, value, *args):
+                self.values[key] = (value,) + args if args else value
+        elif name.startswith('get'):
+            def accessor(self):
+                return self.values.get(key, '')
+        else:
+            raise AttributeError(name)
+        setattr(InfoTagVideo, name, accessor)
+        return getattr(self, name)
+
+class ListItem:
+
+    def __init__(self, label='', label2='', path='', offscreen=False):
+        self.label = label
+        self.label2 = label2
+        self.path = path
+        self.offscreen = offscreen
+        self.art = {}
+        self.properties = {}
+        self.info = {}
+        self.selected = False
+        self.videoinfotag = None
+
+    def getLabel(self):
+        return self.label
+
+    def setLabel(self, label):
+        self.label = label
+
+    def getLabel2(self):
+        return self.label2
+
+    def setLabel2(self, label):
+        self.label2 = label
+
+    def getPath(self):
+        return self.path
+
+    def setPath(self, path):
+        self.path = path
+
+    def getArt(self, key):
+        return self.art.get(key, '')
+
+    def setArt(self, dictionary):
+        self.art.update(dictionary)
+
+    def getProperty(self, key):
+        return self.properties.get(key.lower(), '')
+
+    def setProperty(self, key, value):
+        self.properties[key.lower()] = str(value)
+
+    def setProperties(self, dictionary):
+        # one call into Kodi, not one setProperty per key
+        self.properties.update({key.lower(): str(value) for key, value in dictionary.items()})
+
+    def setInfo(self, type, infoLabels):
+        self.info.setdefault(type, {}).update(infoLabels)
+
+    def getVideoInfoTag(self):
+        if self.videoinfotag is None:
+            self.videoinfotag = InfoTagVideo()
+        return self.videoinfotag
+
+    def select(self, selected):
+        self.selected = selected
+
+    def isSelected(self):
+        return self.selected
+
+    def setIsFolder(self, isFolder):
+        self.properties['isfolder'] = str(bool(isFolder)).lower()
+
+    def setContentLookup(self, enable):
+        pass
+
+class Control:
+    """One class for all controls, lists keep their ListItems in items."""
+
+    def __init__(self, controlId):
+        self.controlId = controlId
+        self.items = []
+        self.position = -1
+        self.label = ''
+        self.visible = True
+        self.enabled = True
+        self.selected = False
+        self.x = self.y = self.width = self.height = 0
+
+    def getId(self):
+        return self.controlId
+
+    def addItem(self, item):
+        self.items.append(item if isinstance(item, ListItem) else ListItem(item))
+        if self.position < 0:
+            self.position = 0
+
+    def addItems(self, items):
+        for item in items:
+            self.addItem(item)
+
+    def reset(self):
+        self.items = []
+        self.position = -1
+
+    def size(self):
+        return len(self.items)
+
+    def getListItem(self, index):
+        return self.items[index]
+
+    def getSelectedPosition(self):
+        return self.position
+
+    def getSelectedItem(self):
+        return self.items[self.position] if 0 <= self.position < len(self.items) else None
+
+    def selectItem(self, item):
+        self.position = item
+
+    def setLabel(self, label='', *args, **kwargs):
+        self.label = label
+
+    def getLabel(self):
+        return self.label
+
+    def setVisible(self, visible):
+        self.visible = visible
+
+    def isVisible(self):
+        return self.visible
+
+    def setEnabled(self, enabled):
+        self.enabled = enabled
+
+    def setSelected(self, selected):
+        self.selected = selected
+
+    def isSelected(self):
+        return self.selected
+
+    def setPosition(self, x, y):
+        self.x, self.y = x, y
+
+    def getX(self):
+        return self.x
+
+    def getY(self):
+        return self.y
+
+    def setWidth(self, width):
+        self.width = width
+
+    def setHeight(self, height):
+        self.height = height
+
+    def getWidth(self):
+        return self.width
+
+    def getHeight(self):
+        return self.height
+
+class WindowXML(Window):
+
+    def __init__(self, xmlFilename='', scriptPath='', defaultSkin='Default', defaultRes='720p', isMedia=False):
+        self.standin()
+
+    def standin(self):
+        # subclasses may skip __init__ of the base class
+        state = self.__dict__.get('_standin')
+        if state is None:
+            state = self.__dict__['_standin'] = {'controls': {}, 'focus': 0, 'properties': {}}
+        return state
+
+    def getControl(self, iControlId):
+        return self.standin()['controls'].setdefault(iControlId, Control(iControlId))
+
+    def setFocusId(self, iControlId):
+        self.standin()['focus'] = iControlId
+
+    def setFocus(self, pControl):
+        self.standin()['focus'] = pControl.getId()
+
+    def getFocusId(self):
+        return self.standin()['focus']
+
+    def getProperty(self, key):
+        return self.standin()['properties'].get(key.lower(), '')
+
+    def setProperty(self, key, value):
+        self.standin()['properties'][key.lower()] = str(value)
+
+    def clearProperty(self, key):
+        self.standin()['properties'].pop(key.lower(), None)
+
+    def onInit(self):
+        pass
+
+    def onClick(self, controlId):
+        pass
+
+    def onAction(self, action):
+        pass
+
+    def doModal(self):
+        self.onInit()
+
+    def show(self):
+        self.onInit()
+
+    def close(self):
+        pass
+
+class WindowXMLDialog(WindowXML):
+    pass
+
+class Dialog:
+
+    def answer(self, method, default, *args, **kwargs):
+        DIALOG_CALLS.append((method, args, kwargs))
+        answer = DIALOG_ANSWERS.get(method, default)
+        return answer(*args, **kwargs) if callable(answer) else answer
+
+    def ok(self, heading, message):
+        return self.answer('ok', True, heading, message)
+
+    def yesno(self, heading, message, *args, **kwargs):
+        return self.answer('yesno', False, heading, message, *args, **kwargs)
+
+    def select(self, heading, list, *args, **kwargs):
+        return self.answer('select', -1, heading, list, *args, **kwargs)
+
+    def multiselect(self, heading, options, *args, **kwargs):
+        return self.answer('multiselect', None, heading, options, *args, **kwargs)
+
+    def input(self, heading, defaultt='', type=INPUT_ALPHANUM, *args, **kwargs):
+        return self.answer('input', '', heading, defaultt, type, *args, **kwargs)
+
+    def numeric(self, type, heading, defaultt='', *args, **kwargs):
+        return self.answer('numeric', '', type, heading, defaultt, *args, **kwargs)
+
+    def browse(self, type, heading, shares, *args, **kwargs):
+        return self.answer('browse', '', type, heading, shares, *args, **kwargs)
+
+    def textviewer(self, heading, text, usemono=False):
+        return self.answer('textviewer', None, heading, text, usemono=usemono)
+
+    def notification(self, heading, message, *args, **kwargs):
+        self.answer('notification', None, heading, message, *args, **kwargs)
+
+class DialogProgress:
+
+    def create(self, heading, message=''):
+        pass
+
+    def update(self, percent, message=''):
+        pass
+
+    def iscanceled(self):
+        return False
+
+    def close(self):
+        pass
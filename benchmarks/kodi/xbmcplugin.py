@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for the xbmcplugin module.
+
+The items handed to a plugin handle are kept in DIRECTORIES (handle ->
+list of (url, ListItem, isFolder)), ENDED lists the handles whose
+directory was finished and PROPERTIES the container properties by handle.
+"""
+
+SORT_METHOD_NONE = 0
+SORT_METHOD_LABEL = 1
+
+DIRECTORIES = {}
+ENDED = []
+PROPERTIES = {}
+CONTENT = {}
+
+def addDirectoryItem(handle, url, listitem, isFolder=False, totalItems=0):
+    DIRECTORIES.setdefault(handle, []).append((url, listitem, isFolder))
+    return True
+
+def addDirectoryItems(handle, items, totalItems=0):
+    DIRECTORIES.setdefault(handle, []).extend(items)
+    return True
+
+def endOfDirectory(handle, succeeded=True, updateListing=False, cacheToDisc=True):
+    ENDED.append(handle)
+
+def setContent(handle, content):
+    CONTENT[handle] = content
+
+def setProperty(handle, key, value):
+    PROPERTIES.setdefault(handle, {})[key] = value
+
+def addSortMethod(handle, sortMethod, labelMask='', label2Mask=''):
+    pass
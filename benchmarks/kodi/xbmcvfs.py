@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-in for the xbmcvfs module.
+
+special:// paths are mapped to directories below ROOT, a temporary
+directory unless KODI_STANDIN_HOME is set. The addon modules translate
+their paths at import time, so ROOT has to be changed before they are
+imported.
+"""
+
+import os
+import shutil
+import tempfile
+
+ROOT = os.environ.get('KODI_STANDIN_HOME') or tempfile.mkdtemp(prefix='kodi-standin-')
+
+SPECIAL = ('profile', 'masterprofile', 'home', 'skin', 'temp', 'userdata')
+
+def translatePath(path):
+    path = str(path)
+    if not path.startswith('special:/'):
+        return path
+    special, _, rest = path[len('special:/'):].lstrip('/').partition('/')
+    if special not in SPECIAL:
+        return path
+    translated = os.path.join(ROOT, special, rest)
+    return translated + os.sep if path.endswith('/') and not translated.endswith(os.sep) else translated
+
+def exists(path):
+    return os.path.exists(translatePath(path))
+
+def mkdirs(path):
+    os.makedirs(translatePath(path), exist_ok=True)
+    return True
+
+def mkdir(path):
+    return mkdirs(path)
+
+def delete(path):
+    try:
+        os.remove(translatePath(path))
+    except OSError:
+        return False
+    return True
+
+def rmdir(path, force=False):
+    try:
+        if force:
+            shutil.rmtree(translatePath(path))
+        else:
+            os.rmdir(translatePath(path))
+    except OSError:
+        return False
+    return True
+
+def listdir(path):
+    path = translatePath(path)
+    entries = sorted(os.listdir(path))
+    return ([entry for entry in entries if os.path.isdir(os.path.join(path, entry))],
+            [entry for entry in entries if not os.path.isdir(os.path.join(path, entry))])
+
+def copy(source, destination):
+    shutil.copyfile(translatePath(source), translatePath(destination))
+    return True
+
+class File:
+
+    def __init__(self, filepath, mode=None):
+        self.fh = open(translatePath(filepath), 'wb' if mode == 'w' else 'rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, numBytes=-1):
+        return self.fh.read(numBytes).decode('utf-8')
+
+    def readBytes(self, numBytes=-1):
+        return bytearray(self.fh.read(numBytes))
+
+    def write(self, buffer):
+        self.fh.write(buffer.encode('utf-8') if isinstance(buffer, str) else bytes(buffer))
+        return True
+
+    def size(self):
+        return os.fstat(self.fh.fileno()).st_size
+
+    def close(self):
+        self.fh.close()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Runs the addon outside of Kodi, on the stand-in modules in benchmarks/kodi.
+
+install() puts the addon root and the stand-in package on sys.path and
+connects xbmc.executeJSONRPC to a FakeBackend. It has to be called before
+anything from resources.lib is imported: helper reads the addon settings
+and the datastores translate their paths at import time.
+
+    from offline import install
+    backend = install('medium', latency=0.002, settings={'jsonrpc_workers': 1})
+    from resources.lib.plugin_content import PluginContent
+
+Run from the addon root for a smoke run over the data paths and the
+notification to reload path of the service:
+    python3 benchmarks/offline.py [small|medium|large]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+KODI_PATH = os.path.join(BENCH_DIR, 'kodi')
+
+def install(scale='small', latency=0.0, settings=None, home=None, seed=1):
+    """Makes the stand-in modules importable and returns the FakeBackend
+    answering executeJSONRPC. home is the directory behind special://, a
+    new temporary one by default."""
+    for path in (KODI_PATH, ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    os.environ.setdefault('KODI_STANDIN_HOME', home or tempfile.mkdtemp(prefix='kodi-standin-'))
+
+    import xbmc
+    import xbmcaddon
+    import xbmcvfs
+    from kodi_backend import FakeBackend
+
+    xbmcaddon.addonInfo()
+    xbmcaddon.SETTINGS.update(settings or {})
+    xbmcvfs.mkdirs('special://skin/xml/')
+    xbmc.backend = FakeBackend(scale, latency, seed)
+    return xbmc.backend
+
+def smoke(scale):
+    backend = install(scale)
+
+    import xbmcplugin
+    from resources.lib.plugin_content import PluginContent
+    from resources.lib.widget_scheduler import WidgetScheduler
+    from resources.lib.menu_datastore import MenuDataStore
+    from resources.lib.widgets_datastore import WidgetsDataStore
+    from resources.lib.gui_channelguide import Gui_ChannelGuide
+
+    now = time.strftime('%H:%M', time.localtime(backend.now + 3600))
+    routes = [
+        ('getnextepisodes', {}),
+        ('getcast', {'movie': '1'}),
+        ('getrunningat', {'pointintime': now, 'channels': '-'.join(str(n) for n in range(1, 11))}),
+        ('gettimers', {}),
+        ('getbroadcasts', {'channelnum': '1', 'channelids': '{"1": 1}'}),
+    ]
+    for info, params in routes:
+        backend.reset()
+        begin = time.perf_counter()
+        pc = PluginContent()
+        pc.fetch(info, params)
+        try:
+            items = pc.result()
+        except Exception as e:
+            items = []
+            print(f'  {info}: result() failed: {e!r}')
+        xbmcplugin.addDirectoryItems(-1, items)
+        rows = sum(len(rows) for _, rows in pc.data)
+        print(f'  {info:<16} {rows:5} rows {len(items):5} items {backend.stats["calls"]:4} calls '
+              f'{backend.stats["bytes_out"] / 1024:8.1f} KiB {(time.perf_counter() - begin) * 1000:8.1f} ms')
+
+    begin = time.perf_counter()
+    changed = MenuDataStore().checkXMLIncludes(), WidgetsDataStore().checkXMLIncludes()
+    print(f'  skin includes    changed {changed} {(time.perf_counter() - begin) * 1000:8.1f} ms')
+
+    backend.reset()
+    begin = time.perf_counter()
+    guide = Gui_ChannelGuide('script-channelguide.xml', ROOT)
+    guide.doModal()
+    guide.close()
+    print(f'  channel guide    {guide.getControl(13).size():5} items {backend.stats["calls"]:4} calls '
+          f'{(time.perf_counter() - begin) * 1000:8.1f} ms')
+
+def notificationReload(scale):
+    """Runs the sleep/tick loop of service.py in a thread, sends one
+    Player.OnStop of an episode and checks that it leads to exactly one
+    reload of the next episodes widget within its debounce window. Returns
+    the seconds until the reload."""
+    install(scale)
+
+    import xbmc
+    import xbmcgui
+    from resources.lib.kodi_monitor import KodiMonitor
+    from resources.lib.widget_scheduler import WidgetScheduler, POLICIES, RELOAD_PROPERTY
+
+    win = xbmcgui.Window(10000)
+    scheduler = WidgetScheduler(win, policies={'nextepisodes': POLICIES['nextepisodes']})
+    monitor = KodiMonitor(win=win, scheduler=scheduler)
+    prop = RELOAD_PROPERTY % 'nextepisodes'
+    tokens = []
+    stop = threading.Event()
+
+    def loop():
+        while not stop.is_set():
+            scheduler.tick()
+            token = win.getProperty(prop)
+            if token and token not in tokens:
+                tokens.append(token)
+            scheduler.wait(scheduler.nextWakeup(), monitor)
+
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    # let the loop fall asleep for its full MAX_WAKEUP before notifying
+    time.sleep(0.5)
+    begin = time.time()
+    # delivered to the monitor only while the loop is in monitor.waitForAbort
+    xbmc.notify('xbmc', 'Player.OnStop', json.dumps({'item': {'type': 'episode', 'id': 1}}))
+    debounce = POLICIES['nextepisodes']['debounce']
+    while not tokens and time.time() - begin < debounce + 5:
+        time.sleep(0.05)
+    elapsed = time.time() - begin
+    time.sleep(debounce)
+    stop.set()
+    scheduler.requested.set()
+    thread.join()
+    assert not monitor._pending, 'notification was not delivered'
+    assert len(tokens) == 1, f'expected one reload, got {tokens}'
+    # tick() runs at most MIN_WAKEUP after the debounce deadline
+    assert elapsed <= debounce + 1.5, f'reload {elapsed:.1f}s after the notification'
+    print(f'  notification     1 reload after {elapsed:.1f} s (debounce {debounce} s)')
+    return elapsed
+
+if __name__ == '__main__':
+    smoke(sys.argv[1] if len(sys.argv) > 1 else 'small')
+    notificationReload(sys.argv[1] if len(sys.argv) > 1 else 'small')
@@ -1,19 +1,13 @@
 #!/usr/bin/python
+import time
+STARTED = time.perf_counter()
 import sys
-import xbmcgui, xbmcaddon
+import xbmc, xbmcgui, xbmcaddon
 try:
     from urllib2 import urlparse
 except ImportError:
     import urllib.parse as urlparse
-from resources.lib.helper import *
-from resources.lib.gui_menu import Gui_Menu
-from resources.lib.menu_datastore import MenuDataStore
-from resources.lib.gui_widgets import Gui_Widgets
-from resources.lib.widgets_datastore import WidgetsDataStore
-from resources.lib.pvr_running_at import PVRRunningAt
-from resources.lib.pvr_timers import PVRTimers
-from resources.lib.gui_channelguide import Gui_ChannelGuide
-from resources.lib.pvr_channellist import PVRChannelList
+from resources.lib import perf_report
 #######################################################################################
 
 ADDON     = xbmcaddon.Addon()
@@ -23,64 +17,135 @@ CWD       = ADDON.getAddonInfo('path')
 
 class Main:
 
-    def __init__(self):
+    # action -> handler, the handlers import the modules they need so trivial
+    # actions don't pay for the GUI and datastore modules
+    ACTIONS = {
+        'configure_menu': 'configureMenu',
+        'configure_widgets': 'configureWidgets',
+        'channelguide': 'channelGuide',
+        'loadchannelids': 'loadChannelIds',
+        'info_runningat': 'infoRunningAt',
+        'record_runningat': 'recordRunningAt',
+        'info_timer': 'infoTimer',
+        'refresh_timers': 'refreshTimers',
+        'check_includes': 'checkIncludes',
+        'check_defaultsettings': 'checkDefaultSettings',
+        'dump_jsonrpc_trace': 'dumpJsonrpcTrace',
+        'perf_summary': 'perfSummary',
+    }
+
+    def __init__(self, started=None):
+        # started: when the process began, to time the imports
+        self.report = perf_report.start('script', started)
+        if started:
+            self.report.phase('import')
         self._parse_argv()
         self.action = self.params.get('action')
+        self.report.phase('parse')
         if self.action:
             self.run()
+        self.report.finish(self.action, ' '.join(sys.argv))
 
     def run(self):
-        changed = False
-        if self.action == 'configure_menu':
-            ui= Gui_Menu( "script-configure_menu.xml", CWD )
-            ui.doModal()
-            changed = ui.hasChanged()
-            del ui
-        elif self.action == 'configure_widgets':
-            ui= Gui_Widgets( "script-configure_widgets.xml", CWD )
-            ui.doModal()
-            changed = ui.hasChanged()
-        elif self.action == 'channelguide':
-            xml_file = "script-channelguide.xml"
-            if xbmc.getCondVisibility('Skin.HasSetting(use_channelgroups_fullwidth)'):
-                xml_file = "script-channelguide-hor.xml"
-            ui= Gui_ChannelGuide( xml_file, CWD )
-            ui.doModal()
-        elif self.action == 'loadchannelids':
-            cl = PVRChannelList()
-            cl.setChannelIds()
-        elif self.action == 'info_runningat':
-            running_at = PVRRunningAt()
-            running_at.showInfo(self.params.get('bc_id'), self.params.get('c_id'), 'script-show_info.xml', CWD)
-        elif self.action == 'record_runningat':
-            running_at = PVRRunningAt()
-            running_at.setTimer(self.params.get('bc_id'))
-            timers = PVRTimers()
-            timers.refresh()
-        elif self.action == 'info_timer':
-            timers = PVRTimers()
-            ok = timers.delTimerDialog(self.params.get('timer_id'))
-            if ok:
-                timers.refresh()
-        elif self.action == 'refresh_timers':
-            timers = PVRTimers()
-            timers.refresh()
-        elif self.action == 'check_includes':
-            mds = MenuDataStore()
-            wds = WidgetsDataStore()
-            built_menu_includes = mds.checkXMLIncludes()
-            built_widget_includes = wds.checkXMLIncludes()
-            changed = built_menu_includes or built_widget_includes
-            if not changed:
-                self.setWidgetIds()
-        elif self.action == 'check_defaultsettings':
-            init_done = xbmc.getCondVisibility('Skin.HasSetting(init_done)')
-            if not init_done:
-                self.setSkinDefaults()
-        
+        handler = self.ACTIONS.get(self.action)
+        if not handler:
+            return
+        changed = getattr(self, handler)()
+        self.report.phase('action')
         if changed:
             self.setWidgetIds()
             xbmc.executebuiltin('ReloadSkin()')
+            self.report.phase('reload')
+        # only actions that imported the helper can have made JSON-RPC calls
+        helper = sys.modules.get('resources.lib.helper')
+        if helper:
+            helper.flush_trace()
+
+    def configureMenu(self):
+        from resources.lib.gui_menu import Gui_Menu
+        ui= Gui_Menu( "script-configure_menu.xml", CWD )
+        ui.doModal()
+        changed = ui.hasChanged()
+        del ui
+        return changed
+
+    def configureWidgets(self):
+        from resources.lib.gui_widgets import Gui_Widgets
+        ui= Gui_Widgets( "script-configure_widgets.xml", CWD )
+        ui.doModal()
+        return ui.hasChanged()
+
+    def channelGuide(self):
+        from resources.lib.gui_channelguide import Gui_ChannelGuide
+        xml_file = "script-channelguide.xml"
+        if xbmc.getCondVisibility('Skin.HasSetting(use_channelgroups_fullwidth)'):
+            xml_file = "script-channelguide-hor.xml"
+        ui= Gui_ChannelGuide( xml_file, CWD )
+        ui.doModal()
+
+    def loadChannelIds(self):
+        from resources.lib.pvr_channellist import PVRChannelList
+        cl = PVRChannelList()
+        cl.setChannelIds()
+
+    def infoRunningAt(self):
+        from resources.lib.pvr_running_at import PVRRunningAt
+        running_at = PVRRunningAt()
+        running_at.showInfo(self.params.get('bc_id'), self.params.get('c_id'), 'script-show_info.xml', CWD)
+
+    def recordRunningAt(self):
+        from resources.lib.pvr_running_at import PVRRunningAt
+        from resources.lib.pvr_timers import PVRTimers
+        running_at = PVRRunningAt()
+        running_at.setTimer(self.params.get('bc_id'))
+        timers = PVRTimers()
+        timers.refresh()
+
+    def infoTimer(self):
+        from resources.lib.pvr_timers import PVRTimers
+        timers = PVRTimers()
+        ok = timers.delTimerDialog(self.params.get('timer_id'))
+        if ok:
+            timers.refresh()
+
+    def refreshTimers(self):
+        from resources.lib.pvr_timers import PVRTimers
+        timers = PVRTimers()
+        timers.refresh()
+
+    def checkIncludes(self):
+        from resources.lib.menu_datastore import MenuDataStore
+        from resources.lib.widgets_datastore import WidgetsDataStore
+        mds = MenuDataStore()
+        wds = WidgetsDataStore()
+        built_menu_includes = mds.checkXMLIncludes()
+        built_widget_includes = wds.checkXMLIncludes()
+        changed = built_menu_includes or built_widget_includes
+        if not changed:
+            self.setWidgetIds()
+        return changed
+
+    def dumpJsonrpcTrace(self):
+        import os
+        import xbmcvfs
+        from resources.lib.helper import TRACE, log
+        path = xbmcvfs.translatePath(ADDON.getAddonInfo('profile'))
+        if not xbmcvfs.exists(path):
+            xbmcvfs.mkdirs(path)
+        path = os.path.join(path, 'jsonrpc_trace.json')
+        log(f'dumped {TRACE.dump(path)} traced JSON-RPC calls to {path}', xbmc.LOGINFO, force=True)
+
+    def perfSummary(self):
+        import os
+        text = perf_report.summary()
+        with open(os.path.join(perf_report.statsDirectory(), 'perf_summary.txt'), 'w', encoding='utf-8') as fh:
+            fh.write(text)
+        xbmcgui.Dialog().textviewer(ADDON.getAddonInfo('name'), text, usemono=True)
+
+    def checkDefaultSettings(self):
+        init_done = xbmc.getCondVisibility('Skin.HasSetting(init_done)')
+        if not init_done:
+            self.setSkinDefaults()
 
     def _parse_argv(self):
         try:
@@ -90,6 +155,7 @@ class Main:
             self.params = {}
 
     def setWidgetIds(self):
+        from resources.lib.widgets_datastore import WidgetsDataStore
         wds = WidgetsDataStore()
         wds.loadWidgets()
         widget_timers_id = wds.getWidgetId(0, 4)
@@ -114,4 +180,4 @@ class Main:
 
 #######################################################################################
 if (__name__ == '__main__'):
-    Main()
+    Main(STARTED)
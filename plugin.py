@@ -1,4 +1,6 @@
 #!/usr/bin/python
+import time
+STARTED = time.perf_counter()
 import sys
 import xbmcgui
 import xbmcplugin
@@ -6,40 +8,60 @@ try:
     from urllib2 import urlparse
 except ImportError:
     import urllib.parse as urlparse
-from resources.lib.helper import *
+from resources.lib import perf_report
+from resources.lib.helper import flush_trace, invocation_name
 from resources.lib.plugin_content import PluginContent
+from resources.lib.widget_cache import WidgetCache
 #######################################################################################
 
 class Main:
 
-    def __init__(self):
+    def __init__(self, started=None):
+        # started: when the process began, to time the imports
+        self.report = perf_report.start('plugin', started)
+        if started:
+            self.report.phase('import')
         self._parse_argv()
         self.info = self.params.get('info')
+        self.report.phase('parse')
         if self.info:
             self.LoadInfos()
+        self.report.finish(self.info, invocation_name())
 
     def LoadInfos(self):
         pc = PluginContent()
-        if self.info == 'getnextepisodes':
-            pc.fetchNextEpisodes()
-        elif self.info == 'getcast':
-            pc.fetchActors(self.params.get('movie'), self.params.get('tvshow'))
-        if self.info == 'getrunningat':
-            pc.fetchRunningAt(self.params.get('pointintime'), self.params.get('channels'))
-        elif self.info == 'gettimers':
-            pc.fetchTimers()
-        elif self.info == 'getbroadcasts':
+        if self.info == 'getbroadcasts':
             xbmcgui.Window(10700).setProperty('channel_change', 'true')
-            channel_ids = self.params.get('channelids')
-            if not channel_ids:
+            if not self.params.get('channelids'):
                 xbmcgui.Window(10700).clearProperty('channel_change')
                 return
-            pc.fetchBroadcasts(self.params.get('channelnum'), json.loads(channel_ids))
 
-        xbmcplugin.addDirectoryItems(self.widget_handle, pc.result())
+        # result sets prefetched by the service only need to be turned into ListItems
+        cache = WidgetCache()
+        data = cache.get(self.info, self.params)
+        if data is not None:
+            pc.load(data)
+            self.report.set('source', 'cache')
+            self.report.phase('cache')
+        else:
+            if pc.fetch(self.info, self.params):
+                cache.put(self.info, self.params, pc.data)
+            self.report.set('source', 'fetch')
+            self.report.phase('fetch')
+
+        items = pc.result()
+        self.report.set('listitems', len(items))
+        self.report.phase('build_items')
+        xbmcplugin.addDirectoryItems(self.widget_handle, items)
+        self.report.phase('addDirectoryItems')
         xbmcplugin.endOfDirectory(handle=self.widget_handle)
+        self.report.phase('endOfDirectory')
+
+        flush_trace()
 
         if self.info == 'getbroadcasts':
+            # the skin appends &page=<broadcasts_nextpage> to page on
+            xbmcgui.Window(10700).setProperty('broadcasts_nextpage', pc.nextPage(self.params))
             xbmcgui.Window(10700).clearProperty('channel_change')
 
     def _parse_argv(self):
@@ -53,4 +75,4 @@ class Main:
 #######################################################################################
 
 if __name__ == '__main__':
-    Main()
+    Main(STARTED)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sorted interval index over the broadcasts of one channel.
+
+Broadcasts are stored as (start, end, item) with start/end in epoch seconds,
+sorted by start. A running maximum of the end times keeps the lookups correct
+even if the EPG of a channel contains overlapping entries.
+"""
+
+from bisect import bisect_left, bisect_right
+
+class BroadcastIndex:
+
+    def __init__(self, rows):
+        """rows: iterable of (start, end, item) tuples."""
+        rows = sorted(rows, key=lambda row: row[0])
+        self.starts = [row[0] for row in rows]
+        self.ends = [row[1] for row in rows]
+        self.items = [row[2] for row in rows]
+        self.max_ends = []
+        max_end = None
+        for end in self.ends:
+            max_end = end if max_end is None or end > max_end else max_end
+            self.max_ends.append(max_end)
+
+    def __len__(self):
+        return len(self.items)
+
+    def at(self, time_point):
+        """Item running at time_point (start < time_point < end), the latest
+        starting one if several overlap, None if there is none."""
+        i = bisect_left(self.starts, time_point) - 1
+        while i >= 0 and self.max_ends[i] > time_point:
+            if self.ends[i] > time_point:
+                return self.items[i]
+            i -= 1
+        return None
+
+    def overlapping(self, start, end):
+        """Items intersecting the open interval (start, end), in start order."""
+        lo = bisect_right(self.max_ends, start)
+        hi = bisect_left(self.starts, end)
+        return [self.items[i] for i in range(lo, hi) if self.ends[i] > start]
+
+class BroadcastIndexCache:
+    """Keeps built indexes (or BroadcastTables carrying one) per channel as
+    long as their source is unchanged.
+
+    The stamp identifies the data an index was built from, e.g. the time the
+    channel was last synced into the EPG store.
+    """
+
+    def __init__(self, max_channels=1000):
+        self.max_channels = max_channels
+        self.indexes = {}
+
+    def get(self, channelid, stamp):
+        entry = self.indexes.get(channelid)
+        if entry and stamp is not None and entry[0] == stamp:
+            return entry[1]
+        return None
+
+    def put(self, channelid, stamp, index):
+        if stamp is None:
+            return
+        if len(self.indexes) >= self.max_channels and channelid not in self.indexes:
+            self.indexes.clear()
+        self.indexes[channelid] = (stamp, index)
+
+# module state: the service process reuses the indexes across its ticks
+# (widget prefetch), a plugin invocation is a fresh interpreter and starts
+# with an empty cache
+INDEX_CACHE = BroadcastIndexCache()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Column-oriented broadcast rows.
+
+A BroadcastTable keeps broadcasts in parallel columns: ids, epoch times and
+runtimes in arrays, titles and episode names as interned strings. Rows are
+only turned into dicts when they are emitted (record, format), so a
+multi-day EPG costs a few arrays instead of one or two dicts per broadcast.
+"""
+
+import sys
+from array import array
+
+from resources.lib.broadcast_index import BroadcastIndex
+from resources.lib.timeutils import epgToEpoch, formatTime
+
+class BroadcastTable:
+
+    __slots__ = ('broadcastids', 'channelids', 'starts', 'ends', 'runtimes', 'titles', 'episodenames', '_index')
+
+    def __init__(self):
+        self.broadcastids = array('q')
+        self.channelids = array('i')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.runtimes = array('i')
+        self.titles = []
+        self.episodenames = []
+        self._index = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def append(self, broadcastid, channelid, start, end, title='', episodename='', runtime=0):
+        self.broadcastids.append(broadcastid)
+        self.channelids.append(channelid)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.runtimes.append(runtime or 0)
+        self.titles.append(sys.intern(title or ''))
+        self.episodenames.append(sys.intern(episodename or ''))
+        self._index = None
+
+    def extend(self, channelid, broadcasts):
+        """Appends JSON-RPC broadcast dicts of a channel, rows without valid times are skipped."""
+        for bc in broadcasts:
+            start = epgToEpoch(bc.get('starttime'))
+            end = epgToEpoch(bc.get('endtime'))
+            if start is None or end is None:
+                continue
+            self.append(bc.get('broadcastid', 0), channelid, start, end,
+                        bc.get('title', ''), bc.get('episodename', ''), bc.get('runtime', 0))
+        return self
+
+    def extendRows(self, rows):
+        """Appends (broadcastid, channelid, start, end, title, episodename, runtime) rows."""
+        for row in rows:
+            self.append(*row)
+        return self
+
+    @property
+    def index(self):
+        """BroadcastIndex over the rows, its items are row numbers."""
+        if self._index is None:
+            self._index = BroadcastIndex(zip(self.starts, self.ends, range(len(self))))
+        return self._index
+
+    def since(self, time_point):
+        """Numbers of the rows not ended before time_point, in table order."""
+        return [row for row, end in enumerate(self.ends) if end >= time_point]
+
+    def window(self, since, until=None, limit=None, offset=0):
+        """Numbers of the rows ending after since and starting before until,
+        at most limit of them from offset on, like EpgStore.getBroadcastTable."""
+        rows = [row for row in range(len(self))
+                if self.ends[row] > since and (until is None or self.starts[row] < until)]
+        return rows[offset:] if limit is None else rows[offset:offset + limit]
+
+    def record(self, row):
+        return {
+            'broadcastid': self.broadcastids[row],
+            'channelid': self.channelids[row],
+            'start': self.starts[row],
+            'end': self.ends[row]
+        }
+
+    def format(self, row):
+        """The row as shown in the broadcast lists, times formatted in local time."""
+        start = self.starts[row]
+        return {
+            'id': self.broadcastids[row],
+            'channel_id': self.channelids[row],
+            'title': self.titles[row],
+            'episodename': self.episodenames[row],
+            'runtime': self.runtimes[row],
+            'date': formatTime(start, '%a %d.%b'),
+            'starttime': formatTime(start),
+            'endtime': formatTime(self.ends[row]),
+        }
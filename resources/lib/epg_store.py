@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local EPG store.
+
+Broadcasts are kept in a SQLite database in the addon_data folder, indexed
+on (channelid, starttime). The service keeps it up to date with EpgSync, a
+few channels per tick, and the plugin paths read from it instead of pulling
+the whole EPG of a channel over JSON-RPC.
+"""
+
+import os
+import sqlite3
+import time
+
+import xbmc
+import xbmcaddon
+import xbmcvfs
+
+from resources.lib.helper import *
+from resources.lib.broadcast_table import BroadcastTable
+from resources.lib.timeutils import epgToEpoch
+
+ADDON = xbmcaddon.Addon()
+ADDONID = ADDON.getAddonInfo('id')
+
+DBPATH = xbmcvfs.translatePath(f"special://profile/addon_data/{ADDONID}/epg.db")
+
+# a channel is resynced after SYNC_INTERVAL seconds, and its data is not used
+# anymore when the last sync is older than MAX_AGE seconds
+SYNC_INTERVAL = 3600
+MAX_AGE = 3 * SYNC_INTERVAL
+CHANNELS_PER_TICK = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS broadcasts (
+    broadcastid INTEGER PRIMARY KEY,
+    channelid INTEGER NOT NULL,
+    starttime INTEGER NOT NULL,
+    endtime INTEGER NOT NULL,
+    title TEXT,
+    episodename TEXT,
+    runtime INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_broadcasts_channel_start ON broadcasts (channelid, starttime);
+CREATE TABLE IF NOT EXISTS channels (
+    channelid INTEGER PRIMARY KEY,
+    synced INTEGER NOT NULL
+);
+"""
+
+# a window of the broadcasts of a channel; LIMIT -1 is no limit
+SELECT_BROADCASTS = """
+SELECT broadcastid, channelid, starttime, endtime, title, episodename, runtime
+FROM broadcasts
+WHERE channelid = ? AND endtime > ? AND starttime < ?
+ORDER BY starttime
+LIMIT ? OFFSET ?
+"""
+
+# upper bound of an open window
+END_OF_TIME = 2 ** 62
+
+class EpgStore:
+
+    def __init__(self, path=DBPATH):
+        self.path = path
+        self.db = None
+
+    def connect(self):
+        if self.db:
+            return self.db
+        base_path = os.path.dirname(self.path)
+        if not xbmcvfs.exists(base_path):
+            xbmcvfs.mkdirs(base_path)
+        # monitor callbacks may run on another thread than the service loop
+        self.db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        # WAL lets plugin invocations read while the service is writing
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+        return self.db
+
+    def close(self):
+        if self.db:
+            self.db.close()
+            self.db = None
+
+    def isSynced(self, channelid, max_age=MAX_AGE):
+        return self.syncedAt(channelid, max_age) is not None
+
+    def syncedAt(self, channelid, max_age=MAX_AGE):
+        """Time of the last sync of a channel, None if it is older than max_age."""
+        row = self.connect().execute('SELECT synced FROM channels WHERE channelid = ?', (channelid,)).fetchone()
+        if row and row['synced'] > time.time() - max_age:
+            return row['synced']
+        return None
+
+    def getBroadcastTable(self, channelid, since=None, until=None, limit=None, offset=0):
+        """BroadcastTable of a channel with the broadcasts ending after since
+        (default: past ones included) and starting before until, at most limit
+        rows from offset on. None if the channel is not synced."""
+        try:
+            if not self.isSynced(channelid):
+                return None
+            since = 0 if since is None else since
+            until = END_OF_TIME if until is None else until
+            limit = -1 if limit is None else limit
+            rows = self.connect().execute(SELECT_BROADCASTS, (channelid, since, until, limit, offset))
+            return BroadcastTable().extendRows(rows)
+        except sqlite3.Error as e:
+            log(f"EpgStore.getBroadcastTable: {e}", xbmc.LOGWARNING)
+            return None
+
+    def staleChannels(self, channelids, limit):
+        synced = dict(self.connect().execute('SELECT channelid, synced FROM channels').fetchall())
+        threshold = time.time() - SYNC_INTERVAL
+        stale = [channelid for channelid in channelids if synced.get(channelid, 0) < threshold]
+        stale.sort(key=lambda channelid: synced.get(channelid, 0))
+        return stale[:limit]
+
+    def replaceChannel(self, channelid, broadcasts):
+        rows = []
+        for bc in broadcasts:
+            start = epgToEpoch(bc.get('starttime'))
+            end = epgToEpoch(bc.get('endtime'))
+            if start is None or end is None or 'broadcastid' not in bc:
+                continue
+            rows.append((bc['broadcastid'], channelid, start, end,
+                         bc.get('title', ''), bc.get('episodename', ''), bc.get('runtime', 0)))
+        db = self.connect()
+        with db:
+            db.execute('DELETE FROM broadcasts WHERE channelid = ?', (channelid,))
+            db.executemany('INSERT OR REPLACE INTO broadcasts VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            db.execute('INSERT OR REPLACE INTO channels VALUES (?, ?)', (channelid, int(time.time())))
+
+    def purge(self, before):
+        db = self.connect()
+        with db:
+            db.execute('DELETE FROM broadcasts WHERE endtime < ?', (before,))
+
+    def invalidate(self):
+        db = self.connect()
+        with db:
+            db.execute('UPDATE channels SET synced = 0')
+
+class EpgSync:
+    """Keeps the EpgStore up to date from the service loop."""
+
+    def __init__(self, store=None):
+        self.store = store or EpgStore()
+
+    def tick(self):
+        try:
+            channelids = self.channelIds()
+            if not channelids:
+                return 0
+            stale = self.store.staleChannels(channelids, CHANNELS_PER_TICK)
+            if stale:
+                self.syncChannels(stale)
+            self.store.purge(int(time.time()) - 3600)
+            return len(stale)
+        except sqlite3.Error as e:
+            log(f"EpgSync: database error: {e}", xbmc.LOGWARNING)
+            return 0
+
+    def syncChannels(self, channelids):
+        requests = [json_request('PVR.GetBroadcasts', properties=broadcast_properties_short, params={'channelid': channelid})
+                    for channelid in channelids]
+        for channelid, query in zip(channelids, json_batch(requests)):
+            try:
+                broadcasts = query['result']['broadcasts']
+            except (KeyError, TypeError):
+                continue
+            self.store.replaceChannel(channelid, broadcasts)
+        log(f"EpgSync: synced {len(channelids)} channels", xbmc.LOGDEBUG)
+
+    def channelIds(self):
+        query = json_call('PVR.GetChannels', params={'channelgroupid': 'alltv'})
+        try:
+            return [channel['channelid'] for channel in query['result']['channels']]
+        except (KeyError, TypeError):
+            return []
+
+    def onNotification(self, method):
+        if method in ('PVR.OnScanFinished', 'PVR.OnCleaned', 'PVR.OnChannelsChanged'):
+            self.store.invalidate()
@@ -1,36 +1,74 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import threading
+import time
+
 import xbmc
 import xbmcgui
 import xbmcvfs
 import xbmcaddon
 from resources.lib.helper import *
+from resources.lib.pvr_channels import CHANNELS
+from resources.lib.timeutils import epgToEpoch, formatTime
 
 ADDON = xbmcaddon.Addon()
 
+# channels whose now/next details are fetched in one batch
+PAGE_SIZE = 20
+# seconds between two progress updates of the shown group
+TICK_INTERVAL = 30
+
 class Gui_ChannelGuide(xbmcgui.WindowXMLDialog):
+    """
+    The channel lists are loaded into the shared channel table without
+    broadcasts when the guide opens.
+    The ListItems of a group are created as placeholders (name, icon,
+    number) when the group is shown, the now/next details of the visible
+    page are fetched right away and the remaining pages are filled by a
+    background thread, nearest to the selected channel first. A second
+    thread updates the progress of the shown group from the broadcast times
+    and moves the next broadcast up once the current one has ended.
+    """
 
     def __init__(self, *args, **kwargs):
         self.channelgroups = None
         self.detail_active = False
+        self.details = {}
+        self.closed = threading.Event()
+        self.fill_lock = threading.Lock()
+        self.fill_event = threading.Event()
+        self.fill_group = -1
+        self.fill_thread = None
         self.channels_loaded = self.loadChannels()
 
     def loadChannels(self):
         if not self.loadChannelGroups():
             return False
-        for index, group in enumerate(self.channelgroups):
-            try:
-                query = json_call('PVR.GetChannels',
-                                  properties=channeldetail_properties,
-                                  params={'channelgroupid': group['channelgroupid']})
-                self.channelgroups[index]['channels'] = query['result']['channels']
-                self.channelgroups[index]['channellistitems'] = None
-            except Exception as e:
-                log(f'error loading channels: {e}', xbmc.LOGWARNING)
-                return False
+        if not CHANNELS.loadGroups([group['channelgroupid'] for group in self.channelgroups]):
+            log('error loading channels', xbmc.LOGWARNING)
+            return False
+        for group in self.channelgroups:
+            group['channels'] = CHANNELS.group(group['channelgroupid'])
+            group['channellistitems'] = None
+            group['filled'] = set()
+            group['airing'] = {}
         return True
 
+    def fetchDetails(self, channelids):
+        """Now/next details by channelid, fetched in one batch for the ids not seen before."""
+        missing = [channelid for channelid in channelids if channelid not in self.details]
+        requests = [json_request('PVR.GetChannelDetails',
+                                 properties=channeldetail_properties,
+                                 params={'channelid': channelid})
+                    for channelid in missing]
+        for channelid, query in zip(missing, json_batch(requests, cache=False)):
+            try:
+                self.details[channelid] = query['result']['channeldetails']
+            except (KeyError, TypeError):
+                log(f'error loading details of channel {channelid}: {query.get("error")}', xbmc.LOGWARNING)
+        return {channelid: self.details[channelid] for channelid in channelids if channelid in self.details}
+
     def loadChannelGroups(self):
         try:
             query = json_call('PVR.GetChannelGroups', params={'channeltype': 'tv'})
@@ -63,6 +101,7 @@ class Gui_ChannelGuide(xbmcgui.WindowXMLDialog):
         self.positionChannellist()
         self.list_channels.selectItem(self.channel_index)
         self.setFocusId(13)
+        threading.Thread(target=self.tickBackground, daemon=True).start()
         xbmc.executebuiltin('ClearProperty(loadingchannels,10608)')
 
     def onClick(self, control_id):
@@ -70,7 +109,17 @@ class Gui_ChannelGuide(xbmcgui.WindowXMLDialog):
             return
         group_index = self.list_channelgroups.getSelectedPosition()
         channel_index = self.list_channels.getSelectedPosition()
-        channel_uid = self.channelgroups[group_index]['channels'][channel_index]['broadcastnow']['channeluid']
+        channelid = self.channelgroups[group_index]['channels'][channel_index]['channelid']
+        details = self.fetchDetails([channelid]).get(channelid)
+        if not details:
+            return
+        # placeholder rows and channels without a current broadcast have no
+        # broadcastnow, the uid of the channel itself is the same
+        broadcast_now = details.get('broadcastnow') or {}
+        channel_uid = broadcast_now.get('channeluid') or details.get('uniqueid')
+        if not channel_uid:
+            log(f'onClick: no uid of channel {channelid}', xbmc.LOGWARNING)
+            return
         xbmc.executebuiltin('SetProperty(noslide,true,10608)')
         self.setProperty('noslide', 'true')
         xbmc.sleep(10)
@@ -90,6 +139,8 @@ class Gui_ChannelGuide(xbmcgui.WindowXMLDialog):
             func()
 
     def _close(self):
+        self.closed.set()
+        self.fill_event.set()
         self.clearProperty('showdetail')
         self.close()
         xbmc.executebuiltin('Action(Close,10608)')
@@ -152,11 +203,95 @@ class Gui_ChannelGuide(xbmcgui.WindowXMLDialog):
         self.list_channels.selectItem(self.channel_index)
 
     def renderChannels(self):
-        if not self.channelgroups[self.group_index]['channellistitems']:
+        group = self.channelgroups[self.group_index]
+        if group['channellistitems'] is None:
             self.setChannelListItems()
         self.list_channels.reset()
-        for item in self.channelgroups[self.group_index]['channellistitems']:
-            self.list_channels.addItem(item)
+        self.list_channels.addItems(group['channellistitems'])
+        page_start = max(0, self.channel_index - PAGE_SIZE // 2)
+        self.fillChannels(self.group_index, page_start, page_start + PAGE_SIZE)
+        self.tick()
+        self.startFill()
+
+    def startFill(self):
+        self.fill_group = self.group_index
+        if self.fill_thread is None:
+            self.fill_thread = threading.Thread(target=self.fillBackground, daemon=True)
+            self.fill_thread.start()
+        self.fill_event.set()
+
+    def fillBackground(self):
+        monitor = xbmc.Monitor()
+        while not self.closed.is_set() and not monitor.abortRequested():
+            self.fill_event.wait()
+            self.fill_event.clear()
+            while not self.closed.is_set() and not monitor.abortRequested():
+                # the group may change while filling, it is read again for every page
+                group_index = self.fill_group
+                page_start = self.nextPage(group_index)
+                if page_start is None:
+                    break
+                self.fillChannels(group_index, page_start, page_start + PAGE_SIZE)
+
+    def nextPage(self, group_index):
+        """Start of the unfilled page nearest to the selected channel, None if the group is complete."""
+        group = self.channelgroups[group_index]
+        num_channels = len(group['channels'])
+        if len(group['filled']) >= num_channels:
+            return None
+        center = self.channel_index if group_index == self.group_index else 0
+        pages = sorted(range(0, num_channels, PAGE_SIZE), key=lambda start: abs(start + PAGE_SIZE // 2 - center))
+        with self.fill_lock:
+            for start in pages:
+                if any(index not in group['filled'] for index in range(start, min(start + PAGE_SIZE, num_channels))):
+                    return start
+        return None
+
+    def fillChannels(self, group_index, start, end):
+        group = self.channelgroups[group_index]
+        with self.fill_lock:
+            indexes = [index for index in range(start, min(end, len(group['channels']))) if index not in group['filled']]
+            group['filled'].update(indexes)
+        if not indexes:
+            return
+        details = self.fetchDetails([group['channels'][index]['channelid'] for index in indexes])
+        for index in indexes:
+            channel = details.get(group['channels'][index]['channelid'])
+            if channel:
+                self.setChannelDetails(group, index, channel)
+
+    def tickBackground(self):
+        monitor = xbmc.Monitor()
+        while not self.closed.wait(TICK_INTERVAL) and not monitor.abortRequested():
+            self.tick()
+
+    def tick(self, now=None):
+        """Updates progress and now/next of the shown group from the cached broadcast times."""
+        now = now or time.time()
+        group = self.channelgroups[self.group_index]
+        for index, airing in list(group['airing'].items()):
+            listitem = group['channellistitems'][index]
+            if airing['next'] and airing['end'] and now >= airing['end']:
+                self.rollBroadcast(listitem, airing)
+            progress = self.progress(airing, now)
+            if progress != airing['progress']:
+                airing['progress'] = progress
+                listitem.setProperty('progress', str(progress))
+
+    def rollBroadcast(self, listitem, airing):
+        next_ = airing['next']
+        self.setBroadcastProperties(listitem, 'now', next_)
+        self.setBroadcastProperties(listitem, 'next', {})
+        listitem.setProperty('isrecording', str(next_.get('hastimer', False)))
+        airing['start'] = epgToEpoch(next_.get('starttime', ''))
+        airing['end'] = epgToEpoch(next_.get('endtime', ''))
+        airing['next'] = None
+
+    def progress(self, airing, now):
+        start, end = airing['start'], airing['end']
+        if not start or not end or end <= start:
+            return airing['progress']
+        return min(100, max(0, int((now - start) * 100 / (end - start))))
 
     def renderChannelGroups(self):
         for index, group in enumerate(self.channelgroups):
@@ -181,50 +316,48 @@ class Gui_ChannelGuide(xbmcgui.WindowXMLDialog):
         self.list_channels.setPosition(x, y)
 
     def setChannelListItems(self):
-        self.channelgroups[self.group_index]['channellistitems'] = []
-        utc_offset = getUtcOffset()
+        listitems = []
         for channel in self.channelgroups[self.group_index]['channels']:
-            try:
-                now = channel['broadcastnow']
-                next_ = channel['broadcastnext']
-                listitem = xbmcgui.ListItem(channel['label'])
-                listitem.setArt({'icon': channel['icon']})
-                listitem.setProperty('channelnumber', str(channel['channelnumber']))
-                listitem.setProperty('isrecording', str(now.get('hastimer', False)))
-                listitem.setProperty('progress', str(int(now.get('progresspercentage', 0))))
-                listitem.setProperty('now_title', now.get('title', ''))
-                listitem.setProperty('now_episodename', now.get('episodename', ''))
-                listitem.setProperty('now_episodenum', str(now.get('episodenum', '')))
-                listitem.setProperty('now_year', str(now.get('year', '')))
-                listitem.setProperty('now_director', now.get('director', ''))
-                listitem.setProperty('now_genre', ', '.join(now.get('genre', [])))
-                listitem.setProperty('now_cast', now.get('cast', ''))
-                listitem.setProperty('now_plot', now.get('plot', ''))
-                st = getTimeFromString(now['starttime'], '%Y-%m-%d %H:%M:%S', utc_offset)
-                et = getTimeFromString(now['endtime'], '%Y-%m-%d %H:%M:%S', utc_offset)
-                listitem.setProperty('now_starttime', st.strftime('%H:%M') if st else '')
-                listitem.setProperty('now_endtime', et.strftime('%H:%M') if et else '')
-                listitem.setProperty('now_runtime', str(now.get('runtime', '')))
-
-                listitem.setProperty('next_title', next_.get('title', ''))
-                listitem.setProperty('next_episodename', next_.get('episodename', ''))
-                listitem.setProperty('next_episodenum', str(next_.get('episodenum', '')))
-                listitem.setProperty('next_year', str(next_.get('year', '')))
-                listitem.setProperty('next_director', next_.get('director', ''))
-                listitem.setProperty('next_genre', ', '.join(next_.get('genre', [])))
-                listitem.setProperty('next_cast', next_.get('cast', ''))
-                listitem.setProperty('next_plot', next_.get('plot', ''))
-                stn = getTimeFromString(next_['starttime'], '%Y-%m-%d %H:%M:%S', utc_offset)
-                etn = getTimeFromString(next_['endtime'], '%Y-%m-%d %H:%M:%S', utc_offset)
-                listitem.setProperty('next_starttime', stn.strftime('%H:%M') if stn else '')
-                listitem.setProperty('next_endtime', etn.strftime('%H:%M') if etn else '')
-                listitem.setProperty('next_runtime', str(next_.get('runtime', '')))
-
-                if channel['channelnumber'] == self.active_channel_number:
-                    listitem.select(True)
-                self.channelgroups[self.group_index]['channellistitems'].append(listitem)
-            except Exception as e:
-                log(f'no epg for channel: {e}', xbmc.LOGWARNING)
+            listitem = xbmcgui.ListItem(channel['label'])
+            listitem.setArt({'icon': channel['icon']})
+            listitem.setProperty('channelnumber', str(channel['channelnumber']))
+            if channel['channelnumber'] == self.active_channel_number:
+                listitem.select(True)
+            listitems.append(listitem)
+        self.channelgroups[self.group_index]['channellistitems'] = listitems
+
+    def setChannelDetails(self, group, index, channel):
+        listitem = group['channellistitems'][index]
+        try:
+            now = channel['broadcastnow']
+            next_ = channel['broadcastnext']
+            progress = int(now.get('progresspercentage', 0))
+            listitem.setProperty('isrecording', str(now.get('hastimer', False)))
+            listitem.setProperty('progress', str(progress))
+            self.setBroadcastProperties(listitem, 'now', now)
+            self.setBroadcastProperties(listitem, 'next', next_)
+        except Exception as e:
+            log(f'no epg for channel: {e}', xbmc.LOGWARNING)
+            return
+        group['airing'][index] = {
+            'start': epgToEpoch(now.get('starttime', '')),
+            'end': epgToEpoch(now.get('endtime', '')),
+            'next': next_,
+            'progress': progress
+        }
+
+    def setBroadcastProperties(self, listitem, prefix, broadcast):
+        listitem.setProperty(f'{prefix}_title', broadcast.get('title', ''))
+        listitem.setProperty(f'{prefix}_episodename', broadcast.get('episodename', ''))
+        listitem.setProperty(f'{prefix}_episodenum', str(broadcast.get('episodenum', '')))
+        listitem.setProperty(f'{prefix}_year', str(broadcast.get('year', '')))
+        listitem.setProperty(f'{prefix}_director', broadcast.get('director', ''))
+        listitem.setProperty(f'{prefix}_genre', ', '.join(broadcast.get('genre', [])))
+        listitem.setProperty(f'{prefix}_cast', broadcast.get('cast', ''))
+        listitem.setProperty(f'{prefix}_plot', broadcast.get('plot', ''))
+        listitem.setProperty(f'{prefix}_starttime', formatTime(epgToEpoch(broadcast.get('starttime', ''))))
+        listitem.setProperty(f'{prefix}_endtime', formatTime(epgToEpoch(broadcast.get('endtime', ''))))
+        listitem.setProperty(f'{prefix}_runtime', str(broadcast.get('runtime', '')))
 
     def getActiveChannelNumber(self):
         try:
@@ -234,10 +367,11 @@ class Gui_ChannelGuide(xbmcgui.WindowXMLDialog):
             return -1
 
     def getActiveChannelIndex(self):
+        # the first group of the guide in which the playing number exists
         for index, group in enumerate(self.channelgroups):
-            for index_channel, channel in enumerate(group['channels']):
-                if channel['channelnumber'] == self.active_channel_number:
-                    return (index, index_channel)
+            index_channel = CHANNELS.locate(group['channelgroupid'], self.active_channel_number)
+            if index_channel is not None:
+                return (index, index_channel)
         return (-1, -1)
 
     def switchChannel(self, channel_uid):
@@ -75,7 +75,7 @@ class Gui_Menu(xbmcgui.WindowXMLDialog):
                 self.setDetail()
 
     def hasChanged(self):
-        return self.menu.changed
+        return self.menu.includes_changed
 
     def setMenuIndex(self):
         self.index_menu = self.control_menu.getSelectedPosition()
@@ -11,6 +11,7 @@ from resources.lib.helper import *
 from resources.lib.widgets_datastore import WidgetsDataStore
 from resources.lib.widget_manager import WidgetManager
 from resources.lib.addon_paths_manager import AddonPathManager
+from resources.lib.pvr_channels import CHANNELS
 
 ADDON = xbmcaddon.Addon()
 
@@ -83,7 +84,7 @@ class Gui_Widgets(xbmcgui.WindowXMLDialog):
                 self.setDetail()
 
     def hasChanged(self):
-        return self.widgets.changed
+        return self.widgets.includes_changed
 
     def renderWidgets(self):
         self.control_widgets.reset()
@@ -286,15 +287,7 @@ class ChannelSelector:
         return time_new
 
     def loadChannels(self):
-        query = json_call('PVR.GetChannels',
-                    properties=['icon', 'channelnumber'],
-                    params={'channelgroupid': 'alltv'}
-                )
-        try:
-            channels = query['result']['channels']
-        except Exception:
-            return []
-        return channels
+        return CHANNELS.group('alltv')
 
     def getListitems(self, channels):
         items = []
@@ -312,15 +305,8 @@ class ChannelSelector:
         return channel_ids
 
     def getChannelIndexes(self, channels, channel_ids):
-        channel_indexes = []
-        for channel_id in channel_ids:
-            i = 0
-            for channel in channels:
-                if channel['channelid'] == channel_id:
-                    channel_indexes.append(i)
-                    break
-                i += 1
-        return channel_indexes
+        positions = {channel['channelid']: index for index, channel in enumerate(channels)}
+        return [positions[channel_id] for channel_id in channel_ids if channel_id in positions]
 
 ############################################################################
 # AddonSelector
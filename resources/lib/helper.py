@@ -2,17 +2,23 @@
 # -*- coding: utf-8 -*-
 """
 Helper utilities for Kodi 21 (Omega)
-Provides logging, JSON-RPC calls, XML escaping, and media parsing functions.
+Provides logging, JSON-RPC calls and XML escaping, the ListItems of the
+plugin routes are built in listitems.
 """
 
 import xbmc
 import xbmcaddon
 import xbmcgui
 import xbmcvfs
+import hashlib
 import json
+import os
 import time
 import xml.sax.saxutils
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from resources.lib import perf_report
+from resources.lib.json_cache import ResponseCache
+from resources.lib.jsonrpc_trace import CallTrace, invocation_name
 
 # --- Addon Initialization ---
 ADDON = xbmcaddon.Addon()
@@ -20,6 +26,13 @@ ADDON_ID = ADDON.getAddonInfo('id')
 
 LOG_ENABLED = ADDON.getSettingBool('log')
 DEBUGLOG_ENABLED = ADDON.getSettingBool('debuglog')
+JSONRPC_WORKERS = max(1, ADDON.getSettingInt('jsonrpc_workers'))
+
+# batches are only split into parts of at least this many requests
+MIN_BATCH_CHUNK = 5
+
+JSON_CACHE = ResponseCache()
+TRACE = CallTrace(ADDON.getSettingBool('jsonrpc_trace'))
 
 # --- Utility Functions ---
 
@@ -29,15 +42,43 @@ def encode4XML(value):
         return xml.sax.saxutils.escape(value)
     return value
 
+def write_if_changed(path, content):
+    """Writes content (bytes) to path unless the file already holds the same
+    bytes. The file is replaced atomically through a temp file, so the skin
+    never reads a partial include. Returns True if the file was written."""
+    path = str(path)
+    digest = hashlib.sha1(content).digest()
+    try:
+        with open(path, 'rb') as fh:
+            if hashlib.sha1(fh.read()).digest() == digest:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as fh:
+        fh.write(content)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+    return True
+
 def log(txt, loglevel=xbmc.LOGINFO, force=False):
     """Custom logger respecting addon settings."""
     if ((loglevel in [xbmc.LOGINFO, xbmc.LOGWARNING] and LOG_ENABLED) or 
         (loglevel == xbmc.LOGDEBUG and DEBUGLOG_ENABLED) or force):
         xbmc.log(f"[ {ADDON_ID} ] {txt}", level=loglevel)
 
-def json_call(method, properties=None, sort=None, query_filter=None, limit=None, params=None, item=None):
-    """Performs a Kodi JSON-RPC call and returns the parsed result."""
-    json_string = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': {}}
+def flush_trace():
+    """Logs the JSON-RPC summary of the invocation and adds its calls to the
+    shared trace, a no-op unless the jsonrpc_trace setting is on."""
+    summary = TRACE.flush(invocation_name())
+    if summary:
+        log(summary, xbmc.LOGINFO, force=True)
+
+def json_request(method, properties=None, sort=None, query_filter=None, limit=None, params=None, item=None, id=1):
+    """Builds a JSON-RPC 2.0 request object without sending it."""
+    json_string = {'jsonrpc': '2.0', 'id': id, 'method': method, 'params': {}}
 
     if properties is not None:
         json_string['params']['properties'] = properties
@@ -52,49 +93,169 @@ def json_call(method, properties=None, sort=None, query_filter=None, limit=None,
     if params is not None:
         json_string['params'].update(params)
 
-    raw = json.dumps(json_string)
-    result = json.loads(xbmc.executeJSONRPC(raw))
+    return json_string
+
+def json_call(method, properties=None, sort=None, query_filter=None, limit=None, params=None, item=None, cache=True):
+    """Performs a Kodi JSON-RPC call and returns the parsed result.
+
+    Responses of the methods listed in json_cache.METHOD_TTLS are served
+    from JSON_CACHE while they are valid, unless cache is False.
+    """
+    request = json_request(method, properties, sort, query_filter, limit, params, item)
+    cache_key = JSON_CACHE.key(request) if cache else None
+    result = JSON_CACHE.get(cache_key)
+    if result is not None:
+        if DEBUGLOG_ENABLED:
+            log(f'json-call (cached): {cache_key}', xbmc.LOGDEBUG)
+        if TRACE.enabled:
+            TRACE.record(method, cache='hit')
+        return result
+
+    raw = json.dumps(request)
+    started = time.perf_counter()
+    response = xbmc.executeJSONRPC(raw)
+    elapsed = time.perf_counter() - started
+    perf_report.REPORT.note('jsonrpc', elapsed)
+    result = json.loads(response)
+    JSON_CACHE.put(cache_key, request, result, response)
 
-    log(f'json-call: {raw}', xbmc.LOGDEBUG)
-    log(f'json-result: {result}', xbmc.LOGDEBUG)
+    if TRACE.enabled:
+        TRACE.record(method, elapsed, len(raw), len(response), 'miss' if cache_key else 'off')
+    # results can be huge, they are only formatted for the debug log
+    if DEBUGLOG_ENABLED:
+        log(f'json-call: {raw}', xbmc.LOGDEBUG)
+        log(f'json-result: {result}', xbmc.LOGDEBUG)
 
     return result
 
+def run_parallel(funcs, workers=None):
+    """Calls the argument-less funcs on up to workers threads (default: the
+    jsonrpc_workers setting) and returns their results in order. Meant for
+    independent JSON-RPC calls, executeJSONRPC doesn't hold the GIL while
+    Kodi answers."""
+    workers = min(workers or JSONRPC_WORKERS, len(funcs))
+    if workers <= 1:
+        return [func() for func in funcs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda func: func(), funcs))
+
+def json_send(batch, caller=None):
+    """Sends a list of request objects in one executeJSONRPC call, returns the list of responses."""
+    raw = json.dumps(batch)
+    started = time.perf_counter()
+    response = xbmc.executeJSONRPC(raw)
+    elapsed = time.perf_counter() - started
+    perf_report.REPORT.note('jsonrpc', elapsed)
+    try:
+        responses = json.loads(response)
+    except ValueError as e:
+        log(f'json-batch: invalid response: {e}', xbmc.LOGWARNING)
+        responses = []
+    if isinstance(responses, dict):
+        # a malformed batch is answered with a single error object
+        responses = [responses]
+
+    if TRACE.enabled:
+        TRACE.recordBatch(batch, elapsed, len(raw), len(response), caller)
+    if DEBUGLOG_ENABLED:
+        log(f'json-batch: {len(batch)} calls: {raw}', xbmc.LOGDEBUG)
+        log(f'json-batch-result: {responses}', xbmc.LOGDEBUG)
+    return responses
+
+def json_batch(requests, cache=True, workers=None):
+    """Sends several requests built by json_request in one executeJSONRPC call.
+
+    Responses are correlated by id and returned in request order, each one
+    shaped like a json_call result. Failed or missing responses come back as
+    {'error': ...} so callers can keep using their usual result checks.
+    Cached responses are answered from JSON_CACHE and left out of the batch,
+    unless cache is False. Large batches are split into up to workers parts
+    sent concurrently.
+    """
+    results = [None] * len(requests)
+    cache_keys = [None] * len(requests)
+    # the parts are sent from pool threads, the call site is taken here
+    caller = TRACE.caller() if TRACE.enabled else None
+    batch = []
+    for index, request in enumerate(requests):
+        cache_keys[index] = JSON_CACHE.key(request) if cache else None
+        results[index] = JSON_CACHE.get(cache_keys[index])
+        if results[index] is not None and TRACE.enabled:
+            TRACE.record(request['method'], cache='hit')
+        if results[index] is None:
+            request = dict(request)
+            request['id'] = index
+            batch.append(request)
+    if not batch:
+        return results
+
+    parts = max(1, min(workers or JSONRPC_WORKERS, len(batch) // MIN_BATCH_CHUNK))
+    size = -(-len(batch) // parts)
+    chunks = [batch[start:start + size] for start in range(0, len(batch), size)]
+    responses = []
+    for chunk_responses in run_parallel([lambda chunk=chunk: json_send(chunk, caller) for chunk in chunks], parts):
+        responses.extend(chunk_responses)
+
+    for response in responses:
+        index = response.get('id') if isinstance(response, dict) else None
+        if isinstance(index, int) and 0 <= index < len(results) and results[index] is None:
+            results[index] = response
+            JSON_CACHE.put(cache_keys[index], requests[index], response)
+    for index, response in enumerate(results):
+        if response is None:
+            results[index] = {'error': {'code': -32603, 'message': 'no response in batch'}}
+    return results
+
 def visible(condition):
     """Returns whether a Kodi condition is visible."""
     return xbmc.getCondVisibility(condition)
 
-def pvrAvailable():
-    """Checks if PVR is initialized and ready."""
-    retries = 0
-    while retries < 50:
-        channels = json_call('PVR.GetChannels', limit=1, params={'channelgroupid': 'alltv'})
-        try:
-            channel_id = channels['result']['channels'][0]['channelid']
-            broadcast = json_call('PVR.GetBroadcasts', params={'channelid': channel_id}, limit=1)
-            if 'broadcasts' in broadcast.get('result', {}):
-                xbmc.sleep(200)
-                log("pvrAvailable: success.")
-                return True
-        except Exception:
-            log("pvrAvailable: retry...", xbmc.LOGWARNING)
-            xbmc.sleep(500)
-            retries += 1
-    return False
+# readiness of PVR as published by the service (see pvr_state.PVRReadiness)
+PVR_STATE_PROPERTY = 'unfussy.pvr.state'
+PVR_READY_PROPERTY = 'unfussy.pvr.ready'
+PVR_WAIT_TIMEOUT = 10
 
-def getTimeFromString(str_time, format, utc_offset=None):
-    """Parses a time string and applies UTC offset."""
+def pvrProbe():
+    """Asks PVR once whether channels and EPG are available."""
+    channels = json_call('PVR.GetChannels', limit=1, params={'channelgroupid': 'alltv'}, cache=False)
     try:
-        dt = datetime.strptime(str_time, format)
-        if utc_offset:
-            dt += utc_offset
-        return dt
-    except ValueError:
-        return None
+        channel_id = channels['result']['channels'][0]['channelid']
+        broadcast = json_call('PVR.GetBroadcasts', params={'channelid': channel_id}, limit=1)
+        return 'broadcasts' in broadcast.get('result', {})
+    except Exception:
+        return False
+
+def pvrAvailable(timeout=PVR_WAIT_TIMEOUT):
+    """Checks if PVR is initialized and ready.
 
-def getUtcOffset():
-    """Returns the local UTC offset."""
-    return datetime.now() - datetime.utcnow()
+    The service publishes the readiness of PVR, so this is a property lookup.
+    While the service still waits for PVR, the readiness is awaited for at
+    most timeout seconds. Without a running service PVR is probed once.
+    The service itself passes timeout=0: it publishes the readiness from its
+    own loop, waiting there would only block that loop.
+    """
+    started = time.perf_counter()
+    available = pvrAwait(timeout)
+    perf_report.REPORT.note('pvr_wait', time.perf_counter() - started)
+    return available
+
+def pvrAwait(timeout):
+    win = xbmcgui.Window(10000)
+    if win.getProperty(PVR_READY_PROPERTY):
+        return True
+    if not win.getProperty(PVR_STATE_PROPERTY):
+        return pvrProbe()
+    if timeout <= 0:
+        return False
+    monitor = xbmc.Monitor()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if monitor.waitForAbort(0.2):
+            return False
+        if win.getProperty(PVR_READY_PROPERTY):
+            return True
+    log("pvrAvailable: pvr not ready", xbmc.LOGWARNING)
+    return False
 
 # --- Media Properties ---
 
@@ -105,72 +266,35 @@ movie_properties = [
     'writer', 'cast', 'dateadded', 'imdbnumber'
 ]
 
-def append_items(li, json_query, type):
-    """Appends media items to a Kodi list based on media type."""
-    parsers = {
-        'movies': parse_movies,
-        'tvshows': parse_tvshows,
-        'seasons': parse_seasons,
-        'episodes': parse_episodes,
-        'broadcasts': parse_broadcast,
-    }
-    if type in parsers:
-        for item in json_query:
-            parsers[type](li, item)
-    else:
-        log(f"append_items: unsupported type '{type}'", xbmc.LOGWARNING)
-
-# --- Media Parsers ---
-
-def parse_movies(li, item):
-    cast = [c['name'] for c in item.get('cast', [])]
-    resume = item.get('resume', {})
-    li_item = xbmcgui.ListItem(label=item['title'])
-    li_item.setInfo('video', {
-        'Title': item['title'],
-        'OriginalTitle': item.get('originaltitle', ''),
-        'Year': item.get('year', ''),
-        'Genre': ', '.join(item.get('genre', [])),
-        'Studio': ', '.join(item.get('studio', [])),
-        'Country': ', '.join(item.get('country', [])),
-        'Plot': item.get('plot', ''),
-        'Rating': str(item.get('rating', '')),
-        'Votes': item.get('votes', ''),
-        'MPAA': item.get('mpaa', ''),
-        'Playcount': item.get('playcount', 0),
-        'Cast': cast,
-        'Trailer': item.get('trailer', ''),
-    })
-    li_item.setProperty('resumetime', str(resume.get('position', 0)))
-    li_item.setProperty('totaltime', str(resume.get('total', 0)))
-    li_item.setArt(item.get('art', {}))
-    li.append((item['file'], li_item, False))
-
-def parse_tvshows(li, item):
-    li_item = xbmcgui.ListItem(label=item['title'])
-    li_item.setInfo('video', {
-        'Title': item['title'],
-        'Year': item.get('year', ''),
-        'Genre': ', '.join(item.get('genre', [])),
-        'Plot': item.get('plot', ''),
-        'Rating': str(item.get('rating', '')),
-        'Votes': item.get('votes', ''),
-        'MPAA': item.get('mpaa', ''),
-        'Playcount': item.get('playcount', 0),
-        'Season': item.get('season', 0),
-        'Episode': item.get('episode', 0),
-    })
-    li_item.setArt(item.get('art', {}))
-    li.append((f'videodb://tvshows/titles/{item["tvshowid"]}/', li_item, True))
-
-def parse_broadcast(li, item):
-    li_item = xbmcgui.ListItem(label=item['title'])
-    li_item.setInfo('video', {
-        'Title': item['title'],
-        'Plot': item.get('plot', ''),
-    })
-    li_item.setArt({'icon': item.get('thumbnail', '')})
-    li.append(('', li_item, False))
+episode_properties = [
+    'title', 'playcount', 'season', 'episode', 'showtitle', 'plot', 'file',
+    'rating', 'resume', 'tvshowid', 'art', 'streamdetails', 'firstaired',
+    'runtime', 'writer', 'cast', 'dateadded', 'lastplayed'
+]
+
+broadcast_properties = [
+    'title', 'plot', 'plotoutline', 'starttime', 'endtime', 'runtime',
+    'progress', 'progresspercentage', 'genre', 'episodename', 'episodenum',
+    'episodepart', 'firstaired', 'hastimer', 'isactive', 'wasactive',
+    'thumbnail', 'cast', 'director', 'year'
+]
+
+broadcast_properties_short = [
+    'title', 'starttime', 'endtime', 'runtime', 'episodename'
+]
+
+channel_properties = [
+    'channel', 'channelnumber', 'icon', 'channeltype', 'hidden', 'locked'
+]
+
+channeldetail_properties = [
+    'channel', 'channelnumber', 'icon', 'uniqueid', 'broadcastnow', 'broadcastnext'
+]
+
+timer_properties = [
+    'title', 'summary', 'channelid', 'isradio', 'starttime', 'endtime',
+    'runtime', 'state', 'istimerrule', 'ismanual', 'epgsearchstring'
+]
 
 # --- Entry Point ---
 
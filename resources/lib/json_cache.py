@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Response cache for Kodi JSON-RPC calls.
+
+Responses are keyed on the canonicalised method and params and kept in a
+bounded LRU. Each cached method has its own TTL and belongs to a domain
+(pvr, video, addons). Invalidations bump a per-domain generation stored as a
+property of the home window, so a notification seen by the service also
+invalidates the entries of plugin and script processes. Responses are stored
+serialised, so every hit hands out a fresh copy the caller may modify.
+
+The LRU lives in the memory of one Python interpreter. Kodi runs every
+plugin invocation in a fresh one, so hits come from the service and from
+scripts that stay open (the channel guide); a plugin invocation starts
+empty and only gains within its own run. Result sets shared across
+invocations are kept by widget_cache instead.
+"""
+
+import json
+import time
+from collections import OrderedDict
+
+import xbmcgui
+
+# seconds a response stays valid, methods not listed here are never cached
+METHOD_TTLS = {
+    'PVR.GetChannelGroups': 3600,
+    'PVR.GetChannels': 600,
+    'PVR.GetChannelDetails': 3600,
+    'Addons.GetAddons': 3600,
+    'VideoLibrary.GetTVShows': 300,
+    'VideoLibrary.GetMovieDetails': 300,
+}
+
+METHOD_DOMAINS = {
+    'PVR.': 'pvr',
+    'VideoLibrary.': 'video',
+    'Addons.': 'addons',
+}
+
+# Kodi notifications and the domains they invalidate
+NOTIFICATION_DOMAINS = {
+    'PVR.OnChannelsChanged': ('pvr',),
+    'PVR.OnScanFinished': ('pvr',),
+    'PVR.OnCleaned': ('pvr',),
+    'VideoLibrary.OnUpdate': ('video',),
+    'VideoLibrary.OnRemove': ('video',),
+    'VideoLibrary.OnScanFinished': ('video',),
+    'VideoLibrary.OnCleanFinished': ('video',),
+    'System.OnWake': ('pvr', 'video', 'addons'),
+}
+
+GENERATION_PROPERTY = 'unfussy.jsoncache.%s'
+
+class ResponseCache:
+
+    def __init__(self, max_entries=256, win=None):
+        self.max_entries = max_entries
+        self.win = win or xbmcgui.Window(10000)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def key(self, request):
+        """Canonical cache key of a request object, None if the method is not cacheable."""
+        if request['method'] not in METHOD_TTLS:
+            return None
+        return json.dumps([request['method'], request.get('params', {})], sort_keys=True, separators=(',', ':'))
+
+    def get(self, key):
+        if key is None:
+            return None
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, domain, generation, response = entry
+        if expires < time.time() or generation != self.generation(domain):
+            del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return json.loads(response)
+
+    def put(self, key, request, response, raw=None):
+        if key is None or 'result' not in response:
+            return
+        method = request['method']
+        domain = self.domain(method)
+        raw = raw or json.dumps(response)
+        self.entries[key] = (time.time() + METHOD_TTLS[method], domain, self.generation(domain), raw)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, notification):
+        """Drops all entries of the domains affected by a Kodi notification."""
+        domains = NOTIFICATION_DOMAINS.get(notification)
+        if not domains:
+            return False
+        for domain in domains:
+            self.invalidateDomain(domain)
+        return True
+
+    def invalidateDomain(self, domain):
+        self.win.setProperty(GENERATION_PROPERTY % domain, str(time.time()))
+        for key in [key for key, entry in self.entries.items() if entry[1] == domain]:
+            del self.entries[key]
+        self.invalidations += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    def domain(self, method):
+        for prefix, domain in METHOD_DOMAINS.items():
+            if method.startswith(prefix):
+                return domain
+        return ''
+
+    def generation(self, domain):
+        if not domain:
+            return ''
+        return self.win.getProperty(GENERATION_PROPERTY % domain)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tracing of the JSON-RPC calls of an invocation.
+
+When the jsonrpc_trace setting is on, json_call and json_batch record every
+round trip to Kodi: method (or the methods of a batch), number of requests,
+time, characters sent and received, cache status and the call site in the
+addon. Cache hits are only counted. Per invocation the calls are summed up
+by method for a summary line in the log, and the single calls are appended
+to a ring buffer of the last TRACE_SIZE calls of all invocations, kept as a
+property of the home window so it outlives plugin processes and can be
+dumped to a file. While tracing is off nothing is recorded or formatted.
+The chunks of a batch are sent from pool threads, so recording is locked.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import xbmcgui
+
+TRACE_PROPERTY = 'unfussy.jsonrpc.trace'
+TRACE_SIZE = 200
+
+# frames of these files are skipped when looking for the call site
+INTERNAL_FILES = ('helper.py', 'jsonrpc_trace.py', 'threading.py', 'thread.py')
+
+class CallTrace:
+
+    def __init__(self, enabled=False, win=None):
+        self.enabled = enabled
+        self.win = win
+        self.calls = []
+        self.methods = {}
+        self.hits = 0
+        self.lock = threading.Lock()
+
+    def caller(self):
+        """file:function:line of the first frame outside the JSON-RPC helpers."""
+        frame = sys._getframe(1)
+        while frame and os.path.basename(frame.f_code.co_filename) in INTERNAL_FILES:
+            frame = frame.f_back
+        if frame is None:
+            return ''
+        return f'{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}:{frame.f_lineno}'
+
+    def record(self, method, seconds=0.0, sent=0, received=0, cache='miss', caller=None, requests=1):
+        if cache == 'hit':
+            with self.lock:
+                self.hits += 1
+            return
+        call = {
+            't': round(time.time(), 3),
+            'method': method,
+            'requests': requests,
+            'ms': round(seconds * 1000, 2),
+            'sent': sent,
+            'received': received,
+            'cache': cache,
+            'caller': caller if caller is not None else self.caller(),
+        }
+        with self.lock:
+            stats = self.methods.setdefault(method, [0, 0, 0.0, 0, 0])
+            stats[0] += 1
+            stats[1] += requests
+            stats[2] += seconds
+            stats[3] += sent
+            stats[4] += received
+            self.calls.append(call)
+
+    def recordBatch(self, batch, seconds, sent, received, caller=None):
+        methods = sorted({request.get('method', '') for request in batch})
+        self.record('+'.join(methods), seconds, sent, received, 'miss', caller, len(batch))
+
+    def summary(self, invocation):
+        calls = sum(stats[0] for stats in self.methods.values())
+        requests = sum(stats[1] for stats in self.methods.values())
+        seconds = sum(stats[2] for stats in self.methods.values())
+        received = sum(stats[4] for stats in self.methods.values())
+        by_method = ', '.join(f'{method} {stats[0]}x/{stats[1]}req {stats[2] * 1000:.1f}ms {stats[4] / 1024:.1f}KiB'
+                              for method, stats in sorted(self.methods.items(), key=lambda item: -item[1][2]))
+        return (f'jsonrpc trace {invocation}: {calls} calls, {requests} requests, {seconds * 1000:.1f} ms, '
+                f'{received / 1024:.1f} KiB received, {self.hits} cache hits - {by_method}')
+
+    def flush(self, invocation):
+        """Summary line of the calls since the last flush, None if there were
+        none. The calls are added to the shared ring buffer."""
+        if not self.enabled or not (self.calls or self.hits):
+            return None
+        with self.lock:
+            summary = self.summary(invocation)
+            calls = self.calls
+            self.calls = []
+            self.methods = {}
+            self.hits = 0
+        for call in calls:
+            call['invocation'] = invocation
+        win = self.win or xbmcgui.Window(10000)
+        # read-modify-write, concurrent invocations may drop each other's calls
+        ring = (self.load(win) + calls)[-TRACE_SIZE:]
+        win.setProperty(TRACE_PROPERTY, json.dumps(ring, separators=(',', ':')))
+        return summary
+
+    def load(self, win=None):
+        """The calls in the ring buffer, oldest first."""
+        try:
+            return json.loads((win or self.win or xbmcgui.Window(10000)).getProperty(TRACE_PROPERTY) or '[]')
+        except ValueError:
+            return []
+
+    def dump(self, path):
+        """Writes the ring buffer to path as JSON, returns the number of calls."""
+        calls = self.load()
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(calls, fh, indent=1)
+        return len(calls)
+
+def invocation_name(argv=None):
+    """The plugin path or script arguments identifying an invocation."""
+    argv = sys.argv if argv is None else argv
+    if len(argv) >= 3 and argv[1].lstrip('-').isdigit():
+        return argv[0] + argv[2]
+    return ' '.join(argv)
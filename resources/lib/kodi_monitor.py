@@ -4,32 +4,58 @@ import xbmc
 import time
 import json
 from resources.lib.helper import *
+from resources.lib.next_episodes import NextEpisodes
 
 class KodiMonitor(xbmc.Monitor):
 
     def __init__(self, **kwargs):
         super(KodiMonitor, self).__init__()
         self.win = kwargs.get('win')
+        self.epg_sync = kwargs.get('epg_sync')
+        self.next_episodes = NextEpisodes(self.win)
+        self.scheduler = kwargs.get('scheduler')
+        self.prefetcher = kwargs.get('prefetcher')
+        self.pvr_readiness = kwargs.get('pvr_readiness')
 
     def onDatabaseUpdated(self, database):
         pass
 
     def onNotification(self, sender, method, data):
+        if JSON_CACHE.invalidate(method):
+            log(f'KodiMonitor: {method} invalidated json cache {JSON_CACHE.stats()}', xbmc.LOGDEBUG)
+        if self.pvr_readiness:
+            self.pvr_readiness.onNotification(method)
+        if self.epg_sync:
+            self.epg_sync.onNotification(method)
+        if self.scheduler:
+            self.scheduler.notify(method)
         try:
             mediatype = ''
+            mediaid = None
             if isinstance(data, bytes):  # garantir compatibilidade
                 data = data.decode('utf-8')
             data = json.loads(data)
             if isinstance(data, dict):
                 if 'item' in data:
                     mediatype = data['item'].get('type', '')
+                    mediaid = data['item'].get('id')
                 elif 'type' in data:
                     mediatype = data.get('type', '')
-            if method == 'Player.OnStop' and mediatype == 'episode':
+                    mediaid = data.get('id')
+            if method in ('Player.OnStop', 'VideoLibrary.OnUpdate') and mediatype == 'episode':
+                if not mediaid or not self.next_episodes.updateEpisode(mediaid):
+                    self.next_episodes.invalidate()
                 self.refresh_widget('nextepisodes')
+            elif method in ('VideoLibrary.OnScanFinished', 'VideoLibrary.OnCleanFinished', 'VideoLibrary.OnRemove'):
+                self.next_episodes.invalidate()
+            elif method == 'Player.OnAVStart' and mediatype == 'channel' and self.prefetcher:
+                self.prefetcher.warmBroadcasts()
         except Exception as ex:
             log(f'Exception in KodiMonitor: {ex}', xbmc.LOGWARNING)
 
     def refresh_widget(self, widget):
+        if self.scheduler:
+            self.scheduler.request(widget)
+            return
         prop = f'widgetreload-{widget}'
         self.win.setProperty(prop, time.strftime("%Y%m%d%H%M%S", time.gmtime()))
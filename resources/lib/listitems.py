@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ListItems of the rows the plugin routes emit.
+
+Every row type is described declaratively. TYPES holds what each item of
+the type has: label, path, folder flag, media type, db id. FIELDS maps the
+optional fields of the type to the JSON-RPC properties they are read from,
+plus where they go on the ListItem: an InfoTagVideo setter, a property, art
+or label2. WIDGET_FIELDS projects a type onto the fields the widgets fed by
+it actually show. properties() turns the projection into the property
+list of the fetch, so nothing is requested that no widget displays. build()
+turns the rows into ListItems.
+
+The setters of a projection are compiled once into a builder function.
+build() then makes one pass over the rows: one offscreen ListItem each, the
+InfoTagVideo setters, and a single setArt and setProperties call. Missing
+or empty values are skipped instead of being set as defaults.
+"""
+
+import xbmc
+import xbmcgui
+
+from resources.lib.helper import log
+from resources.lib.timeutils import epgToEpoch, formatTime
+
+# --- Converters ---
+
+def actors(cast):
+    return [xbmc.Actor(actor.get('name', ''), actor.get('role', ''), actor.get('order', -1), actor.get('thumbnail', ''))
+            for actor in cast]
+
+def strings(value):
+    return value if isinstance(value, list) else [value]
+
+def flag(value):
+    return 'true' if value else 'false'
+
+def resumePoint(resume):
+    return resume.get('position', 0), resume.get('total', 0)
+
+def localTime(fmt='%H:%M'):
+    """Converter of the UTC times of PVR rows to local time."""
+    return lambda value: formatTime(epgToEpoch(value), fmt)
+
+def channelValue(key):
+    """Converter reading key of the channel joined to a broadcast row."""
+    return lambda channel: channel.get(key, '') if isinstance(channel, dict) else ''
+
+# --- Setters ---
+# a setter is (target, name, row key, converter)
+
+def tag(setter, key, convert=None):
+    return ('tag', setter, key, convert)
+
+def tagArgs(setter, key, convert):
+    """InfoTagVideo setter taking the converted value as its arguments."""
+    return ('tagargs', setter, key, convert)
+
+def prop(name, key=None, convert=None):
+    return ('prop', name, key or name, convert)
+
+def art(name, key, convert=None):
+    return ('art', name, key, convert)
+
+def artDict(key='art'):
+    return ('artdict', None, key, None)
+
+def label2(key, convert=None):
+    return ('label2', None, key, convert)
+
+# --- Types ---
+# type: (label key, path of a row, is folder, media type, db id key, properties always requested)
+
+TYPES = {
+    'movies': ('title', lambda row: row['file'], False, 'movie', 'movieid', ('title', 'file')),
+    'tvshows': ('title', lambda row: f"videodb://tvshows/titles/{row['tvshowid']}/", True, 'tvshow', 'tvshowid', ('title',)),
+    'seasons': ('label', lambda row: f"videodb://tvshows/titles/{row['tvshowid']}/{row['season']}/", True, 'season', 'seasonid', ('season', 'tvshowid')),
+    'episodes': ('title', lambda row: row['file'], False, 'episode', 'episodeid', ('title', 'file')),
+    'cast': ('name', lambda row: '', False, None, None, ()),
+    'timers': ('title', lambda row: '', False, None, None, ('title',)),
+    'broadcasts': ('title', lambda row: '', False, None, None, ('title',)),
+    'broadcasts_short': ('title', lambda row: '', False, None, None, ('title',)),
+}
+
+# type: field: (JSON-RPC properties, setters...)
+FIELDS = {
+    'movies': {
+        'title': ((), tag('setTitle', 'title')),
+        'originaltitle': (('originaltitle',), tag('setOriginalTitle', 'originaltitle')),
+        'year': (('year',), tag('setYear', 'year', int)),
+        'genre': (('genre',), tag('setGenres', 'genre', strings)),
+        'studio': (('studio',), tag('setStudios', 'studio', strings)),
+        'country': (('country',), tag('setCountries', 'country', strings)),
+        'tagline': (('tagline',), tag('setTagLine', 'tagline')),
+        'plot': (('plot',), tag('setPlot', 'plot')),
+        'rating': (('rating',), tag('setRating', 'rating', float)),
+        'votes': (('votes',), tag('setVotes', 'votes', int)),
+        'mpaa': (('mpaa',), tag('setMpaa', 'mpaa')),
+        'playcount': (('playcount',), tag('setPlaycount', 'playcount', int)),
+        'duration': (('runtime',), tag('setDuration', 'runtime', int)),
+        'cast': (('cast',), tag('setCast', 'cast', actors)),
+        'trailer': (('trailer',), tag('setTrailer', 'trailer')),
+        'resume': (('resume',), tagArgs('setResumePoint', 'resume', resumePoint),
+                   prop('resumetime', 'resume', lambda resume: resume.get('position', 0)),
+                   prop('totaltime', 'resume', lambda resume: resume.get('total', 0))),
+        'art': (('art',), artDict()),
+    },
+    'tvshows': {
+        'title': ((), tag('setTitle', 'title')),
+        'year': (('year',), tag('setYear', 'year', int)),
+        'genre': (('genre',), tag('setGenres', 'genre', strings)),
+        'plot': (('plot',), tag('setPlot', 'plot')),
+        'rating': (('rating',), tag('setRating', 'rating', float)),
+        'votes': (('votes',), tag('setVotes', 'votes', int)),
+        'mpaa': (('mpaa',), tag('setMpaa', 'mpaa')),
+        'playcount': (('playcount',), tag('setPlaycount', 'playcount', int)),
+        'season': (('season',), tag('setSeason', 'season', int)),
+        'episode': (('episode',), tag('setEpisode', 'episode', int)),
+        'art': (('art',), artDict()),
+    },
+    'seasons': {
+        'title': (('title',), tag('setTitle', 'title')),
+        'tvshowtitle': (('showtitle',), tag('setTvShowTitle', 'showtitle')),
+        'season': ((), tag('setSeason', 'season', int)),
+        'playcount': (('playcount',), tag('setPlaycount', 'playcount', int)),
+        'episodes': (('episode', 'watchedepisodes'), prop('totalepisodes', 'episode'), prop('watchedepisodes')),
+        'art': (('art',), artDict()),
+    },
+    'episodes': {
+        'title': ((), tag('setTitle', 'title')),
+        'tvshowtitle': (('showtitle',), tag('setTvShowTitle', 'showtitle')),
+        'season': (('season',), tag('setSeason', 'season', int)),
+        'episode': (('episode',), tag('setEpisode', 'episode', int)),
+        'plot': (('plot',), tag('setPlot', 'plot')),
+        'rating': (('rating',), tag('setRating', 'rating', float)),
+        'playcount': (('playcount',), tag('setPlaycount', 'playcount', int)),
+        'resume': (('resume',), tagArgs('setResumePoint', 'resume', resumePoint)),
+        'firstaired': (('firstaired',), tag('setFirstAired', 'firstaired')),
+        'duration': (('runtime',), tag('setDuration', 'runtime', int)),
+        'writer': (('writer',), tag('setWriters', 'writer', strings)),
+        'cast': (('cast',), tag('setCast', 'cast', actors)),
+        'dateadded': (('dateadded',), tag('setDateAdded', 'dateadded')),
+        'lastplayed': (('lastplayed',), tag('setLastPlayed', 'lastplayed')),
+        'tvshowid': (('tvshowid',), prop('tvshowid')),
+        'art': (('art',), artDict()),
+    },
+    'cast': {
+        'role': ((), label2('role')),
+        'thumb': ((), art('thumb', 'thumbnail'), art('icon', 'thumbnail')),
+    },
+    'timers': {
+        'title': ((), tag('setTitle', 'title')),
+        'plot': (('summary',), tag('setPlot', 'summary')),
+        'timerid': ((), prop('timerid')),
+        'channelid': (('channelid',), prop('channelid')),
+        'channelicon': ((), art('icon', 'channelicon'), art('thumb', 'channelicon')),
+        'date': (('starttime',), prop('date', 'starttime', localTime('%d.%m'))),
+        'starttime': (('starttime',), prop('starttime', 'starttime', localTime())),
+        'endtime': (('endtime',), prop('endtime', 'endtime', localTime())),
+        'runtime': (('runtime',), prop('runtime')),
+        'state': (('state',), prop('state')),
+        'istimerrule': (('istimerrule',), prop('istimerrule', convert=flag)),
+        'isradio': (('isradio',), prop('isradio', convert=flag)),
+    },
+    'broadcasts': {
+        'title': ((), tag('setTitle', 'title')),
+        'plot': (('plot',), tag('setPlot', 'plot')),
+        'plotoutline': (('plotoutline',), tag('setPlotOutline', 'plotoutline')),
+        'genre': (('genre',), tag('setGenres', 'genre', strings)),
+        'year': (('year',), tag('setYear', 'year', int)),
+        'thumb': (('thumbnail',), art('thumb', 'thumbnail'), art('icon', 'thumbnail')),
+        'broadcastid': ((), prop('broadcastid')),
+        'channelid': ((), prop('channelid', 'channel', channelValue('channelid'))),
+        'channel': ((), prop('channel', 'channel', channelValue('channel'))),
+        'channelicon': ((), prop('channelicon', 'channel', channelValue('icon'))),
+        'date': (('starttime',), prop('date')),
+        'starttime': (('starttime',), prop('starttime')),
+        'endtime': (('endtime',), prop('endtime')),
+        'runtime': (('runtime',), prop('runtime')),
+        'episodename': (('episodename',), prop('episodename')),
+        'progress': (('progresspercentage',), prop('progresspercentage')),
+        'cast': (('cast',), prop('cast')),
+    },
+    'broadcasts_short': {
+        'broadcastid': ((), prop('broadcastid', 'id')),
+        'channelid': ((), prop('channelid', 'channel_id')),
+        'episodename': ((), prop('episodename')),
+        'date': ((), prop('date')),
+        'starttime': ((), label2('starttime'), prop('starttime')),
+        'endtime': ((), prop('endtime')),
+        'runtime': ((), prop('runtime')),
+    },
+}
+
+# the fields the widgets fed by a type show, types not listed get all fields
+WIDGET_FIELDS = {
+    # next episodes widget, landscape style 'episode'
+    'episodes': ('title', 'tvshowtitle', 'season', 'episode', 'plot', 'rating', 'playcount',
+                 'resume', 'firstaired', 'duration', 'tvshowid', 'art'),
+    # running at widget, opens the info dialog by broadcastid and channelid
+    'broadcasts': ('title', 'plot', 'genre', 'thumb', 'broadcastid', 'channelid', 'channel',
+                   'channelicon', 'date', 'starttime', 'endtime', 'runtime', 'episodename', 'progress'),
+}
+
+def projection(type, fields=None):
+    """The fields of type that are shown, fields defaults to WIDGET_FIELDS."""
+    if fields is None:
+        fields = WIDGET_FIELDS.get(type)
+    if fields is None:
+        return tuple(FIELDS[type])
+    return tuple(field for field in fields if field in FIELDS[type])
+
+def properties(type, fields=None):
+    """The JSON-RPC properties to request for the projection of type."""
+    requested = list(TYPES[type][5])
+    for field in projection(type, fields):
+        requested.extend(name for name in FIELDS[type][field][0] if name not in requested)
+    return requested
+
+# the statement per setter target in the source of a builder, value is the
+# converted value, {name} the setter or key name
+STATEMENTS = {
+    'tag': "info.{name}({value})",
+    'tagargs': "info.{name}(*{value})",
+    'prop': "property_values[{name!r}] = str({value})",
+    'art': "art_values[{name!r}] = {value}",
+    'label2': "li.setLabel2(str({value}))",
+}
+
+def compileBuilder(type, fields=None):
+    """Compiles the builder of the projection of type, a function turning
+    rows into (path, ListItem, isFolder).
+
+    The setters are written out as straight-line Python, so an item costs
+    one attribute lookup per setter instead of a pass over the setter
+    tuples with getattr.
+    """
+    label_key, path_of, folder, mediatype, dbid_key, _ = TYPES[type]
+    env = {'ListItem': xbmcgui.ListItem, 'path_of': path_of, 'folder': folder}
+    lines = [
+        "def build(rows):",
+        "    items = []",
+        "    for row in rows:",
+        "        get = row.get",
+        "        path = path_of(row)",
+        f"        li = ListItem(str(get({label_key!r}, '')), path=path, offscreen=True)",
+        "        info = li.getVideoInfoTag()",
+        "        property_values = {}",
+        "        art_values = {}",
+    ]
+    if mediatype:
+        lines += [f"        info.setMediaType({mediatype!r})",
+                  f"        if get({dbid_key!r}):",
+                  f"            info.setDbId(int(row[{dbid_key!r}]))"]
+    last_key = None
+    for field in projection(type, fields):
+        for index, (target, name, key, convert) in enumerate(FIELDS[type][field][1:]):
+            if key != last_key:
+                lines.append(f"        value = get({key!r})")
+                last_key = key
+            if target == 'artdict':
+                lines.append("        if value:")
+                lines.append("            art_values.update(value)")
+                continue
+            value = "value"
+            if convert:
+                env[f"convert_{field}_{index}"] = convert
+                value = f"convert_{field}_{index}(value)"
+            lines.append("        if value:" if target in ('tagargs', 'art') else "        if value is not None and value != '':")
+            lines.append("            " + STATEMENTS[target].format(name=name, value=value))
+    lines += [
+        "        if art_values:",
+        "            li.setArt(art_values)",
+        "        if property_values:",
+        "            li.setProperties(property_values)",
+        "        items.append((path, li, folder))",
+        "    return items",
+    ]
+    exec('\n'.join(lines), env)
+    return env['build']
+
+# (type, projection): builder, a builder is compiled on the first build of
+# its projection, a plugin run builds a single type
+BUILDERS = {}
+
+def build(type, rows, fields=None):
+    """(path, ListItem, isFolder) of every row of type."""
+    if type not in TYPES:
+        log(f"build: unsupported type '{type}'", xbmc.LOGWARNING)
+        return []
+    key = (type, projection(type, fields))
+    builder = BUILDERS.get(key)
+    if builder is None:
+        builder = BUILDERS[key] = compileBuilder(type, fields)
+    return builder(rows)
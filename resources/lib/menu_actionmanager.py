@@ -187,6 +187,24 @@ class MenuActionManager:
         except IndexError:
             return ""
 
+    def getOnClickCond(self, action_type: int) -> str:
+        """
+        Condition under which the database link of the action type can be used.
+        """
+        try:
+            return self.actionconstraints[action_type]['cond']
+        except IndexError:
+            return ""
+
+    def getOnClickAlt(self, action_type: int) -> str:
+        """
+        Fallback command if the library of the action type has no content.
+        """
+        try:
+            return self.actionconstraints[action_type]['alt_path']
+        except IndexError:
+            return ""
+
     def getActionsCount(self, action_type: int) -> int:
         if 0 <= action_type < len(self.actions):
             return len(self.actions[action_type])
@@ -2,13 +2,13 @@
 # coding: utf-8
 
 import json
-import xml.etree.ElementTree as ET
 from pathlib import Path
 import xbmc, xbmcgui, xbmcvfs, xbmcaddon
 
 from resources.lib.helper import *
 from resources.lib.menu_actionmanager import MenuActionManager
-from resources.lib.helper import log, encode4XML
+from resources.lib.helper import log
+from resources.lib.xml_writer import XMLWriter
 
 #######################################################################################
 
@@ -22,100 +22,86 @@ SKININCLUDEPATH = Path(xbmcvfs.translatePath(str(Path("special://skin") / 'xml'
 
 #######################################################################################
 
-def indent(elem, level=0):
-    i = "\n" + level * "  "
-    if len(elem):
-        if not elem.text or not elem.text.strip():
-            elem.text = i + "  "
-        for child in elem:
-            indent(child, level + 1)
-        if not child.tail or not child.tail.strip():
-            child.tail = i
-    if level and (not elem.tail or not elem.tail.strip()):
-        elem.tail = i
-
 class MenuXMLWriter:
 
     def __init__(self, am):
         self.am = am
 
     def save(self, menu):
-        root = ET.Element('includes')
-
-        include_mainmenu_content = ET.SubElement(root, 'include', name='home_mainmenu_content')
-        item_content = ET.SubElement(include_mainmenu_content, 'content')
-
-        include_mainmenu_submenus = ET.SubElement(root, 'include', name='home_mainmenu_submenus')
+        """Writes the menu includes, returns False if they are unchanged."""
+        return write_if_changed(SKININCLUDEPATH, self.build(menu))
 
+    def build(self, menu):
+        """The menu includes as UTF-8 encoded XML."""
+        visible = [item for item in menu if item.get('visible', True)]
+        submenu_ids = {}
         submenu_id = 10
-        for item in menu:
-            if not item.get('visible', True):
-                continue
-            if not item.get('submenu'):
-                self.mainMenuItem(item_content, item)
-            else:
-                self.mainMenuItem(item_content, item, submenu_id)
-                self.submenusItem(include_mainmenu_submenus, submenu_id)
-                self.submenuContent(root, item['submenu'], submenu_id)
+        for index, item in enumerate(visible):
+            if item.get('submenu'):
+                submenu_ids[index] = submenu_id
                 submenu_id += 10
 
-        indent(root)
-        tree = ET.ElementTree(root)
+        xml = XMLWriter()
+        xml.start('includes')
+
+        xml.start('include', name='home_mainmenu_content')
+        xml.start('content')
+        for index, item in enumerate(visible):
+            self.mainMenuItem(xml, item, submenu_ids.get(index, 0))
+        xml.end()
+        xml.end()
 
-        if not SKININCLUDEPATH.parent.exists():
-            SKININCLUDEPATH.parent.mkdir(parents=True, exist_ok=True)
+        xml.start('include', name='home_mainmenu_submenus')
+        for sub_id in submenu_ids.values():
+            self.submenusItem(xml, sub_id)
+        xml.end()
 
-        tree.write(str(SKININCLUDEPATH), encoding='utf-8', xml_declaration=True, method="xml")
+        for index, sub_id in submenu_ids.items():
+            self.submenuContent(xml, visible[index]['submenu'], sub_id)
 
-    def mainMenuItem(self, parent, item, sub_id=0):
+        xml.end()
+        return xml.getvalue()
+
+    def mainMenuItem(self, xml, item, sub_id=0):
         label = self.getLabel(item.get('label', ''))
         thumbsize = self.getThumbsize(item)
-        self.menuItem(parent, label, item.get('thumb', ''), thumbsize,
+        self.menuItem(xml, label, item.get('thumb', ''), thumbsize,
                       item.get('actiontype', -1), item.get('action', -1), sub_id)
 
-    def submenusItem(self, parent, sub_id):
-        include_submenu = ET.SubElement(parent, 'include', content='home_submenu')
-        param = ET.SubElement(include_submenu, 'param', name='id')
-        param.text = str(sub_id)
+    def submenusItem(self, xml, sub_id):
+        xml.start('include', content='home_submenu')
+        xml.element('param', str(sub_id), name='id')
+        xml.end()
 
-    def submenuContent(self, parent, submenu, sub_id):
-        include_submenu = ET.SubElement(parent, 'include', name=f'home_submenu_content_id_{sub_id}')
-        item_content = ET.SubElement(include_submenu, 'content')
+    def submenuContent(self, xml, submenu, sub_id):
+        xml.start('include', name=f'home_submenu_content_id_{sub_id}')
+        xml.start('content')
         for item in submenu:
             if not item.get('visible', True):
                 continue
             label = self.getLabel(item.get('label', ''))
             thumbsize = self.getThumbsize(item)
-            self.menuItem(item_content, label, item.get('thumb', ''), thumbsize,
+            self.menuItem(xml, label, item.get('thumb', ''), thumbsize,
                           item.get('actiontype', -1), item.get('action', -1), -1)
+        xml.end()
+        xml.end()
 
-    def menuItem(self, parent, label, thumb, thumbsize, actiontype, action, sub_id):
-        xml_item = ET.SubElement(parent, 'item')
-
-        xml_label = ET.SubElement(xml_item, 'label')
-        xml_label.text = encode4XML(label)
-
-        xml_thumb = ET.SubElement(xml_item, 'thumb')
-        xml_thumb.text = thumb
+    def menuItem(self, xml, label, thumb, thumbsize, actiontype, action, sub_id):
+        xml.start('item')
+        xml.element('label', label)
+        xml.element('thumb', thumb)
 
         if actiontype > 3:
-            xml_onclick = ET.SubElement(xml_item, 'onclick')
-            xml_onclick.text = self.am.getOnClick(actiontype, action)
+            xml.element('onclick', self.am.getOnClick(actiontype, action))
         else:
-            xml_onclick1 = ET.SubElement(xml_item, 'onclick', condition=self.am.getOnClickCond(actiontype))
-            xml_onclick1.text = self.am.getOnClick(actiontype, action)
+            xml.element('onclick', self.am.getOnClick(actiontype, action), condition=self.am.getOnClickCond(actiontype))
+            xml.element('onclick', self.am.getOnClickAlt(actiontype), condition='!' + self.am.getOnClickCond(actiontype))
 
-            xml_onclick2 = ET.SubElement(xml_item, 'onclick', condition='!' + self.am.getOnClickCond(actiontype))
-            xml_onclick2.text = self.am.getOnClickAlt(actiontype)
+        xml.element('property', f'$NUMBER[{thumbsize}]', name='thumbsize')
 
-        xml_thumbsize = ET.SubElement(xml_item, 'property', name='thumbsize')
-        xml_thumbsize.text = f'$NUMBER[{thumbsize}]'
-
-        if sub_id == -1:
-            return
-
-        submenu_id = ET.SubElement(xml_item, 'property', name='submenu_id')
-        submenu_id.text = f'$NUMBER[{sub_id}]'
+        if sub_id != -1:
+            xml.element('property', f'$NUMBER[{sub_id}]', name='submenu_id')
+        xml.end()
 
     def getLabel(self, label):
         if isinstance(label, str) and label.isdigit():
@@ -133,6 +119,7 @@ class MenuDataStore:
     def __init__(self, am=None):
         self.am = am if am else MenuActionManager()
         self.changed = False
+        self.includes_changed = False
         self.menu = None
         self.xmlWriter = MenuXMLWriter(self.am)
 
@@ -166,7 +153,8 @@ class MenuDataStore:
         if not self.changed:
             return
         self.saveJson()
-        self.xmlWriter.save(self.menu)
+        # the skin only has to be reloaded if the generated includes differ
+        self.includes_changed = self.xmlWriter.save(self.menu) or self.includes_changed
         self.changed = False
 
     def saveJson(self):
@@ -183,7 +171,7 @@ class MenuDataStore:
         if self.loadMenu():
             self.changed = True
             self.saveMenu()
-            return True
+            return self.includes_changed
         return False
 
     def mainmenu(self):
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Next episodes of the in-progress TV shows.
+
+The episodes of all in-progress shows are fetched with a few fields in one
+batched JSON-RPC call, and the next episode of every show is computed in
+memory by (season, episode) order. Only the episode details the widget
+shows are requested (listitems.WIDGET_FIELDS). The result, a list of
+{tvshowid, lastplayed, episodeid} ordered by last played, is kept as a
+property of the home window so plugin invocations can reuse it. The service
+updates single shows on playback and library notifications.
+"""
+
+import json
+
+import xbmc
+import xbmcgui
+
+from resources.lib.helper import *
+from resources.lib import listitems
+
+CACHE_PROPERTY = 'unfussy.nextepisodes'
+MAX_SHOWS = 25
+
+class NextEpisodes:
+
+    def __init__(self, win=None):
+        self.win = win or xbmcgui.Window(10000)
+
+    def fetchEpisodes(self):
+        """Episode details of the next episodes, most recently played show
+        first. None if the in-progress shows or the episode details could not
+        be fetched."""
+        shows = self.load()
+        if shows is None:
+            shows = self.compute()
+            if shows is None:
+                return None
+            self.save(shows)
+        return self.getEpisodes([show['episodeid'] for show in shows], listitems.properties('episodes'))
+
+    def compute(self):
+        tvshows = self.getInprogressTVShows()
+        if tvshows is None:
+            return None
+        return self.computeShows(tvshows)
+
+    def computeShows(self, tvshows):
+        requests = [json_request('VideoLibrary.GetEpisodes',
+                                 properties=['season', 'episode', 'playcount', 'lastplayed'],
+                                 params={'tvshowid': tvshow['tvshowid']})
+                    for tvshow in tvshows]
+        shows = []
+        for tvshow, query in zip(tvshows, json_batch(requests)):
+            try:
+                episodes = query['result'].get('episodes', [])
+            except (KeyError, AttributeError):
+                log(f"NextEpisodes: no episodes for tvshow {tvshow['tvshowid']}", xbmc.LOGWARNING)
+                continue
+            show = self.nextEpisode(tvshow['tvshowid'], episodes)
+            if show:
+                shows.append(show)
+        shows.sort(key=lambda show: show['lastplayed'], reverse=True)
+        return shows[:MAX_SHOWS]
+
+    def nextEpisode(self, tvshowid, episodes):
+        played = [episode for episode in episodes if episode.get('playcount')]
+        if not played:
+            return None
+        last_played = max(played, key=lambda episode: episode.get('lastplayed', ''))
+        episodes = sorted(episodes, key=lambda episode: (episode.get('season', 0), episode.get('episode', 0)))
+        position = episodes.index(last_played)
+        if position + 1 >= len(episodes):
+            return None
+        return {
+            'tvshowid': tvshowid,
+            'lastplayed': last_played.get('lastplayed', ''),
+            'episodeid': episodes[position + 1]['episodeid']
+        }
+
+    def updateEpisode(self, episodeid):
+        """Recomputes the show of episodeid after it was played or changed."""
+        shows = self.load()
+        if shows is None:
+            return False
+        try:
+            query = json_call('VideoLibrary.GetEpisodeDetails', properties=['tvshowid'], params={'episodeid': episodeid})
+            tvshowid = query['result']['episodedetails']['tvshowid']
+        except (KeyError, TypeError):
+            return False
+        shows = [show for show in shows if show['tvshowid'] != tvshowid]
+        shows.extend(self.computeShows([{'tvshowid': tvshowid}]))
+        shows.sort(key=lambda show: show['lastplayed'], reverse=True)
+        self.save(shows[:MAX_SHOWS])
+        return True
+
+    def invalidate(self):
+        self.win.clearProperty(CACHE_PROPERTY)
+
+    def load(self):
+        cached = self.win.getProperty(CACHE_PROPERTY)
+        if not cached:
+            return None
+        try:
+            return json.loads(cached)
+        except ValueError:
+            return None
+
+    def save(self, shows):
+        self.win.setProperty(CACHE_PROPERTY, json.dumps(shows))
+
+    def getInprogressTVShows(self):
+        try:
+            query = json_call('VideoLibrary.GetTVShows',
+                              properties=[],
+                              limit=MAX_SHOWS,
+                              sort={"method": "lastplayed", "order": "descending"},
+                              query_filter={'field': 'inprogress', 'operator': 'true', 'value': ''},
+                              cache=False)
+            return query['result'].get('tvshows', [])
+        except Exception:
+            log('getInprogressTVShows: error fetching the in-progress TV shows', xbmc.LOGWARNING)
+            return None
+
+    def getEpisodes(self, episodeids, properties=episode_properties):
+        requests = [json_request('VideoLibrary.GetEpisodeDetails',
+                                 properties=properties,
+                                 params={'episodeid': episodeid})
+                    for episodeid in episodeids]
+        episodes = []
+        for episodeid, query in zip(episodeids, json_batch(requests)):
+            try:
+                episodes.append(query['result']['episodedetails'])
+            except (KeyError, TypeError):
+                log(f"getEpisodes: error fetching episode details for id {episodeid}", xbmc.LOGWARNING)
+        # a single missing episode is skipped, none at all is a failed fetch
+        if episodeids and not episodes:
+            return None
+        return episodes
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opt-in performance reports of plugin and script invocations.
+
+With the perf_report setting on, plugin.py and default.py time the phases
+of an invocation (imports, argument parsing, fetching, building the
+ListItems, handing them to Kodi) and the time spent waiting for PVR and in
+JSON-RPC calls, summed over threads. Optionally the invocation runs under
+cProfile (top functions in the report, the full profile in a .prof file
+per route) and tracemalloc (peak and top allocation sites).
+
+Every report is one JSON line in perf/perf_stats.jsonl below addon_data,
+rotated at ROTATE_BYTES into ROTATE_KEEP older files. summary() aggregates
+all of them into percentiles per route or action.
+
+With the setting off, start() hands out NULL_REPORT whose methods do
+nothing, so the entry points and helpers call it unconditionally.
+"""
+
+import json
+import os
+import threading
+import time
+
+import xbmcaddon
+import xbmcvfs
+
+STATS_FILE = 'perf_stats.jsonl'
+ROTATE_BYTES = 512 * 1024
+ROTATE_KEEP = 3
+PROFILE_TOP = 20
+ALLOC_TOP = 10
+PERCENTILES = (50, 90, 99)
+
+class NullReport:
+
+    def phase(self, name):
+        pass
+
+    def note(self, name, seconds):
+        pass
+
+    def set(self, name, value):
+        pass
+
+    def finish(self, name, invocation=''):
+        pass
+
+NULL_REPORT = NullReport()
+
+# the report of the running invocation, NULL_REPORT unless profiling is on
+REPORT = NULL_REPORT
+
+class PerfReport:
+
+    def __init__(self, entry, started=None, cprofile=False, tracemalloc=False):
+        self.entry = entry
+        self.started = started or time.perf_counter()
+        self.mark = self.started
+        self.phases = {}
+        self.notes = {}
+        self.values = {}
+        self.lock = threading.Lock()
+        self.profiler = None
+        self.tracemalloc = None
+        if cprofile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if tracemalloc:
+            import tracemalloc as tracemalloc_module
+            self.tracemalloc = tracemalloc_module
+            self.tracemalloc.start()
+
+    def phase(self, name):
+        """Ends the phase called name, it lasted since the previous phase ended."""
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self.mark
+        self.mark = now
+
+    def note(self, name, seconds):
+        """Adds seconds spent in something that happens within the phases."""
+        with self.lock:
+            self.notes[name] = self.notes.get(name, 0.0) + seconds
+
+    def set(self, name, value):
+        self.values[name] = value
+
+    def finish(self, name, invocation=''):
+        """Stops the profilers and appends the report to the stats file."""
+        record = {
+            't': round(time.time(), 3),
+            'entry': self.entry,
+            'name': name or '',
+            'invocation': invocation,
+            'total_ms': ms(time.perf_counter() - self.started),
+            'phases': {phase: ms(seconds) for phase, seconds in self.phases.items()},
+            'notes': {note: ms(seconds) for note, seconds in self.notes.items()},
+        }
+        record.update(self.values)
+        directory = statsDirectory()
+        if self.profiler:
+            self.profiler.disable()
+            record['profile_top'] = self.profileTop()
+            self.profiler.dump_stats(os.path.join(directory, f'{self.entry}-{name or "none"}.prof'))
+        if self.tracemalloc:
+            snapshot = self.tracemalloc.take_snapshot()
+            record['peak_kib'] = round(self.tracemalloc.get_traced_memory()[1] / 1024, 1)
+            record['alloc_top'] = [[str(stat.traceback[0]), round(stat.size / 1024, 1)]
+                                   for stat in snapshot.statistics('lineno')[:ALLOC_TOP]]
+            self.tracemalloc.stop()
+        append(os.path.join(directory, STATS_FILE), json.dumps(record, separators=(',', ':')))
+
+    def profileTop(self):
+        import pstats
+        stats = pstats.Stats(self.profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+        return [[f'{os.path.basename(func[0])}:{func[1]}:{func[2]}', calls, ms(cumulative)]
+                for func, (_, calls, _, cumulative, _) in rows]
+
+def ms(seconds):
+    return round(seconds * 1000, 2)
+
+def start(entry, started=None):
+    """The report of this invocation, NULL_REPORT if perf_report is off."""
+    global REPORT
+    addon = xbmcaddon.Addon()
+    if not addon.getSettingBool('perf_report'):
+        REPORT = NULL_REPORT
+        return REPORT
+    REPORT = PerfReport(entry, started,
+                        addon.getSettingBool('perf_report_cprofile'),
+                        addon.getSettingBool('perf_report_tracemalloc'))
+    return REPORT
+
+def statsDirectory():
+    addon = xbmcaddon.Addon()
+    directory = os.path.join(xbmcvfs.translatePath(addon.getAddonInfo('profile')), 'perf')
+    if not os.path.isdir(directory):
+        os.makedirs(directory, exist_ok=True)
+    return directory
+
+def append(path, line):
+    """Appends a line to path, rotating path.1 .. path.ROTATE_KEEP first if
+    it has grown past ROTATE_BYTES."""
+    try:
+        if os.path.getsize(path) > ROTATE_BYTES:
+            for index in range(ROTATE_KEEP - 1, 0, -1):
+                if os.path.exists(f'{path}.{index}'):
+                    os.replace(f'{path}.{index}', f'{path}.{index + 1}')
+            os.replace(path, f'{path}.1')
+    except OSError:
+        pass
+    with open(path, 'a', encoding='utf-8') as fh:
+        fh.write(line + '\n')
+
+def load(directory=None):
+    """All reports in the stats files, oldest first."""
+    path = os.path.join(directory or statsDirectory(), STATS_FILE)
+    records = []
+    for candidate in [f'{path}.{index}' for index in range(ROTATE_KEEP, 0, -1)] + [path]:
+        if not os.path.exists(candidate):
+            continue
+        with open(candidate, encoding='utf-8') as fh:
+            for line in fh:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+def percentile(values, p):
+    """Nearest-rank percentile of sorted values."""
+    index = max(0, min(len(values) - 1, -(-len(values) * p // 100) - 1))
+    return values[index]
+
+def summary(records=None):
+    """Percentiles of the total time, the phases and the notes per route or
+    action, as text."""
+    records = load() if records is None else records
+    groups = {}
+    for record in records:
+        groups.setdefault(f"{record['entry']} {record['name']}".strip(), []).append(record)
+    header = ' '.join(f'p{p:<7}' for p in PERCENTILES)
+    lines = [f'{len(records)} invocations, times in ms', '']
+    for name in sorted(groups):
+        group = groups[name]
+        lines.append(f'{name} ({len(group)}x)')
+        lines.append(f'  {"":<20} {header} {"max":<8}')
+        rows = [('total', [record['total_ms'] for record in group])]
+        for key in ('phases', 'notes'):
+            names = []
+            for record in group:
+                names.extend(phase for phase in record.get(key, {}) if phase not in names)
+            rows.extend((phase, [record[key][phase] for record in group if phase in record.get(key, {})]) for phase in names)
+        for label, values in rows:
+            values = sorted(values)
+            cells = ' '.join(f'{percentile(values, p):<8.1f}' for p in PERCENTILES)
+            lines.append(f'  {label:<20} {cells} {values[-1]:<8.1f}')
+        peaks = sorted(record['peak_kib'] for record in group if 'peak_kib' in record)
+        if peaks:
+            lines.append(f'  {"peak KiB":<20} ' + ' '.join(f'{percentile(peaks, p):<8.1f}' for p in PERCENTILES) + f' {peaks[-1]:<8.1f}')
+        lines.append('')
+    return '\n'.join(lines)
@@ -1,41 +1,58 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import xbmcplugin
-import xbmcgui
 import json
 from resources.lib.helper import *
-from resources.lib.pvr_running_at import PVRRunningAt
-from resources.lib.pvr_timers import PVRTimers
-from resources.lib.pvr_channellist import PVRChannelList
+from resources.lib import listitems
+
+# the modules behind a route are imported by its fetch method, every plugin
+# invocation is a fresh interpreter and only needs one of them
 
 #######################################################################################
 
 class PluginContent:
 
-    def __init__(self):
+    def __init__(self, pvr_timeout=PVR_WAIT_TIMEOUT):
+        # seconds to wait for PVR, 0 in the service which publishes the readiness
+        self.pvr_timeout = pvr_timeout
         self.resultlist = []
+        self.data = []
 
     def result(self):
+        if not self.resultlist:
+            for type, items in self.data:
+                self.resultlist.extend(listitems.build(type, items))
         return self.resultlist
 
+    def addItems(self, items, type):
+        self.data.append((type, items))
+
+    def load(self, data):
+        """Takes over the rows of a previously fetched result set."""
+        self.data = [(type, items) for type, items in data]
+
+    def fetch(self, info, params):
+        """Fetches the rows of a plugin route. Returns False for unknown routes
+        and if the fetch gave up or failed, the rows must not be cached then."""
+        if info == 'getnextepisodes':
+            return self.fetchNextEpisodes()
+        elif info == 'getcast':
+            return self.fetchActors(params.get('movie'), params.get('tvshow'))
+        elif info == 'getrunningat':
+            return self.fetchRunningAt(params.get('pointintime'), params.get('channels'))
+        elif info == 'gettimers':
+            return self.fetchTimers()
+        elif info == 'getbroadcasts':
+            return self.fetchBroadcasts(params.get('channelnum'), params.get('channelids'), *self.broadcastWindow(params))
+        return False
+
     def fetchNextEpisodes(self):
-        inprogress_shows = self.getInprogressTVShows()
-        for show in inprogress_shows:
-            try:
-                tvshowid = int(show['tvshowid'])
-            except Exception as e:
-                log(f"fetchNextEpisodes: invalid tvshowid in show {show}: {e}", xbmc.LOGWARNING)
-                continue
-
-            last_played_episode = self.getLastPlayedEpisode(tvshowid)
-            if not last_played_episode:
-                continue
-            next_episode_id = self.getNextEpisode(tvshowid, last_played_episode)
-            if next_episode_id > 0:
-                next_episode = self.getEpisode(next_episode_id)
-                if next_episode:
-                    append_items(self.resultlist, [next_episode], type='episodes')
+        from resources.lib.next_episodes import NextEpisodes
+        next_episodes = NextEpisodes().fetchEpisodes()
+        if next_episodes is None:
+            return False
+        self.addItems(next_episodes, 'episodes')
+        return True
 
     def fetchActors(self, movie_id, tvshow):
         cast = []
@@ -53,127 +70,114 @@ class PluginContent:
                 cast = query['result']['tvshows'][0].get('cast', [])
         except Exception as e:
             log(f"fetchActors: error fetching cast: {e}", xbmc.LOGWARNING)
+            return False
 
-        append_items(self.resultlist, cast, type='cast')
+        self.addItems(cast, 'cast')
+        return True
 
     def fetchRunningAt(self, pointintime, channel_ids):
+        from resources.lib.pvr_running_at import PVRRunningAt
+        from resources.lib.timeutils import startTimeInterval
+        from resources.lib.widget_scheduler import setReloadDeadline
         running_at = PVRRunningAt()
-        if not pvrAvailable():
+        if not pvrAvailable(self.pvr_timeout):
             log("fetchRunningAt: pvr not available, aborting", xbmc.LOGWARNING)
-            return
+            return False
 
         try:
-            # channel_ids may be JSON string or dict
-            if isinstance(channel_ids, str):
-                channel_ids_dict = json.loads(channel_ids.replace('-', ','))
-            else:
-                channel_ids_dict = channel_ids
+            channel_ids = self.parseChannelIds(channel_ids)
         except Exception as e:
             log(f"fetchRunningAt: error parsing channel_ids: {e}", xbmc.LOGERROR)
-            return
+            return False
 
+        channel_tables = running_at.getBroadcastTables(channel_ids)
         broadcast_ids = []
-        for channel_id in channel_ids_dict.values():
+        for channel_id in channel_ids:
             try:
-                bc = running_at.getBroadcastAt(pointintime, channel_id)
+                bc = running_at.getBroadcastAt(pointintime, channel_id, channel_tables.get(channel_id))
                 if bc:
-                    broadcast_ids.append({'broadcastid': bc['broadcastid'], 'channelid': channel_id})
+                    broadcast_ids.append({'broadcastid': bc['broadcastid'], 'channelid': channel_id, 'end': bc['end']})
             except Exception as e:
                 log(f"fetchRunningAt: error getting broadcast at channel {channel_id}: {e}", xbmc.LOGWARNING)
 
-        broadcasts = running_at.getBroadcastsById(broadcast_ids)
-        append_items(self.resultlist, broadcasts, type='broadcasts')
+        broadcasts = running_at.getBroadcastsById(broadcast_ids, listitems.properties('broadcasts'))
+        self.addItems(broadcasts, 'broadcasts')
+        # stale at the next occurrence of the point in time, or earlier when a
+        # shown broadcast ends
+        deadlines = [bc['end'] for bc in broadcast_ids]
+        try:
+            deadlines.append(startTimeInterval(pointintime)[0])
+        except Exception as e:
+            log(f"fetchRunningAt: invalid point in time {pointintime}: {e}", xbmc.LOGWARNING)
+        if deadlines:
+            setReloadDeadline('runningat', min(deadlines))
+        return True
 
     def fetchTimers(self):
-        if not pvrAvailable():
+        from resources.lib.pvr_timers import PVRTimers
+        from resources.lib.pvr_channels import CHANNELS
+        from resources.lib.widget_scheduler import setReloadDeadline
+        if not pvrAvailable(self.pvr_timeout):
             log("fetchTimers: pvr not available, aborting", xbmc.LOGWARNING)
-            return
+            return False
         try:
             ti = PVRTimers()
-            timers = ti.fetchTimers()
-            for t in timers:
-                channel = ti.fetchChannel(t['channelid'])
+            # timers and channel table are independent, load them concurrently
+            timers, _ = run_parallel([ti.fetchTimers, lambda: CHANNELS.loadGroups(['alltv'])])
+            for t, channel in CHANNELS.join(timers):
                 t['channelicon'] = channel['icon'] if channel else ''
-            append_items(self.resultlist, timers, type='timers')
+            setReloadDeadline('timers', ti.nextChange(timers))
+            self.addItems(timers, 'timers')
+            return True
         except Exception as e:
             log(f"fetchTimers: error fetching timers: {e}", xbmc.LOGERROR)
+            return False
 
-    def fetchBroadcasts(self, channel_num, channel_ids):
+    def broadcastWindow(self, params):
+        """hours, limit and page of a getbroadcasts path. Paths without limit
+        (or limit=0) list all upcoming broadcasts, without hours they are
+        not bound in time."""
+        try:
+            hours = int(params['hours']) if params.get('hours') else None
+            limit = int(params['limit']) if params.get('limit') else None
+            page = int(params.get('page') or 0)
+        except ValueError as e:
+            log(f"broadcastWindow: invalid window {params} - {e}", xbmc.LOGWARNING)
+            return None, None, 0
+        return hours, limit or None, max(page, 0)
+
+    def nextPage(self, params):
+        """Number of the page after the one of a getbroadcasts path, '' if this
+        is the last one."""
+        _, limit, page = self.broadcastWindow(params)
+        shown = sum(len(items) for _, items in self.data)
+        return str(page + 1) if limit and shown >= limit else ''
+
+    def fetchBroadcasts(self, channel_num, channel_ids, hours=None, limit=None, page=0):
+        from resources.lib.pvr_channellist import PVRChannelList
         try:
             channel_ids_dict = json.loads(channel_ids) if isinstance(channel_ids, str) else channel_ids
             channel_id = channel_ids_dict.get(str(channel_num)) or channel_ids_dict.get(channel_num)
             if not channel_id:
                 log(f"fetchBroadcasts: channel_num {channel_num} not found in channel_ids", xbmc.LOGWARNING)
-                return
+                return False
         except Exception as e:
             log(f"fetchBroadcasts: error parsing channel_ids or getting channel_id: {e}", xbmc.LOGERROR)
-            return
+            return False
 
         cl = PVRChannelList()
-        broadcasts = cl.fetchBroadcasts(channel_id)
-        append_items(self.resultlist, broadcasts, type='broadcasts_short')
-
-    #######################################################################################
-    # Private helper methods
-    #######################################################################################
-
-    def getInprogressTVShows(self):
-        try:
-            query = json_call('VideoLibrary.GetTVShows',
-                              properties=[],
-                              limit=25,
-                              sort={"method": "lastplayed", "order": "descending"},
-                              query_filter={'field': 'inprogress', 'operator': 'true', 'value': ''})
-            tvshows = query['result'].get('tvshows', [])
-            return tvshows
-        except Exception:
-            log('getInprogressTVShows: No Inprogress TVShows found or error.', xbmc.LOGWARNING)
-            return []
-
-    def getLastPlayedEpisode(self, tvshowid):
-        try:
-            query = json_call('VideoLibrary.GetEpisodes',
-                              properties=['season', 'episodeid'],
-                              limit=1,
-                              sort={"method": "lastplayed", "order": "descending"},
-                              query_filter={"field": "playcount", "operator": "isnot", "value": "0"},
-                              params={'tvshowid': tvshowid})
-            last_played = query['result'].get('episodes', [])
-            if last_played:
-                return last_played[0]
-        except Exception:
-            log('getLastPlayedEpisode: No Last Played Episode found or error.', xbmc.LOGWARNING)
-        return None
-
-    def getNextEpisode(self, tvshowid, last_played_episode):
-        # Adjust logic to find next episode based on season and episode number
-        try:
-            current_season = last_played_episode.get('season', 0)
-            current_episode_id = last_played_episode.get('episodeid')
-            query = json_call('VideoLibrary.GetEpisodes',
-                              properties=['episodeid', 'season'],
-                              sort={"method": "episode"},
-                              query_filter={"field": "season", "operator": "greaterthanorequal", "value": str(current_season)},
-                              params={'tvshowid': tvshowid})
-            episodes = query['result'].get('episodes', [])
-            found = False
-            for episode in episodes:
-                if found:
-                    return episode['episodeid']
-                if episode['episodeid'] == current_episode_id:
-                    found = True
-            return 0
-        except Exception as e:
-            log(f"getNextEpisode: error fetching next episode: {e}", xbmc.LOGERROR)
-            return 0
-
-    def getEpisode(self, episodeid):
-        try:
-            query = json_call('VideoLibrary.GetEpisodeDetails',
-                              properties=episode_properties,
-                              params={'episodeid': episodeid})
-            episode = query['result'].get('episodedetails', {})
-            return episode
-        except Exception as e:
-            log(f"getEpisode: error fetching episode details for id {episodeid}: {e}", xbmc.LOGWARNING)
-            return {}
+        broadcasts = cl.fetchBroadcasts(channel_id, hours, limit, page)
+        if broadcasts is None:
+            return False
+        self.addItems(broadcasts, 'broadcasts_short')
+        return True
+
+    def parseChannelIds(self, channel_ids):
+        # widget paths pass '1-2-3', older ones a JSON dict or list
+        if isinstance(channel_ids, str):
+            if channel_ids.replace('-', '').isdigit():
+                return [int(channel_id) for channel_id in channel_ids.split('-')]
+            channel_ids = json.loads(channel_ids)
+        if isinstance(channel_ids, dict):
+            return list(channel_ids.values())
+        return list(channel_ids)
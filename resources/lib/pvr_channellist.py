@@ -3,10 +3,13 @@
 
 import locale
 import json
+import time
 import xbmcgui
-from datetime import datetime
 
-from resources.lib.helper import *  # Usar helper com json_call, log, getUtcOffset, getTimeFromString etc.
+from resources.lib.helper import *
+from resources.lib.broadcast_table import BroadcastTable
+from resources.lib.epg_store import EpgStore
+from resources.lib.pvr_channels import CHANNELS
 
 #######################################################################################
 
@@ -19,18 +22,12 @@ class PVRChannelList:
             locale.setlocale(locale.LC_ALL, def_loc)
         except Exception:
             log(f"ERROR setting locale: {def_loc}", xbmc.LOGERROR)
+        self.store = EpgStore()
 
     def setChannelIds(self):
-        # Usar json_call do helper com parâmetros adequados
-        res = json_call('PVR.GetChannels', 
-                        properties=['channelnumber', 'channelid'], 
-                        params={'channelgroupid': 'alltv'})
-
-        channels = []
-        try:
-            channels = res['result']['channels']
-        except Exception as e:
-            log(f"setChannelIds: failed to get channels - {e}", xbmc.LOGERROR)
+        channels = CHANNELS.group('alltv')
+        if not channels:
+            log("setChannelIds: failed to get channels", xbmc.LOGERROR)
             return None
 
         channel_ids = {ch['channelnumber']: ch['channelid'] for ch in channels}
@@ -39,47 +36,33 @@ class PVRChannelList:
         win.setProperty('channel_ids', json.dumps(channel_ids))
         log(f"setChannelIds: stored {len(channel_ids)} channels", xbmc.LOGDEBUG)
 
-    def fetchBroadcasts(self, channel_id):
-
+    def fetchBroadcasts(self, channel_id, hours=None, limit=None, page=0):
+        """The broadcasts of a channel from now on, within the next hours and
+        the page-th slice of limit rows (no bound if hours/limit are None).
+        None if PVR.GetBroadcasts failed."""
+        now = int(time.time())
+        until = now + hours * 3600 if hours else None
+        offset = page * limit if limit else 0
+        table = self.store.getBroadcastTable(channel_id, now, until, limit, offset)
+        if table is not None:
+            return self.beautifyBroadcasts(channel_id, table, range(len(table)))
+
+        # PVR.GetBroadcasts can't filter on time and lists past broadcasts
+        # first, so without the store the window is cut out after the call
         res = json_call('PVR.GetBroadcasts', 
                         properties=broadcast_properties_short, 
                         params={'channelid': channel_id})
-
-        broadcasts = []
         try:
             broadcasts = res['result']['broadcasts']
         except Exception as e:
             log(f"fetchBroadcasts: failed to get broadcasts for channel {channel_id} - {e}", xbmc.LOGERROR)
-            return []
-
-        broadcasts_beautified = self.beautifyBroadcasts(channel_id, broadcasts)
-        return broadcasts_beautified
-
-    def beautifyBroadcasts(self, channel_id, broadcasts):
-        utc_offset = getUtcOffset()
-        now = datetime.now()
-        broadcasts_beautified = []
-
-        for bc in broadcasts:
-            starttime = getTimeFromString(bc.get('starttime', ''), '%Y-%m-%d %H:%M:%S', utc_offset)
-            endtime = getTimeFromString(bc.get('endtime', ''), '%Y-%m-%d %H:%M:%S', utc_offset)
-
-            if not starttime or not endtime:
-                continue
-            if endtime < now:
-                continue
+            return None
+        table = BroadcastTable().extend(channel_id, broadcasts)
+        return self.beautifyBroadcasts(channel_id, table, table.window(now, until, limit, offset))
 
-            bc_beautified = {
-                'id': bc.get('broadcastid', ''),
-                'channel_id': channel_id,
-                'title': bc.get('title', ''),
-                'episodename': bc.get('episodename', ''),
-                'runtime': bc.get('runtime', 0),
-                'date': starttime.strftime('%a %d.%b'),
-                'starttime': starttime.strftime('%H:%M'),
-                'endtime': endtime.strftime('%H:%M'),
-            }
-            broadcasts_beautified.append(bc_beautified)
+    def beautifyBroadcasts(self, channel_id, table, rows):
+        # only the rows of the window are formatted
+        broadcasts_beautified = [table.format(row) for row in rows]
 
         log(f"beautifyBroadcasts: {len(broadcasts_beautified)} broadcasts beautified for channel {channel_id}", xbmc.LOGDEBUG)
         return broadcasts_beautified
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Channel dimension table.
+
+Channels are kept once, in a dict keyed by channelid, no matter how many
+channel groups contain them. Channel numbers are per group in Kodi, so a
+group is stored as two compact arrays in group order, the channelids and
+their numbers in that group, and every group is indexed by
+(channelgroupid, channelnumber), so the position of the playing channel
+is a dict lookup. Rows referencing channels (timers, broadcasts) are joined
+in memory instead of querying PVR.GetChannelDetails per row. Groups are
+loaded on demand, several of them in one batched call; radio channels are
+only loaded when a lookup misses. The table is dropped after MAX_AGE
+seconds or when the pvr domain of the JSON cache is invalidated.
+"""
+
+import time
+from array import array
+
+import xbmc
+
+from resources.lib.helper import *
+
+MAX_AGE = 600
+
+class ChannelTable:
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.channels = {}
+        self.groups = {}
+        self.numbers = {}
+        self.loaded_at = time.time()
+        self.generation = JSON_CACHE.generation('pvr')
+
+    def isStale(self):
+        return time.time() - self.loaded_at > MAX_AGE or self.generation != JSON_CACHE.generation('pvr')
+
+    def get(self, channelid):
+        self.loadGroups(['alltv'])
+        channel = self.channels.get(channelid)
+        if channel is None and 'allradio' not in self.groups:
+            self.loadGroups(['allradio'])
+            channel = self.channels.get(channelid)
+        return channel
+
+    def group(self, channelgroupid):
+        """Channels of a group in group order with their number in that group,
+        empty if the group can't be loaded."""
+        self.loadGroups([channelgroupid])
+        channelids, numbers = self.groups.get(channelgroupid, ((), ()))
+        return [dict(self.channels[channelid], channelnumber=number) for channelid, number in zip(channelids, numbers)]
+
+    def locate(self, channelgroupid, channelnumber):
+        """Index of the channel with channelnumber in a loaded group, or None."""
+        return self.numbers.get((channelgroupid, channelnumber))
+
+    def join(self, rows, key='channelid'):
+        """Yields (row, channel) pairs, channel is None for unknown ids."""
+        for row in rows:
+            yield row, self.get(row.get(key))
+
+    def loadGroups(self, channelgroupids):
+        """Loads the groups not loaded yet with one batched call, returns False if one failed."""
+        if self.groups and self.isStale():
+            self.clear()
+        missing = [channelgroupid for channelgroupid in channelgroupids if channelgroupid not in self.groups]
+        if not missing:
+            return True
+        if not self.groups:
+            self.loaded_at = time.time()
+        requests = [json_request('PVR.GetChannels', properties=channel_properties, params={'channelgroupid': channelgroupid})
+                    for channelgroupid in missing]
+        loaded = True
+        for channelgroupid, query in zip(missing, json_batch(requests)):
+            try:
+                channels = query['result']['channels']
+            except (KeyError, TypeError):
+                log(f"ChannelTable: error loading channel group {channelgroupid}", xbmc.LOGWARNING)
+                loaded = False
+                continue
+            channelids = array('i')
+            numbers = array('i')
+            for index, channel in enumerate(channels):
+                # get() answers with the numbers of the all channels groups
+                if channelgroupid in ('alltv', 'allradio'):
+                    self.channels[channel['channelid']] = channel
+                else:
+                    self.channels.setdefault(channel['channelid'], channel)
+                self.numbers[(channelgroupid, channel['channelnumber'])] = index
+                channelids.append(channel['channelid'])
+                numbers.append(channel['channelnumber'])
+            self.groups[channelgroupid] = (channelids, numbers)
+        return loaded
+
+CHANNELS = ChannelTable()
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 import locale
-from datetime import datetime, timedelta
 import xbmcgui
-from resources.lib.helper import *  # Presumo que tenha funções usadas aqui (json_call, getUtcOffset, getTimeFromString, log)
+from resources.lib.helper import *
+from resources.lib.epg_store import EpgStore
+from resources.lib.timeutils import epgToEpoch, formatTime, startTimeInterval
+from resources.lib.broadcast_index import INDEX_CACHE
+from resources.lib.broadcast_table import BroadcastTable
+from resources.lib.pvr_channels import CHANNELS
 
 #######################################################################################
 
@@ -15,27 +19,23 @@ class PVRRunningAt:
                 locale.setlocale(locale.LC_ALL, default_locale)
         except Exception:
             log(f"ERROR setting locale: {default_locale}")
+        self.store = EpgStore()
 
-    def getBroadcastAt(self, starttime_str, channelid):
-        utc_offset = getUtcOffset()
-        broadcasts = self.getBroadcasts(channelid)
-        if not broadcasts:
+    def getBroadcastAt(self, starttime_str, channelid, table=None):
+        if table is None:
+            table = self.getBroadcastTable(channelid)
+        if not table:
             return None
 
-        starttime, start_interval, stop_interval = self.getStartTimeInterval(starttime_str)
-        fallback_index = -1
-
-        for i, broadcast in enumerate(broadcasts):
-            start_bc = getTimeFromString(broadcast['starttime'], '%Y-%m-%d %H:%M:%S', utc_offset)
-            end_bc = getTimeFromString(broadcast['endtime'], '%Y-%m-%d %H:%M:%S', utc_offset)
+        starttime, start_interval, stop_interval = startTimeInterval(starttime_str)
 
-            if start_interval < start_bc < stop_interval and end_bc > stop_interval:
-                return broadcast
+        # prefer a broadcast starting around the point in time
+        for row in table.index.overlapping(start_interval, stop_interval):
+            if start_interval < table.starts[row] < stop_interval and table.ends[row] > stop_interval:
+                return table.record(row)
 
-            if start_bc < starttime < end_bc:
-                fallback_index = i
-
-        return broadcasts[fallback_index] if fallback_index >= 0 else None
+        row = table.index.at(starttime)
+        return None if row is None else table.record(row)
 
     def showInfo(self, broadcast_id, channel_id, xml_file, xml_filepath):
         bc_id = [{'broadcastid': int(broadcast_id), 'channelid': int(channel_id)}]
@@ -85,36 +85,53 @@ class PVRRunningAt:
     # Private methods
     #######################################################################################
 
-    def getBroadcasts(self, channelid):
-        query = json_call('PVR.GetBroadcasts', params={'channelid': channelid}, properties=['starttime', 'endtime'])
-        try:
-            return query['result']['broadcasts']
-        except Exception:
-            log("ERROR getBroadcasts")
-            return None
+    def getBroadcastTable(self, channelid):
+        return self.getBroadcastTables([channelid]).get(channelid)
+
+    def getBroadcastTables(self, channelids):
+        tables = {}
+        missing = []
+        for channelid in channelids:
+            stamp = self.store.syncedAt(channelid)
+            if stamp is None:
+                missing.append(channelid)
+                continue
+            table = INDEX_CACHE.get(channelid, stamp)
+            if table is None:
+                table = self.store.getBroadcastTable(channelid) or BroadcastTable()
+                INDEX_CACHE.put(channelid, stamp, table)
+            tables[channelid] = table
+
+        requests = [json_request('PVR.GetBroadcasts', params={'channelid': channelid}, properties=['starttime', 'endtime'])
+                    for channelid in missing]
+        for channelid, query in zip(missing, json_batch(requests)):
+            try:
+                tables[channelid] = BroadcastTable().extend(channelid, query['result']['broadcasts'])
+            except Exception:
+                log(f"ERROR getBroadcasts for channel {channelid}")
+                tables[channelid] = None
+        return tables
 
-    def getBroadcastsById(self, broadcast_ids):
-        utc_offset = getUtcOffset()
+    def getBroadcastsById(self, broadcast_ids, properties=broadcast_properties):
         broadcasts = []
 
-        for bc in broadcast_ids:
-            bc_id = bc['broadcastid']
-            channel_id = bc['channelid']
+        requests = [json_request('PVR.GetBroadcastDetails', params={'broadcastid': bc['broadcastid']}, properties=properties)
+                    for bc in broadcast_ids]
 
-            query = json_call('PVR.GetBroadcastDetails', params={'broadcastid': bc_id}, properties=broadcast_properties)
+        for bc, query in zip(broadcast_ids, json_batch(requests)):
             try:
                 broadcast = query['result']['broadcastdetails']
-                starttime = getTimeFromString(broadcast['starttime'], '%Y-%m-%d %H:%M:%S', utc_offset)
-                endtime = getTimeFromString(broadcast['endtime'], '%Y-%m-%d %H:%M:%S', utc_offset)
+                starttime = epgToEpoch(broadcast['starttime'])
+                endtime = epgToEpoch(broadcast['endtime'])
 
                 broadcast.update({
-                    'date': starttime.strftime('%d.%m'),
-                    'datelong': starttime.strftime('%a %d.%b'),
-                    'starttime': starttime.strftime('%H:%M'),
-                    'endtime': endtime.strftime('%H:%M'),
-                    'switchdate': starttime.strftime('%d.%m.%Y %H:%M'),
+                    'date': formatTime(starttime, '%d.%m'),
+                    'datelong': formatTime(starttime, '%a %d.%b'),
+                    'starttime': formatTime(starttime),
+                    'endtime': formatTime(endtime),
+                    'switchdate': formatTime(starttime, '%d.%m.%Y %H:%M'),
                     'cast': self.beautifyCast(broadcast.get('cast', '')),
-                    'channel': self.getChannelDetails(channel_id)
+                    'channel': CHANNELS.get(bc['channelid'])
                 })
 
                 broadcasts.append(broadcast)
@@ -127,20 +144,3 @@ class PVRRunningAt:
         if not cast:
             return ''
         return '\n'.join(actor.strip() for actor in cast.split(','))
-
-    def getChannelDetails(self, channel_id):
-        query = json_call('PVR.GetChannelDetails', properties=channel_properties, params={'channelid': channel_id})
-        try:
-            return query['result']['channeldetails']
-        except Exception:
-            return None
-
-    def getStartTimeInterval(self, str_starttime):
-        now = datetime.now()
-        date_now = now.strftime("%m-%d-%Y")
-        starttime = getTimeFromString(f"{date_now} {str_starttime}", '%m-%d-%Y %H:%M')
-        if now > starttime:
-            starttime += timedelta(days=1)
-        start_interval = starttime - timedelta(seconds=300)
-        stop_interval = starttime + timedelta(seconds=300)
-        return starttime, start_interval, stop_interval
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Readiness of PVR, owned by the service.
+
+PVR starts some time after Kodi and restarts after a wakeup. The service
+probes it until channels and EPG are available, then publishes the state
+and the time PVR became ready as properties of the home window, which
+helper.pvrAvailable checks in O(1).
+"""
+
+import time
+
+import xbmc
+import xbmcgui
+
+from resources.lib.helper import *
+
+STATE_WAITING = 'waiting'
+STATE_READY = 'ready'
+STATE_SLEEPING = 'sleeping'
+
+# seconds between two probes while waiting, doubled up to PROBE_MAX_INTERVAL
+PROBE_INTERVAL = 1
+PROBE_MAX_INTERVAL = 30
+
+class PVRReadiness:
+
+    def __init__(self, win=None):
+        self.win = win or xbmcgui.Window(10000)
+        self.probe_interval = PROBE_INTERVAL
+        self.next_probe = 0
+        self.setState(STATE_WAITING)
+
+    def setState(self, state):
+        self.state = state
+        self.win.setProperty(PVR_STATE_PROPERTY, state)
+        if state == STATE_READY:
+            self.win.setProperty(PVR_READY_PROPERTY, str(int(time.time())))
+        else:
+            self.win.clearProperty(PVR_READY_PROPERTY)
+        log(f"PVRReadiness: {state}", xbmc.LOGDEBUG)
+
+    def isReady(self):
+        return self.state == STATE_READY
+
+    def tick(self, now=None):
+        now = now or time.time()
+        if self.state != STATE_WAITING or now < self.next_probe:
+            return self.state == STATE_READY
+        if pvrProbe():
+            self.setState(STATE_READY)
+            self.probe_interval = PROBE_INTERVAL
+            return True
+        self.next_probe = now + self.probe_interval
+        self.probe_interval = min(self.probe_interval * 2, PROBE_MAX_INTERVAL)
+        return False
+
+    def nextWakeup(self, now=None):
+        """Seconds until the next probe, None if no probe is pending."""
+        if self.state != STATE_WAITING:
+            return None
+        return max(self.next_probe - (now or time.time()), 0.2)
+
+    def onNotification(self, method):
+        if method == 'System.OnSleep':
+            self.setState(STATE_SLEEPING)
+        elif method == 'System.OnWake':
+            self.next_probe = 0
+            self.setState(STATE_WAITING)
+
+    def close(self):
+        self.win.clearProperty(PVR_STATE_PROPERTY)
+        self.win.clearProperty(PVR_READY_PROPERTY)
@@ -2,7 +2,8 @@
 import time
 import xbmc
 import xbmcgui
-from resources.lib.helper import json_call, log, getUtcOffset
+from resources.lib.helper import json_call, log, timer_properties
+from resources.lib.timeutils import epgToEpoch
 
 
 class PVRTimers:
@@ -62,13 +63,17 @@ class PVRTimers:
             log(f"ERROR FETCH TIMER {timer_id}: {e}")
             return None
 
-    def fetchChannel(self, channel_id):
-        try:
-            query = json_call('PVR.GetChannelDetails', properties=channel_properties, params={'channelid': channel_id})
-            return query['result'].get('channeldetails')
-        except Exception as e:
-            log(f"ERROR FETCH CHANNEL {channel_id}: {e}")
-            return None
+    def nextChange(self, timers):
+        """Epoch of the next start or end of a timer, None if there is none."""
+        now = time.time()
+        changes = []
+        for timer in timers:
+            for key in ('starttime', 'endtime'):
+                change = epgToEpoch(timer.get(key))
+                if change and change > now:
+                    changes.append(change)
+                    break
+        return min(changes) if changes else None
 
     def delTimer(self, timer_id):
         try:
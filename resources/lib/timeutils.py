@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EPG time parsing and formatting.
+
+Kodi hands out EPG times as UTC strings in the fixed format
+'YYYY-MM-DD HH:MM:SS'. They are parsed by slicing into epoch seconds, which
+is several times faster than datetime.strptime. Local times are derived
+from the epoch with the UTC offset valid at that moment (DST aware), and
+formatted strings are memoised since EPG rows share a small set of minutes.
+Points in time of the running at widgets ('HH:MM', local) are resolved to
+their next occurrence.
+"""
+
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+def _daysFromCivil(year, month, day):
+    # days since 1970-01-01 of a proleptic gregorian date (H. Hinnant)
+    year -= month <= 2
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+@lru_cache(maxsize=1024)
+def _dayEpoch(date_part):
+    return _daysFromCivil(int(date_part[0:4]), int(date_part[5:7]), int(date_part[8:10])) * 86400
+
+def epgToEpoch(str_time):
+    """Epoch seconds of a JSON-RPC EPG time, None if it can't be parsed."""
+    try:
+        return (_dayEpoch(str_time[0:10])
+                + int(str_time[11:13]) * 3600 + int(str_time[14:16]) * 60 + int(str_time[17:19]))
+    except (ValueError, TypeError):
+        return None
+
+@lru_cache(maxsize=256)
+def _utcOffset(slot):
+    return time.localtime(slot * 1800).tm_gmtoff
+
+def utcOffset(epoch=None):
+    """Local UTC offset in seconds valid at epoch (default: now).
+
+    Offsets are looked up once per half hour slot, which is the granularity
+    of DST and timezone transitions.
+    """
+    if epoch is None:
+        epoch = time.time()
+    return _utcOffset(int(epoch) // 1800)
+
+@lru_cache(maxsize=4096)
+def _formatMinute(local_minute, fmt):
+    return time.strftime(fmt, time.gmtime(local_minute * 60))
+
+def formatTime(epoch, fmt='%H:%M'):
+    """Formats epoch as local time. Results are memoised per minute, so fmt
+    must not contain seconds."""
+    if epoch is None:
+        return ''
+    return _formatMinute((epoch + utcOffset(epoch)) // 60, fmt)
+
+def startTimeInterval(str_starttime, margin=300):
+    """Epochs of the next occurrence of the local time str_starttime ('HH:MM')
+    and of margin seconds before and after it, as (start, from, to).
+    Raises ValueError if str_starttime isn't a time."""
+    hour, minute = str_starttime.split(':')
+    now = datetime.now()
+    starttime = now.replace(hour=int(hour), minute=int(minute), second=0, microsecond=0)
+    if now > starttime:
+        starttime += timedelta(days=1)
+    start = starttime.timestamp()
+    return start, start - margin, start + margin
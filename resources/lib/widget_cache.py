@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serialized result sets of the plugin routes.
+
+The data behind a plugin route (the rows handed to listitems.build, not the
+ListItems) is stored as a JSON blob in a property of the home window, keyed
+on the route and its parameters. Routes whose path carries a reload token
+(widgetreload-<widget>) are valid for exactly that token, so the service can
+compute the result before it bumps the token. Routes without a token are
+valid for MAX_AGES seconds.
+
+The keys stored for a route are listed in its INDEX_PROPERTY. Every put
+clears the entries of the route that are no longer valid, those of an
+older reload token or past their max age, so properties of parameter sets
+no widget asks for anymore do not pile up.
+"""
+
+import json
+import time
+
+import xbmcgui
+
+CACHE_PROPERTY = 'unfussy.widgetcache.%s'
+INDEX_PROPERTY = 'unfussy.widgetcache.index.%s'
+
+# parameters not identifying the result set
+IGNORED_PARAMS = ('reload',)
+
+# seconds a result set without reload token stays valid
+MAX_AGES = {
+    'getbroadcasts': 60,
+    'getcast': 600,
+}
+
+class WidgetCache:
+
+    def __init__(self, win=None):
+        self.win = win or xbmcgui.Window(10000)
+
+    def key(self, info, params):
+        items = sorted((name, value) for name, value in params.items() if name not in IGNORED_PARAMS and name != 'info')
+        return CACHE_PROPERTY % '&'.join([info] + [f'{name}={value}' for name, value in items])
+
+    def get(self, info, params):
+        """Cached data of a route, None if there is no valid entry."""
+        cached = self.win.getProperty(self.key(info, params))
+        if not cached:
+            return None
+        try:
+            entry = json.loads(cached)
+        except ValueError:
+            return None
+        token = params.get('reload')
+        if token:
+            if entry.get('token') != token:
+                return None
+        elif time.time() - entry.get('time', 0) > MAX_AGES.get(info, 0):
+            return None
+        return entry['data']
+
+    def put(self, info, params, data, token=None):
+        entry = {
+            'token': token if token is not None else params.get('reload', ''),
+            'time': time.time(),
+            'data': data
+        }
+        key = self.key(info, params)
+        index = self.prune(info, entry['token'], entry['time'])
+        self.win.setProperty(key, json.dumps(entry, separators=(',', ':')))
+        index[key] = [entry['token'], entry['time']]
+        self.saveIndex(info, index)
+
+    def delete(self, info, params):
+        key = self.key(info, params)
+        self.win.clearProperty(key)
+        index = self.loadIndex(info)
+        if index.pop(key, None):
+            self.saveIndex(info, index)
+
+    def prune(self, info, token, now):
+        """Clears the entries of info that are stale once an entry with
+        token is stored, returns the index of the remaining ones."""
+        index = self.loadIndex(info)
+        for key, (entry_token, entry_time) in list(index.items()):
+            if (entry_token != token) if token else (now - entry_time > MAX_AGES.get(info, 0)):
+                self.win.clearProperty(key)
+                del index[key]
+        return index
+
+    def loadIndex(self, info):
+        try:
+            return json.loads(self.win.getProperty(INDEX_PROPERTY % info) or '{}')
+        except ValueError:
+            return {}
+
+    def saveIndex(self, info, index):
+        self.win.setProperty(INDEX_PROPERTY % info, json.dumps(index, separators=(',', ':')))
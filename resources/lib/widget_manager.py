@@ -9,598 +9,597 @@ from resources.lib.helper import *
 
 ADDON = xbmcaddon.Addon()
 
-class WidgetManager:
-    """
-    # Categories:
-    # 0:  Live TV Widget
-    #     Type 0: LiveTV
-    #     Type 1: Recordings
-    #     Type 2: GTO
-    #     Type 3: Running At
-    #     Type 4: Timers
-    # 1:  Movie Widget
-    #     Type 0: Inprogress Movies
-    #     Type 1: Recently added Movies
-    #     Type 2: Movie Playlist
-    # 2:  TVShow Widget
-    #     Type 0: Recently added TVShows
-    #     Type 1: Inprogress TVShows
-    #     Type 2: Series Playlist
-    #     Type 3: Episode Playlist
-    # 3:  Music Widget
-    #     Type 0: unplayed albums
-    #     Type 1: mostplayed albums
-    #     Type 2: random albums
-    #     Type 3: music playlist - songs
-    #     Type 4: music playlist - albums
-    #     Type 5: music playlist - artists
-    # 4:  Music Video Widget
-    #     Type 0: recent unwatched musicvideos
-    #     Type 1: random_musicvideos
-    #     Type 2: musicvideo playlist
-    # 5:  Addon Widget
-    #     Type 0: addons
-    #     Type 1: addon path
-    #     Type 2: favorites
-    # 6:  Weather Widget
-    #     Type 0: weather hourly
-    #     Type 1: weather daily
-    """
-
-    def __init__(self):
-        self.categories = [
-            ADDON.getLocalizedString(30200),
-            ADDON.getLocalizedString(30201),
-            ADDON.getLocalizedString(30202),
-            ADDON.getLocalizedString(30203),
-            ADDON.getLocalizedString(30204),
-            ADDON.getLocalizedString(30205),
-            ADDON.getLocalizedString(30207)
-        ]
-        self.types = []
-        self._init_types()
-
-    def __init__(self):
-        self.categories = [
-            ADDON.getLocalizedString(30200),
-            ADDON.getLocalizedString(30201),
-            ADDON.getLocalizedString(30202),
-            ADDON.getLocalizedString(30203),
-            ADDON.getLocalizedString(30204),
-            ADDON.getLocalizedString(30205),
-            ADDON.getLocalizedString(30207)
-        ]
-
-        self.types = []
-        # 0:  Live TV Widgets
-        self.types.append(
-            [
-                {
-                    'header': ADDON.getLocalizedString(30208),
-                    'headeraction': 'Action(PlayPvrTV)',
-                    'description': ADDON.getLocalizedString(30209),
-                    'path': 'pvr://channels/tv/*',
-                    'sortby': '',
-                    'sortorder': 'descending',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': ADDON.getLocalizedString(30266),
-                            'widget': 'livetv_small',
-                            'width': 260,
-                            'height': 250
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': ADDON.getLocalizedString(30267),
-                            'widget': 'livetv_large',
-                            'width': 260,
-                            'height': 425
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': ADDON.getLocalizedString(30288),
-                            'widget': 'livetv_wide',
-                            'width': 410,
-                            'height': 300
-                        }
-                    ]
+# Widget registry. Text fields (header, description, label, desc) hold the
+# id of a localized string or a literal string, they are resolved when read.
+CATEGORIES = (30200, 30201, 30202, 30203, 30204, 30205, 30207)
+
+WIDGET_TYPES = (
+    # 0:  Live TV Widgets
+    [
+        {
+            'header': 30208,
+            'headeraction': 'Action(PlayPvrTV)',
+            'description': 30209,
+            'path': 'pvr://channels/tv/*',
+            'sortby': '',
+            'sortorder': 'descending',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': 30266,
+                    'widget': 'livetv_small',
+                    'width': 260,
+                    'height': 250
                 },
                 {
-                    'header': ADDON.getLocalizedString(30210),
-                    'headeraction': 'ActivateWindow(tvrecordings)',
-                    'description': ADDON.getLocalizedString(30211),
-                    'path': 'pvr://recordings/tv/active?view=flat',
-                    'setlimit': True,
-                    'sortby': 'date',
-                    'sortorder': 'descending',
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': ADDON.getLocalizedString(30266),
-                            'widget': 'recordings_small',
-                            'width': 260,
-                            'height': 250
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': ADDON.getLocalizedString(30267),
-                            'widget': 'recordings_large',
-                            'width': 260,
-                            'height': 425
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': ADDON.getLocalizedString(30288),
-                            'widget': 'recordings_wide',
-                            'width': 410,
-                            'height': 300
-                        }
-                    ]
+                    'label': 30264,
+                    'desc': 30267,
+                    'widget': 'livetv_large',
+                    'width': 260,
+                    'height': 425
                 },
                 {
-                    'header': 'German Telecast Offers',
-                    'headeraction': 'ActivateWindow(tvguide)',
-                    'description': ADDON.getLocalizedString(30268),
-                    'setlimit': False,
-                    'path': 'plugin://script.service.gto?action=getcontent&ts=$INFO[Window(Home).Property(GTO.timestamp)]',
-                    'onclick': 'RunScript(script.service.gto,action=infopopup&blob=$INFO[ListItem.Property(BlobID)])',
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': '',
-                            'widget': 'gto',
-                            'width': 366,
-                            'height': 250
-                        }
-                    ]
+                    'label': 30265,
+                    'desc': 30288,
+                    'widget': 'livetv_wide',
+                    'width': 410,
+                    'height': 300
+                }
+            ]
+        },
+        {
+            'header': 30210,
+            'headeraction': 'ActivateWindow(tvrecordings)',
+            'description': 30211,
+            'path': 'pvr://recordings/tv/active?view=flat',
+            'setlimit': True,
+            'sortby': 'date',
+            'sortorder': 'descending',
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': 30266,
+                    'widget': 'recordings_small',
+                    'width': 260,
+                    'height': 250
                 },
                 {
-                    'header': ADDON.getLocalizedString(30224),
-                    'headeraction': 'ActivateWindow(tvguide)',
-                    'description': ADDON.getLocalizedString(30225),
-                    'setlimit': False,
-                    'path': 'plugin://script.unfussy.helper/?info=getrunningat&reload=$INFO[Window(Home).Property(widgetreload-runningat)]',
-                    'onclick': 'RunScript(script.unfussy.helper,action=info_runningat&bc_id=$INFO[ListItem.Property(broadcastid)]&c_id=$INFO[ListItem.Property(channelid)])',
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': ADDON.getLocalizedString(30266),
-                            'widget': 'tv_runningat_small',
-                            'width': 260,
-                            'height': 250
-                        },
-                    ]
+                    'label': 30264,
+                    'desc': 30267,
+                    'widget': 'recordings_large',
+                    'width': 260,
+                    'height': 425
                 },
                 {
-                    'header': ADDON.getLocalizedString(30226),
-                    'headeraction': 'ActivateWindow(tvtimers)',
-                    'description': ADDON.getLocalizedString(30227),
-                    'path': 'plugin://script.unfussy.helper/?info=gettimers&reload=$INFO[Window(Home).Property(widgetreload-timers)]',
-                    'onclick': 'RunScript(script.unfussy.helper,action=info_timer&timer_id=$INFO[ListItem.Property(timerid)])',
-                    'setlimit': True,
-                    'sortby': 'date',
-                    'sortorder': 'descending',
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': ADDON.getLocalizedString(30266),
-                            'widget': 'tv_runningat_small',
-                            'width': 260,
-                            'height': 250
-                        }
-                    ]
+                    'label': 30265,
+                    'desc': 30288,
+                    'widget': 'recordings_wide',
+                    'width': 410,
+                    'height': 300
                 }
             ]
-        )
-        # 1:  Movie Widgets
-        self.types.append(
-            [
-                {
-                    'header': ADDON.getLocalizedString(30212),
-                    'headeraction': 'ActivateWindow(Videos,videodb://movies/titles/,return)',
-                    'description': ADDON.getLocalizedString(30213),
-                    'path': 'special://skin/playlists/inprogress_movies.xsp',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': ADDON.getLocalizedString(30269),
-                            'widget': 'movies',
-                            'width': 260,
-                            'height': 425
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': ADDON.getLocalizedString(30295),
-                            'widget': 'movies_landscape',
-                            'width': 356,
-                            'height': 250
-                        }
-                    ]
-                },
+        },
+        {
+            'header': 'German Telecast Offers',
+            'headeraction': 'ActivateWindow(tvguide)',
+            'description': 30268,
+            'setlimit': False,
+            'path': 'plugin://script.service.gto?action=getcontent&ts=$INFO[Window(Home).Property(GTO.timestamp)]',
+            'onclick': 'RunScript(script.service.gto,action=infopopup&blob=$INFO[ListItem.Property(BlobID)])',
+            'styles': [
                 {
-                    'header': ADDON.getLocalizedString(30214),
-                    'headeraction': 'ActivateWindow(Videos,videodb://recentlyaddedmovies/,return)',
-                    'description': ADDON.getLocalizedString(30215),
-                    'path': 'special://skin/playlists/recent_unwatched_movies.xsp',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': ADDON.getLocalizedString(30269),
-                            'widget': 'movies',
-                            'width': 260,
-                            'height': 425
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': ADDON.getLocalizedString(30295),
-                            'widget': 'movies_landscape',
-                            'width': 356,
-                            'height': 250
-                        }
-                    ]
+                    'label': 30265,
+                    'desc': '',
+                    'widget': 'gto',
+                    'width': 366,
+                    'height': 250
+                }
+            ]
+        },
+        {
+            'header': 30224,
+            'headeraction': 'ActivateWindow(tvguide)',
+            'description': 30225,
+            'setlimit': False,
+            'path': 'plugin://script.unfussy.helper/?info=getrunningat&reload=$INFO[Window(Home).Property(widgetreload-runningat)]',
+            'onclick': 'RunScript(script.unfussy.helper,action=info_runningat&bc_id=$INFO[ListItem.Property(broadcastid)]&c_id=$INFO[ListItem.Property(channelid)])',
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': 30266,
+                    'widget': 'tv_runningat_small',
+                    'width': 260,
+                    'height': 250
                 },
+            ]
+        },
+        {
+            'header': 30226,
+            'headeraction': 'ActivateWindow(tvtimers)',
+            'description': 30227,
+            'path': 'plugin://script.unfussy.helper/?info=gettimers&reload=$INFO[Window(Home).Property(widgetreload-timers)]',
+            'onclick': 'RunScript(script.unfussy.helper,action=info_timer&timer_id=$INFO[ListItem.Property(timerid)])',
+            'setlimit': True,
+            'sortby': 'date',
+            'sortorder': 'descending',
+            'styles': [
                 {
-                    'header': ADDON.getLocalizedString(30247),
-                    'description': ADDON.getLocalizedString(30248),
-                    'path': 'special://masterprofile/playlists/video',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': ADDON.getLocalizedString(30269),
-                            'widget': 'movies',
-                            'width': 260,
-                            'height': 425
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': ADDON.getLocalizedString(30295),
-                            'widget': 'movies_landscape',
-                            'width': 356,
-                            'height': 250
-                        }
-                    ]
+                    'label': 30263,
+                    'desc': 30266,
+                    'widget': 'tv_runningat_small',
+                    'width': 260,
+                    'height': 250
                 }
             ]
-        )
-        # 2:  TV Show Widgets
-        self.types.append(
-            [
-                {
-                    'header': ADDON.getLocalizedString(30216),
-                    'headeraction': 'ActivateWindow(Videos,videodb://recentlyaddedepisodes/,return)',
-                    'description': ADDON.getLocalizedString(30217),
-                    'path': 'special://skin/playlists/recent_unwatched_episodes.xsp',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': ADDON.getLocalizedString(30270),
-                            'widget': 'episode',
-                            'width': 541,
-                            'height': 250
-                        }
-                    ]
-                },
+        }
+    ],
+    # 1:  Movie Widgets
+    [
+        {
+            'header': 30212,
+            'headeraction': 'ActivateWindow(Videos,videodb://movies/titles/,return)',
+            'description': 30213,
+            'path': 'special://skin/playlists/inprogress_movies.xsp',
+            'setlimit': True,
+            'styles': [
                 {
-                    'header': ADDON.getLocalizedString(30218),
-                    'headeraction': 'ActivateWindow(Videos,videodb://inprogresstvshows/,return)',
-                    'description': ADDON.getLocalizedString(30219),
-                    'path': 'plugin://script.unfussy.helper/?info=getnextepisodes&reload=$INFO[Window(Home).Property(widgetreload-nextepisodes)]',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': ADDON.getLocalizedString(30270),
-                            'widget': 'episode',
-                            'width': 541,
-                            'height': 250
-                        }
-                    ]
+                    'label': 30264,
+                    'desc': 30269,
+                    'widget': 'movies',
+                    'width': 260,
+                    'height': 425
                 },
                 {
-                    'header': ADDON.getLocalizedString(30251),
-                    'description': ADDON.getLocalizedString(30252),
-                    'path': 'special://masterprofile/playlists/video',
-                    'onclick': 'ActivateWindow(Videos,videodb://tvshows/titles/$INFO[ListItem.DBID]/,return)',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': ADDON.getLocalizedString(30271),
-                            'widget': 'movies',
-                            'width': 260,
-                            'height': 425
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': ADDON.getLocalizedString(30295),
-                            'widget': 'movies_landscape',
-                            'width': 356,
-                            'height': 250
-                        }
-                    ]
+                    'label': 30265,
+                    'desc': 30295,
+                    'widget': 'movies_landscape',
+                    'width': 356,
+                    'height': 250
+                }
+            ]
+        },
+        {
+            'header': 30214,
+            'headeraction': 'ActivateWindow(Videos,videodb://recentlyaddedmovies/,return)',
+            'description': 30215,
+            'path': 'special://skin/playlists/recent_unwatched_movies.xsp',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30264,
+                    'desc': 30269,
+                    'widget': 'movies',
+                    'width': 260,
+                    'height': 425
                 },
                 {
-                    'header': ADDON.getLocalizedString(30253),
-                    'description': ADDON.getLocalizedString(30254),
-                    'path': 'special://masterprofile/playlists/video',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': ADDON.getLocalizedString(30270),
-                            'widget': 'episode',
-                            'width': 541,
-                            'height': 250
-                        }
-                    ]
+                    'label': 30265,
+                    'desc': 30295,
+                    'widget': 'movies_landscape',
+                    'width': 356,
+                    'height': 250
                 }
             ]
-        )
-        # 3:  Music Widget
-        self.types.append(
-            [
-                {
-                    'header': ADDON.getLocalizedString(30238),
-                    'headeraction': 'ActivateWindow(Music,musicdb://recentlyaddedalbums/,return)',
-                    'description': ADDON.getLocalizedString(30239),
-                    'path': 'special://skin/playlists/unplayed_albums.xsp',
-                    'onclick': 'ActivateWindow(Music,musicdb://albums/$INFO[ListItem.DBID]/,return)',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'musicalbums',
-                            'width': 260,
-                            'height': 300
-                        }
-                    ]
-                },
+        },
+        {
+            'header': 30247,
+            'description': 30248,
+            'path': 'special://masterprofile/playlists/video',
+            'setlimit': True,
+            'styles': [
                 {
-                    'header': ADDON.getLocalizedString(30240),
-                    'headeraction': 'ActivateWindow(Music,musicdb://artists/,return)',
-                    'description': ADDON.getLocalizedString(30241),
-                    'path': 'special://skin/playlists/mostplayed_albums.xsp',
-                    'onclick': 'ActivateWindow(Music,musicdb://albums/$INFO[ListItem.DBID]/,return)',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'musicalbums',
-                            'width': 260,
-                            'height': 300
-                        }
-                    ]
+                    'label': 30264,
+                    'desc': 30269,
+                    'widget': 'movies',
+                    'width': 260,
+                    'height': 425
                 },
                 {
-                    'header': ADDON.getLocalizedString(30245),
-                    'headeraction': 'ActivateWindow(Music,musicdb://artists/,return)',
-                    'description': ADDON.getLocalizedString(30246),
-                    'path': 'special://skin/playlists/random_albums.xsp',
-                    'onclick': 'ActivateWindow(Music,musicdb://albums/$INFO[ListItem.DBID]/,return)',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'musicalbums',
-                            'width': 260,
-                            'height': 300
-                        }
-                    ]
-                },
+                    'label': 30265,
+                    'desc': 30295,
+                    'widget': 'movies_landscape',
+                    'width': 356,
+                    'height': 250
+                }
+            ]
+        }
+    ],
+    # 2:  TV Show Widgets
+    [
+        {
+            'header': 30216,
+            'headeraction': 'ActivateWindow(Videos,videodb://recentlyaddedepisodes/,return)',
+            'description': 30217,
+            'path': 'special://skin/playlists/recent_unwatched_episodes.xsp',
+            'setlimit': True,
+            'styles': [
                 {
-                    'header': ADDON.getLocalizedString(30257),
-                    'description': ADDON.getLocalizedString(30258),
-                    'path': 'special://masterprofile/playlists/music',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'musicsongs',
-                            'width': 260,
-                            'height': 300
-                        }
-                    ]
-                },
+                    'label': 30265,
+                    'desc': 30270,
+                    'widget': 'episode',
+                    'width': 541,
+                    'height': 250
+                }
+            ]
+        },
+        {
+            'header': 30218,
+            'headeraction': 'ActivateWindow(Videos,videodb://inprogresstvshows/,return)',
+            'description': 30219,
+            'path': 'plugin://script.unfussy.helper/?info=getnextepisodes&reload=$INFO[Window(Home).Property(widgetreload-nextepisodes)]',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30265,
+                    'desc': 30270,
+                    'widget': 'episode',
+                    'width': 541,
+                    'height': 250
+                }
+            ]
+        },
+        {
+            'header': 30251,
+            'description': 30252,
+            'path': 'special://masterprofile/playlists/video',
+            'onclick': 'ActivateWindow(Videos,videodb://tvshows/titles/$INFO[ListItem.DBID]/,return)',
+            'setlimit': True,
+            'styles': [
                 {
-                    'header': ADDON.getLocalizedString(30259),
-                    'description': ADDON.getLocalizedString(30260),
-                    'path': 'special://masterprofile/playlists/music',
-                    'onclick': 'ActivateWindow(Music,musicdb://albums/$INFO[ListItem.DBID]/,return)',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'musicalbums',
-                            'width': 260,
-                            'height': 300
-                        }
-                    ]
+                    'label': 30264,
+                    'desc': 30271,
+                    'widget': 'movies',
+                    'width': 260,
+                    'height': 425
                 },
                 {
-                    'header': ADDON.getLocalizedString(30261),
-                    'description': ADDON.getLocalizedString(30262),
-                    'path': 'special://masterprofile/playlists/music',
-                    'onclick': 'ActivateWindow(Music,musicdb://artists/$INFO[ListItem.DBID]/,return)',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'musicartists',
-                            'width': 260,
-                            'height': 300
-                        }
-                    ]
+                    'label': 30265,
+                    'desc': 30295,
+                    'widget': 'movies_landscape',
+                    'width': 356,
+                    'height': 250
                 }
             ]
-        )
-        # 4:  Music Video Widget
-        self.types.append(
-            [
-                {
-                    'header': ADDON.getLocalizedString(30220),
-                    'description': ADDON.getLocalizedString(30221),
-                    'path': 'special://skin/playlists/recent_unwatched_musicvideos.xsp',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': ADDON.getLocalizedString(30272),
-                            'widget': 'movies',
-                            'width': 260,
-                            'height': 425
-                        }
-                    ]
-                },
+        },
+        {
+            'header': 30253,
+            'description': 30254,
+            'path': 'special://masterprofile/playlists/video',
+            'setlimit': True,
+            'styles': [
                 {
-                    'header': ADDON.getLocalizedString(30222),
-                    'description': ADDON.getLocalizedString(30223),
-                    'path': 'special://skin/playlists/random_musicvideos.xsp',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': ADDON.getLocalizedString(30272),
-                            'widget': 'movies',
-                            'width': 260,
-                            'height': 425
-                        }
-                    ]
-                },
+                    'label': 30265,
+                    'desc': 30270,
+                    'widget': 'episode',
+                    'width': 541,
+                    'height': 250
+                }
+            ]
+        }
+    ],
+    # 3:  Music Widget
+    [
+        {
+            'header': 30238,
+            'headeraction': 'ActivateWindow(Music,musicdb://recentlyaddedalbums/,return)',
+            'description': 30239,
+            'path': 'special://skin/playlists/unplayed_albums.xsp',
+            'onclick': 'ActivateWindow(Music,musicdb://albums/$INFO[ListItem.DBID]/,return)',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'musicalbums',
+                    'width': 260,
+                    'height': 300
+                }
+            ]
+        },
+        {
+            'header': 30240,
+            'headeraction': 'ActivateWindow(Music,musicdb://artists/,return)',
+            'description': 30241,
+            'path': 'special://skin/playlists/mostplayed_albums.xsp',
+            'onclick': 'ActivateWindow(Music,musicdb://albums/$INFO[ListItem.DBID]/,return)',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'musicalbums',
+                    'width': 260,
+                    'height': 300
+                }
+            ]
+        },
+        {
+            'header': 30245,
+            'headeraction': 'ActivateWindow(Music,musicdb://artists/,return)',
+            'description': 30246,
+            'path': 'special://skin/playlists/random_albums.xsp',
+            'onclick': 'ActivateWindow(Music,musicdb://albums/$INFO[ListItem.DBID]/,return)',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'musicalbums',
+                    'width': 260,
+                    'height': 300
+                }
+            ]
+        },
+        {
+            'header': 30257,
+            'description': 30258,
+            'path': 'special://masterprofile/playlists/music',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'musicsongs',
+                    'width': 260,
+                    'height': 300
+                }
+            ]
+        },
+        {
+            'header': 30259,
+            'description': 30260,
+            'path': 'special://masterprofile/playlists/music',
+            'onclick': 'ActivateWindow(Music,musicdb://albums/$INFO[ListItem.DBID]/,return)',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'musicalbums',
+                    'width': 260,
+                    'height': 300
+                }
+            ]
+        },
+        {
+            'header': 30261,
+            'description': 30262,
+            'path': 'special://masterprofile/playlists/music',
+            'onclick': 'ActivateWindow(Music,musicdb://artists/$INFO[ListItem.DBID]/,return)',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'musicartists',
+                    'width': 260,
+                    'height': 300
+                }
+            ]
+        }
+    ],
+    # 4:  Music Video Widget
+    [
+        {
+            'header': 30220,
+            'description': 30221,
+            'path': 'special://skin/playlists/recent_unwatched_musicvideos.xsp',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30264,
+                    'desc': 30272,
+                    'widget': 'movies',
+                    'width': 260,
+                    'height': 425
+                }
+            ]
+        },
+        {
+            'header': 30222,
+            'description': 30223,
+            'path': 'special://skin/playlists/random_musicvideos.xsp',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30264,
+                    'desc': 30272,
+                    'widget': 'movies',
+                    'width': 260,
+                    'height': 425
+                }
+            ]
+        },
+        {
+            'header': 30255,
+            'description': 30256,
+            'path': 'special://masterprofile/playlists/video',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30264,
+                    'desc': 30272,
+                    'widget': 'movies',
+                    'width': 260,
+                    'height': 425
+                }
+            ]
+        }
+    ],
+    # 5:  Addon Widget
+    [
+        {
+            'header': 30228,
+            'headeraction': 'ActivateWindow(addonbrowser)',
+            'description': 30229,
+            'path': 'addons',
+            'static_content': True,
+            'setlimit': False,
+            'styles': [
                 {
-                    'header': ADDON.getLocalizedString(30255),
-                    'description': ADDON.getLocalizedString(30256),
-                    'path': 'special://masterprofile/playlists/video',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': ADDON.getLocalizedString(30272),
-                            'widget': 'movies',
-                            'width': 260,
-                            'height': 425
-                        }
-                    ]
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'favorites',
+                    'width': 260,
+                    'height': 250
                 }
             ]
-        )
-        # 5:  Addon Widget
-        self.types.append(
-            [
-                {
-                    'header': ADDON.getLocalizedString(30228),
-                    'headeraction': 'ActivateWindow(addonbrowser)',
-                    'description': ADDON.getLocalizedString(30229),
-                    'path': 'addons',
-                    'static_content': True,
-                    'setlimit': False,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'favorites',
-                            'width': 260,
-                            'height': 250
-                        }
-                    ]
+        },
+        {
+            'header': 30275,
+            'description': 30276,
+            'path': '',
+            'setlimit': True,
+            'styles': [
+                {
+                    'label': 30265,
+                    'desc': '',
+                    'widget': 'addonpath_thumb',
+                    'width': 260,
+                    'height': 260
                 },
                 {
-                    'header': ADDON.getLocalizedString(30275),
-                    'description': ADDON.getLocalizedString(30276),
-                    'path': '',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30265),
-                            'desc': '',
-                            'widget': 'addonpath_thumb',
-                            'width': 260,
-                            'height': 260
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30282),
-                            'desc': '',
-                            'widget': 'addonpath_thumb_large',
-                            'width': 310,
-                            'height': 300
-                        },
-                        {
-                            'label': ADDON.getLocalizedString(30264),
-                            'desc': '',
-                            'widget': 'addonpath_poster',
-                            'width': 260,
-                            'height': 425
-                        }
-                    ]
+                    'label': 30282,
+                    'desc': '',
+                    'widget': 'addonpath_thumb_large',
+                    'width': 310,
+                    'height': 300
                 },
                 {
-                    'header': ADDON.getLocalizedString(30230),
-                    'headeraction': 'ActivateWindow(favourites)',
-                    'description': ADDON.getLocalizedString(30231),
-                    'path': 'favourites://',
-                    'setlimit': True,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'favorites',
-                            'width': 260,
-                            'height': 250
-                        }
-                    ]
+                    'label': 30264,
+                    'desc': '',
+                    'widget': 'addonpath_poster',
+                    'width': 260,
+                    'height': 425
                 }
             ]
-        )
-        # 6:  Weather Widget
-        self.types.append(
-            [
-                {
-                    'header': ADDON.getLocalizedString(30234),
-                    'headeraction': 'ActivateWindow(Weather)',
-                    'description': ADDON.getLocalizedString(30235),
-                    'path': 'weather_hourly_items',
-                    'static_content': True,
-                    'setlimit': False,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'weather_listitem',
-                            'width': 260,
-                            'height': 300
-                        }
-                    ]
-                },
+        },
+        {
+            'header': 30230,
+            'headeraction': 'ActivateWindow(favourites)',
+            'description': 30231,
+            'path': 'favourites://',
+            'setlimit': True,
+            'styles': [
                 {
-                    'header': ADDON.getLocalizedString(30236),
-                    'headeraction': 'ActivateWindow(Weather)',
-                    'description': ADDON.getLocalizedString(30237),
-                    'path': 'weather_daily_items',
-                    'static_content': True,
-                    'setlimit': False,
-                    'styles': [
-                        {
-                            'label': ADDON.getLocalizedString(30263),
-                            'desc': '',
-                            'widget': 'weather_listitem',
-                            'width': 260,
-                            'height': 300
-                        }
-                    ]
-                }            
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'favorites',
+                    'width': 260,
+                    'height': 250
+                }
+            ]
+        }
+    ],
+    # 6:  Weather Widget
+    [
+        {
+            'header': 30234,
+            'headeraction': 'ActivateWindow(Weather)',
+            'description': 30235,
+            'path': 'weather_hourly_items',
+            'static_content': True,
+            'setlimit': False,
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'weather_listitem',
+                    'width': 260,
+                    'height': 300
+                }
             ]
-        )
+        },
+        {
+            'header': 30236,
+            'headeraction': 'ActivateWindow(Weather)',
+            'description': 30237,
+            'path': 'weather_daily_items',
+            'static_content': True,
+            'setlimit': False,
+            'styles': [
+                {
+                    'label': 30263,
+                    'desc': '',
+                    'widget': 'weather_listitem',
+                    'width': 260,
+                    'height': 300
+                }
+            ]
+        }
+    ],
+)
+
+# flat indexes of the registry, built once per interpreter
+TYPES = {}          # (cat, type) -> type entry
+STYLES = {}         # (cat, type, style) -> style entry
+WIDGET_LIST = []    # cat -> [(type, style), ...] in dialog order
+WIDGET_INDEX = {}   # (cat, type, style) -> position in WIDGET_LIST[cat]
+
+for _cat, _types in enumerate(WIDGET_TYPES):
+    WIDGET_LIST.append([])
+    for _type, _entry in enumerate(_types):
+        TYPES[(_cat, _type)] = _entry
+        for _style, _style_entry in enumerate(_entry['styles']):
+            STYLES[(_cat, _type, _style)] = _style_entry
+            WIDGET_INDEX[(_cat, _type, _style)] = len(WIDGET_LIST[_cat])
+            WIDGET_LIST[_cat].append((_type, _style))
+
+# language -> {string id: localized string}
+LOCALIZED = {}
+
+class WidgetManager:
+    """
+    # Categories:
+    # 0:  Live TV Widget
+    #     Type 0: LiveTV
+    #     Type 1: Recordings
+    #     Type 2: GTO
+    #     Type 3: Running At
+    #     Type 4: Timers
+    # 1:  Movie Widget
+    #     Type 0: Inprogress Movies
+    #     Type 1: Recently added Movies
+    #     Type 2: Movie Playlist
+    # 2:  TVShow Widget
+    #     Type 0: Recently added TVShows
+    #     Type 1: Inprogress TVShows
+    #     Type 2: Series Playlist
+    #     Type 3: Episode Playlist
+    # 3:  Music Widget
+    #     Type 0: unplayed albums
+    #     Type 1: mostplayed albums
+    #     Type 2: random albums
+    #     Type 3: music playlist - songs
+    #     Type 4: music playlist - albums
+    #     Type 5: music playlist - artists
+    # 4:  Music Video Widget
+    #     Type 0: recent unwatched musicvideos
+    #     Type 1: random_musicvideos
+    #     Type 2: musicvideo playlist
+    # 5:  Addon Widget
+    #     Type 0: addons
+    #     Type 1: addon path
+    #     Type 2: favorites
+    # 6:  Weather Widget
+    #     Type 0: weather hourly
+    #     Type 1: weather daily
+    """
+
+    def __init__(self):
+        self.strings = LOCALIZED.setdefault(xbmc.getLanguage(xbmc.ISO_639_1), {})
+
+    def localize(self, value):
+        if not isinstance(value, int):
+            return value
+        text = self.strings.get(value)
+        if text is None:
+            text = self.strings[value] = ADDON.getLocalizedString(value)
+        return text
+
+    def text(self, entry, field):
+        return self.localize(entry.get(field, ''))
 
     def isAddonWidget(self, cat, type_):
         return cat == 5 and type_ == 0
@@ -609,103 +608,103 @@ class WidgetManager:
         return cat == 0 and type_ == 0
 
     def staticContent(self, cat, type_):
-        return self.types[cat][type_].get('static_content', False)
+        return TYPES[(cat, type_)].get('static_content', False)
 
     def getCategory(self, cat, numbered=False):
-        if cat < 0 or cat >= len(self.categories):
-            return ADDON.getLocalizedString(30116)
-        return (f"{cat+1}. {self.categories[cat]}" if numbered 
-                else self.categories[cat])
+        if cat < 0 or cat >= len(CATEGORIES):
+            return self.localize(30116)
+        category = self.localize(CATEGORIES[cat])
+        return f"{cat+1}. {category}" if numbered else category
 
     def numCategories(self):
-        return len(self.categories)
+        return len(CATEGORIES)
 
     def getType(self, cat, type_):
-        if cat < 0 or cat >= len(self.types) or type_ < 0 or type_ >= len(self.types[cat]):
-            return ADDON.getLocalizedString(30116)
-        return self.types[cat][type_]['header']
+        entry = TYPES.get((cat, type_))
+        if entry is None:
+            return self.localize(30116)
+        return self.text(entry, 'header')
 
     def getWidget(self, cat, type_, style):
         header = self.getType(cat, type_)
-        styles = self.types[cat][type_]['styles']
-        label = styles[style]['label']
+        label = self.text(STYLES[(cat, type_, style)], 'label')
         return f"{header} ({label})" if label else header
 
     def getWidgetIndex(self, cat, type_, style):
-        idx = 0
-        for t_idx, widget in enumerate(self.types[cat]):
-            for s_idx, _ in enumerate(widget['styles']):
-                if t_idx == type_ and s_idx == style:
-                    return idx
-                idx += 1
-        return -1
+        return WIDGET_INDEX.get((cat, type_, style), -1)
 
     def getWidgetItems(self, cat):
         items = []
-        for widget in self.types[cat]:
-            for style in widget['styles']:
-                label = widget['header']
-                if style['label']:
-                    label += f" ({style['label']}, {style['width']}x{style['height']})"
-                li = xbmcgui.ListItem(label=label, label2=widget['description'])
-                items.append(li)
+        for type_, style in WIDGET_LIST[cat]:
+            widget = TYPES[(cat, type_)]
+            style_info = STYLES[(cat, type_, style)]
+            label = self.text(widget, 'header')
+            style_label = self.text(style_info, 'label')
+            if style_label:
+                label += f" ({style_label}, {style_info['width']}x{style_info['height']})"
+            li = xbmcgui.ListItem(label=label, label2=self.text(widget, 'description'))
+            items.append(li)
         return items
 
     def getWidgetDetails(self, cat, idx):
-        count = 0
-        for t_idx, widget in enumerate(self.types[cat]):
-            for s_idx, _ in enumerate(widget['styles']):
-                if count == idx:
-                    return t_idx, s_idx
-                count += 1
+        widgets = WIDGET_LIST[cat]
+        if 0 <= idx < len(widgets):
+            return widgets[idx]
 
     def getSize(self, cat, type_, style):
-        style_info = self.types[cat][type_]['styles'][style]
+        style_info = STYLES[(cat, type_, style)]
         return f"{style_info['width']}x{style_info['height']}px"
 
+    def getWidth(self, cat, type_, style):
+        return STYLES[(cat, type_, style)]['width']
+
+    def getHeight(self, cat, type_, style):
+        return STYLES[(cat, type_, style)]['height']
+
     def getDesc(self, cat, type_):
-        return self.types[cat][type_]['description'] if 0 <= cat < len(self.types) else ''
+        entry = TYPES.get((cat, type_))
+        return self.text(entry, 'description') if entry else ''
 
     def getStyleDesc(self, cat, type_, style):
-        return self.types[cat][type_]['styles'][style]['desc']
+        return self.text(STYLES[(cat, type_, style)], 'desc')
 
     def getStyleWidget(self, cat, type_, style):
-        return self.types[cat][type_]['styles'][style]['widget']
+        return STYLES[(cat, type_, style)]['widget']
 
     def getPath(self, cat, type_):
-        return self.types[cat][type_].get('path', '')
+        return TYPES[(cat, type_)].get('path', '')
 
     def getHeaderAction(self, cat, type_):
-        return self.types[cat][type_].get('headeraction', '')
+        return TYPES[(cat, type_)].get('headeraction', '')
 
     def getLayout(self, cat, type_, style):
-        info = self.types[cat][type_]['styles'][style]
+        info = STYLES[(cat, type_, style)]
         w, h = info['width'], info['height']
         return 'square' if w == h else ('landscape' if w > h else 'portrait')
 
     def hasOnClick(self, cat, type_):
-        return 'onclick' in self.types[cat][type_]
+        return 'onclick' in TYPES[(cat, type_)]
 
     def getOnClick(self, cat, type_):
-        return self.types[cat][type_].get('onclick', '')
+        return TYPES[(cat, type_)].get('onclick', '')
 
     def getSortby(self, cat, type_):
-        return self.types[cat][type_].get('sortby', '')
+        return TYPES[(cat, type_)].get('sortby', '')
 
     def getSortbyDynamic(self, sortby_index):
         return 'lastplayed' if sortby_index == 0 else ''
 
     def getSortorder(self, cat, type_):
-        return self.types[cat][type_].get('sortorder', '')
+        return TYPES[(cat, type_)].get('sortorder', '')
 
     def setLimit(self, cat, type_):
-        return self.types[cat][type_].get('setlimit', False)
+        return TYPES[(cat, type_)].get('setlimit', False)
 
     def hasTarget(self, cat, type_):
-        return 'target' in self.types[cat][type_]
+        return 'target' in TYPES[(cat, type_)]
 
     def getTarget(self, cat, type_):
-        return self.types[cat][type_].get('target', '')
+        return TYPES[(cat, type_)].get('target', '')
 
     def showPlayStatus(self, cat, type_):
         return (cat == 1 and type_ == 2) or (cat == 2 and type_ in (2,3)) or (cat == 4 and type_ == 2)
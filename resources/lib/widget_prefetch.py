@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Background warming of the plugin widget routes.
+
+The service computes the result sets of the widget routes before it bumps
+their reload token, so the plugin invocation triggered by the new token only
+has to build ListItems from the WidgetCache.
+"""
+
+import xbmc
+import xbmcgui
+
+try:
+    from urllib2 import urlparse
+except ImportError:
+    import urllib.parse as urlparse
+
+from resources.lib.helper import *
+from resources.lib.plugin_content import PluginContent
+from resources.lib.widget_cache import WidgetCache
+
+# running at widgets registered as skin strings by WidgetsDataStore.setSkinStrings
+NUM_RUNNINGAT_WIDGETS = 3
+
+class WidgetPrefetcher:
+
+    def __init__(self, win=None, cache=None):
+        self.win = win or xbmcgui.Window(10000)
+        self.cache = cache or WidgetCache(self.win)
+
+    def warm(self, widget, token):
+        """Warms the routes of widget for token, False if one of them failed."""
+        warmed = [self.warmRoute(info, params, token) for info, params in self.routes(widget)]
+        return all(warmed)
+
+    def warmRoute(self, info, params, token=''):
+        """Fetches a route into the cache, False if the fetch failed."""
+        try:
+            pc = PluginContent(pvr_timeout=0)
+            if pc.fetch(info, params):
+                self.cache.put(info, params, pc.data, token)
+                return True
+        except Exception as e:
+            log(f"WidgetPrefetcher: error warming {info} {params}: {e}", xbmc.LOGWARNING)
+        return False
+
+    def warmBroadcasts(self):
+        """Warms the OSD broadcast lists of the playing channel and its neighbours."""
+        if not pvrAvailable(0):
+            return
+        channel_ids = xbmcgui.Window(10700).getProperty('channel_ids')
+        try:
+            channel_num = int(xbmc.getInfoLabel('VideoPlayer.ChannelNumberLabel'))
+        except ValueError:
+            return
+        if not channel_ids:
+            return
+        for num in (channel_num, channel_num + 1, channel_num - 1):
+            self.warmRoute('getbroadcasts', {'channelnum': str(num), 'channelids': channel_ids})
+
+    def routes(self, widget):
+        if widget == 'timers':
+            return [('gettimers', {})]
+        if widget == 'nextepisodes':
+            return [('getnextepisodes', {})]
+        if widget == 'runningat':
+            return self.runningAtRoutes()
+        return []
+
+    def runningAtRoutes(self):
+        routes = []
+        for index in range(NUM_RUNNINGAT_WIDGETS):
+            path = xbmc.getInfoLabel(f'Skin.String(runningat_path_{index})')
+            if not path:
+                continue
+            params = dict(urlparse.parse_qsl(urlparse.urlsplit(path).query))
+            routes.append((params.pop('info', 'getrunningat'), params))
+        return routes
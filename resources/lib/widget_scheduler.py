@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Widget reload scheduler of the service.
+
+Skin widgets reload when their widgetreload-<widget> property of the home
+window changes. Instead of bumping those properties blindly, every widget
+has a policy:
+- a deadline computed from its data, published by the plugin path that
+  filled the widget (e.g. the end of the earliest shown broadcast),
+- the Kodi notifications that make its content stale,
+- a maximum interval as fallback.
+Reload requests are debounced, a burst of notifications within the
+debounce time results in a single reload. If a prefetcher is set, the
+content of a widget is computed before its reload token is bumped, and
+the token is only bumped if that succeeded. Reloads
+of the widgets filled from PVR are held back until the PVR readiness
+reports ready, the service must not wait for PVR within a tick.
+"""
+
+import threading
+import time
+
+import xbmcgui
+
+RELOAD_PROPERTY = 'widgetreload-%s'
+DEADLINE_PROPERTY = 'widgetdeadline-%s'
+
+PVR_NOTIFICATIONS = ('PVR.OnScanFinished', 'PVR.OnCleaned', 'PVR.OnChannelsChanged', 'System.OnWake')
+
+POLICIES = {
+    'runningat': {
+        'debounce': 5,
+        'max_interval': 3600,
+        'notifications': PVR_NOTIFICATIONS,
+        'pvr': True,
+    },
+    'timers': {
+        'debounce': 5,
+        'max_interval': 1800,
+        'notifications': PVR_NOTIFICATIONS,
+        'pvr': True,
+    },
+    'nextepisodes': {
+        'debounce': 2,
+        'max_interval': None,
+        'notifications': ('VideoLibrary.OnScanFinished', 'VideoLibrary.OnCleanFinished', 'VideoLibrary.OnRemove'),
+    },
+}
+
+# seconds until a reload whose prefetch failed is tried again
+RETRY_DELAY = 60
+
+# bounds of the service sleep between two ticks
+MIN_WAKEUP = 1
+MAX_WAKEUP = 60
+
+# slice of monitor.waitForAbort in wait(), reload requests and aborts are
+# checked between two slices
+ABORT_POLL = 0.5
+
+def setReloadDeadline(widget, deadline, win=None):
+    """Publishes the time (epoch) at which the content of a widget gets stale.
+
+    Several widgets may share a reload property (e.g. running at), so an
+    earlier deadline that is still ahead is kept.
+    """
+    if not deadline:
+        return
+    win = win or xbmcgui.Window(10000)
+    prop = DEADLINE_PROPERTY % widget
+    try:
+        current = int(win.getProperty(prop))
+    except ValueError:
+        current = 0
+    if time.time() < current < deadline:
+        return
+    win.setProperty(prop, str(int(deadline)))
+
+class WidgetScheduler:
+
+    def __init__(self, win=None, policies=POLICIES, prefetcher=None, pvr_readiness=None):
+        self.win = win or xbmcgui.Window(10000)
+        self.policies = policies
+        self.prefetcher = prefetcher
+        self.pvr_readiness = pvr_readiness
+        self.pending = {}
+        # set by request(), notifications arrive on another thread than the loop
+        self.requested = threading.Event()
+        now = time.time()
+        self.last_reload = {widget: now for widget in policies}
+
+    def request(self, widget, delay=None):
+        """Schedules a reload, coalescing it with an already pending one."""
+        if widget not in self.policies:
+            return
+        if delay is None:
+            delay = self.policies[widget]['debounce']
+        due = time.time() + delay
+        self.pending[widget] = min(self.pending.get(widget, due), due)
+        self.requested.set()
+
+    def requestAll(self, delay=None):
+        for widget in self.policies:
+            self.request(widget, delay)
+
+    def notify(self, method):
+        for widget, policy in self.policies.items():
+            if method in policy['notifications']:
+                self.request(widget)
+
+    def tick(self, now=None):
+        now = now or time.time()
+        for widget, policy in self.policies.items():
+            deadline = self.deadline(widget)
+            if deadline and deadline <= now:
+                self.request(widget, 0)
+            elif policy['max_interval'] and now - self.last_reload[widget] >= policy['max_interval']:
+                self.request(widget, 0)
+        for widget, due in list(self.pending.items()):
+            if due <= now and not self.heldBack(widget):
+                self.reload(widget, now)
+
+    def heldBack(self, widget):
+        """Whether the reload of widget waits for PVR to get ready."""
+        return bool(self.policies[widget].get('pvr') and self.pvr_readiness and not self.pvr_readiness.isReady())
+
+    def reload(self, widget, now=None):
+        now = now or time.time()
+        self.pending.pop(widget, None)
+        self.last_reload[widget] = now
+        self.win.clearProperty(DEADLINE_PROPERTY % widget)
+        token = time.strftime("%Y%m%d%H%M%S", time.gmtime(now))
+        if self.prefetcher and not self.prefetcher.warm(widget, token):
+            # the widget keeps its current content instead of reloading empty
+            self.request(widget, RETRY_DELAY)
+            return
+        self.win.setProperty(RELOAD_PROPERTY % widget, token)
+
+    def nextWakeup(self, now=None):
+        """Seconds until the next scheduled event, clamped to [MIN_WAKEUP, MAX_WAKEUP].
+
+        Held back widgets have no events, the service wakes up for them with
+        the PVR readiness.
+        """
+        now = now or time.time()
+        events = [due for widget, due in self.pending.items() if not self.heldBack(widget)]
+        for widget, policy in self.policies.items():
+            if self.heldBack(widget):
+                continue
+            deadline = self.deadline(widget)
+            if deadline:
+                events.append(deadline)
+            if policy['max_interval']:
+                events.append(self.last_reload[widget] + policy['max_interval'])
+        if not events:
+            return MAX_WAKEUP
+        return max(MIN_WAKEUP, min(MAX_WAKEUP, min(events) - now))
+
+    def wait(self, timeout, monitor):
+        """Sleeps up to timeout seconds, returns early when a reload is
+        requested so its debounce deadline is honoured. Returns True if Kodi
+        requested an abort.
+
+        The sleep is done in monitor.waitForAbort, Kodi only delivers the
+        callbacks of a Monitor (onNotification) while its thread is in there.
+        """
+        deadline = time.time() + timeout
+        while True:
+            if self.requested.is_set():
+                self.requested.clear()
+                return False
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            if monitor.waitForAbort(min(remaining, ABORT_POLL)):
+                return True
+
+    def deadline(self, widget):
+        try:
+            return int(self.win.getProperty(DEADLINE_PROPERTY % widget))
+        except ValueError:
+            return 0
@@ -3,7 +3,6 @@
 
 import os
 import json
-import xml.etree.ElementTree as ET
 import xbmc
 import xbmcaddon
 import xbmcvfs
@@ -11,6 +10,7 @@ from pathlib import Path
 
 from resources.lib.helper import *
 from resources.lib.widget_manager import WidgetManager
+from resources.lib.xml_writer import XMLWriter
 
 ADDON = xbmcaddon.Addon()
 ADDONID = ADDON.getAddonInfo('id')
@@ -20,22 +20,11 @@ CONFIGPATH = os.path.join(xbmcvfs.translatePath('special://profile/'), 'addon_da
 SKININCLUDEPATH = xbmcvfs.translatePath(os.path.join('special://skin/xml/', 'Includes_Home_Widgetcontent.xml'))
 
 
-def indent(elem, level=0):
-    i = "\n" + level * "  "
-    if len(elem):
-        if not elem.text or not elem.text.strip():
-            elem.text = i + "  "
-        for child in elem:
-            indent(child, level + 1)
-        if not child.tail or not child.tail.strip():
-            child.tail = i
-    if level and (not elem.tail or not elem.tail.strip()):
-        elem.tail = i
-
 class WidgetsDataStore:
     def __init__(self, wm=None):
         self.wm = wm or WidgetManager()
         self.changed = False
+        self.includes_changed = False
         self.widgets = None
         self.xmlWriter = WidgetXMLWriter(self.wm)
 
@@ -65,7 +54,8 @@ class WidgetsDataStore:
         if not self.changed:
             return
         self._save_json()
-        self.xmlWriter.save(self.widgets)
+        # the skin only has to be reloaded if the generated includes differ
+        self.includes_changed = self.xmlWriter.save(self.widgets) or self.includes_changed
         self.changed = False
 
     def _save_json(self):
@@ -107,7 +97,7 @@ class WidgetsDataStore:
         self.loadWidgets()
         self.changed = True
         self.saveWidgets()
-        return True
+        return self.includes_changed
 
     def getWidgetId(self, cat, type):
         widget_id = 500
@@ -178,65 +168,67 @@ class WidgetXMLWriter:
         self.wm = wm
 
     def save(self, widgets):
-        root = ET.Element('includes')
-        include_widget_content = ET.SubElement(root, 'include', name='home_widget_content')
-        include_widget_anchor = ET.SubElement(root, 'include', name='home_widget_anchors')
-
-        widget_id = 500
-        for widget in widgets:
-            if not widget['visible']:
-                continue
-            self.widgetItem(include_widget_content, widget, widget_id)
-            self.widgetAnchor(include_widget_anchor, widget, widget_id, len(widgets))
+        """Writes the widget includes, returns False if they are unchanged."""
+        visible = [widget for widget in widgets if widget['visible']]
+        xml = XMLWriter()
+        xml.start('includes')
+        xml.start('include', name='home_widget_content')
+        for widget_id, widget in enumerate(visible, 500):
+            self.widgetItem(xml, widget, widget_id)
+        xml.end()
+        xml.start('include', name='home_widget_anchors')
+        for widget_id, widget in enumerate(visible, 500):
+            self.widgetAnchor(xml, widget, widget_id, len(widgets))
+        xml.end()
+        for widget_id, widget in enumerate(visible, 500):
             if self.wm.isAddonWidget(widget['category'], widget['type']):
-                self.writeStaticContent(root, widget, widget_id)
-            widget_id += 1
-
-        self.createWidgetHeaderCond(root, widgets)
-        indent(root)
-        tree = ET.ElementTree(root)
-        tree.write(SKININCLUDEPATH, encoding='utf-8', xml_declaration=True, method="xml")
-
-    def widgetItem(self, parent, widget, id):
-        item = ET.SubElement(parent, 'include', content='widget_mainmenu')
-        self.setParam(item, 'id', id)
+                self.writeStaticContent(xml, widget, widget_id)
+        self.createWidgetHeaderCond(xml, widgets)
+        xml.end()
+        return write_if_changed(SKININCLUDEPATH, xml.getvalue())
+
+    def widgetItem(self, xml, widget, id):
+        xml.start('include', content='widget_mainmenu')
+        self.setParam(xml, 'id', id)
         header = widget['header']
         if header.isdigit():
             header = ADDON.getLocalizedString(int(header))
-        self.setParam(item, 'header', header)
+        self.setParam(xml, 'header', header)
         if self.wm.setLimit(widget['category'], widget['type']):
-            self.setParam(item, 'limit', widget['limit'])
-        self.setParam(item, 'type', self.wm.getStyleWidget(widget['category'], widget['type'], widget['style']))
-        self.setParam(item, 'itemwidth', self.wm.getWidth(widget['category'], widget['type'], widget['style']))
-        self.setParam(item, 'height', self.wm.getHeight(widget['category'], widget['type'], widget['style']))
+            self.setParam(xml, 'limit', widget['limit'])
+        self.setParam(xml, 'type', self.wm.getStyleWidget(widget['category'], widget['type'], widget['style']))
+        self.setParam(xml, 'itemwidth', self.wm.getWidth(widget['category'], widget['type'], widget['style']))
+        self.setParam(xml, 'height', self.wm.getHeight(widget['category'], widget['type'], widget['style']))
         path = self.getPath(widget)
         if self.wm.isAddonWidget(widget['category'], widget['type']):
             path += '-' + str(id)
-        self.setParam(item, 'path', path)
+        self.setParam(xml, 'path', path)
         if self.wm.staticContent(widget['category'], widget['type']):
-            self.setParam(item, 'static_content', 'true')
+            self.setParam(xml, 'static_content', 'true')
         if self.wm.hasOnClick(widget['category'], widget['type']):
-            self.setParam(item, 'onclick', self.wm.getOnClick(widget['category'], widget['type']))
-            self.setParam(item, 'useonclick', 'true')
+            self.setParam(xml, 'onclick', self.wm.getOnClick(widget['category'], widget['type']))
+            self.setParam(xml, 'useonclick', 'true')
         if self.wm.isOrderableWidget(widget['category'], widget['type']):
-            self.setParam(item, 'sortby', self.wm.getSortbyDynamic(widget['sortby']))
+            self.setParam(xml, 'sortby', self.wm.getSortbyDynamic(widget['sortby']))
         else:
-            self.setParam(item, 'sortby', self.wm.getSortby(widget['category'], widget['type']))
-        self.setParam(item, 'sortorder', self.wm.getSortorder(widget['category'], widget['type']))
+            self.setParam(xml, 'sortby', self.wm.getSortby(widget['category'], widget['type']))
+        self.setParam(xml, 'sortorder', self.wm.getSortorder(widget['category'], widget['type']))
         if self.wm.hasTarget(widget['category'], widget['type']):
-            self.setParam(item, 'target', self.wm.getTarget(widget['category'], widget['type']))
+            self.setParam(xml, 'target', self.wm.getTarget(widget['category'], widget['type']))
         if self.wm.showPlayStatus(widget['category'], widget['type']):
-            self.setParam(item, 'showplaystatus', 'true')
-
-    def widgetAnchor(self, parent, widget, id, total):
-        anchor = ET.SubElement(parent, 'control', type='button', id=str(id) + '777')
-        ET.SubElement(anchor, 'visible', allowhiddenfocus='true').text = 'false'
-        ET.SubElement(anchor, 'onright').text = f'SetProperty(active_channel,{id})'
-        ET.SubElement(anchor, 'onright').text = str(id)
-        ET.SubElement(anchor, 'onleft').text = '9001'
-        ET.SubElement(anchor, 'onup').text = '9001' if id == 500 else f'SetFocus({id - 1})'
-        ET.SubElement(anchor, 'ondown').text = 'SetFocus(500)' if id == (500 + total - 1) else f'SetFocus({id + 1})'
-        ET.SubElement(anchor, 'onclick').text = self.getOnClick(widget)
+            self.setParam(xml, 'showplaystatus', 'true')
+        xml.end()
+
+    def widgetAnchor(self, xml, widget, id, total):
+        xml.start('control', type='button', id=str(id) + '777')
+        xml.element('visible', 'false', allowhiddenfocus='true')
+        xml.element('onright', f'SetProperty(active_channel,{id})')
+        xml.element('onright', str(id))
+        xml.element('onleft', '9001')
+        xml.element('onup', '9001' if id == 500 else f'SetFocus({id - 1})')
+        xml.element('ondown', 'SetFocus(500)' if id == (500 + total - 1) else f'SetFocus({id + 1})')
+        xml.element('onclick', self.getOnClick(widget))
+        xml.end()
 
     def getOnClick(self, widget):
         cat = widget['category']
@@ -264,22 +256,26 @@ class WidgetXMLWriter:
             return widget['addonpath']['path']
         return self.wm.getPath(cat, type)
 
-    def setParam(self, parent, name, value):
-        ET.SubElement(parent, 'param', name=name).text = encode4XML(str(value))
+    def setParam(self, xml, name, value):
+        xml.element('param', str(value), name=name)
 
-    def writeStaticContent(self, parent, widget, widget_id):
-        include_item = ET.SubElement(parent, 'include', name=self.getPath(widget) + '-' + str(widget_id))
-        content_item = ET.SubElement(include_item, 'content')
+    def writeStaticContent(self, xml, widget, widget_id):
+        xml.start('include', name=self.getPath(widget) + '-' + str(widget_id))
+        xml.start('content')
         for addon in widget['addons']:
-            item = ET.SubElement(content_item, 'item')
-            ET.SubElement(item, 'label').text = encode4XML(addon['name'])
-            ET.SubElement(item, 'thumb').text = encode4XML(addon['thumb'])
-            ET.SubElement(item, 'onclick').text = encode4XML(f"RunAddon({addon['id']})")
-
-    def createWidgetHeaderCond(self, parent, widgets):
+            xml.start('item')
+            xml.element('label', addon['name'])
+            xml.element('thumb', addon['thumb'])
+            xml.element('onclick', f"RunAddon({addon['id']})")
+            xml.end()
+        xml.end()
+        xml.end()
+
+    def createWidgetHeaderCond(self, xml, widgets):
         cond = 'ControlGroup(9002).HasFocus'
         ids = [f'Control.HasFocus({500 + i}777)' for i, w in enumerate(widgets) if w['visible']]
         if ids:
             cond += ' | ' + ' | '.join(ids)
-        include_item = ET.SubElement(parent, 'include', name='cond_show_updown_arrows')
-        ET.SubElement(include_item, 'visible').text = cond
+        xml.start('include', name='cond_show_updown_arrows')
+        xml.element('visible', cond)
+        xml.end()
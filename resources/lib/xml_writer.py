@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming writer for the skin include files.
+
+Elements are emitted pretty-printed in document order as they are opened,
+without building a tree and indenting it afterwards. Text and attribute
+values are passed unescaped and escaped exactly once here. The output
+matches ElementTree with the former indent() helper, apart from childless
+elements written with start()/end() that ElementTree would collapse to
+<tag />.
+"""
+
+from xml.sax.saxutils import escape
+
+ATTR_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#09;'}
+
+class XMLWriter:
+
+    def __init__(self, indent='  '):
+        self.indent = indent
+        self.parts = ["<?xml version='1.0' encoding='utf-8'?>\n"]
+        self.stack = []
+
+    def start(self, tag, **attrs):
+        self.parts.append(f'{self.indent * len(self.stack)}<{tag}{self.attributes(attrs)}>\n')
+        self.stack.append(tag)
+
+    def end(self):
+        tag = self.stack.pop()
+        self.parts.append(f'{self.indent * len(self.stack)}</{tag}>' + ('\n' if self.stack else ''))
+
+    def element(self, tag, text=None, **attrs):
+        """A leaf element, <tag /> if text is None or empty."""
+        pad = self.indent * len(self.stack)
+        if text is None or text == '':
+            self.parts.append(f'{pad}<{tag}{self.attributes(attrs)} />\n')
+        else:
+            self.parts.append(f'{pad}<{tag}{self.attributes(attrs)}>{escape(str(text))}</{tag}>\n')
+
+    def attributes(self, attrs):
+        return ''.join(f' {name}="{escape(str(value), ATTR_ENTITIES)}"' for name, value in attrs.items())
+
+    def getvalue(self):
+        """The document as utf-8 bytes, all elements have to be closed."""
+        if self.stack:
+            raise ValueError(f'unclosed elements: {self.stack}')
+        return ''.join(self.parts).encode('utf-8')
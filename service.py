@@ -1,23 +1,39 @@
 #!/usr/bin/python
 from resources.lib.helper import *
 from resources.lib.kodi_monitor import KodiMonitor
+from resources.lib.epg_store import EpgSync
+from resources.lib.widget_scheduler import WidgetScheduler
+from resources.lib.widget_prefetch import WidgetPrefetcher
+from resources.lib.pvr_state import PVRReadiness
 import xbmcgui
 import time
 
 WIN = xbmcgui.Window(10000)
-MONITOR = KodiMonitor(win=WIN)
-REFRESH_INTERVAL = 10
+PVR_READINESS = PVRReadiness(WIN)
+EPG_SYNC = EpgSync()
+PREFETCHER = WidgetPrefetcher(WIN)
+SCHEDULER = WidgetScheduler(WIN, prefetcher=PREFETCHER, pvr_readiness=PVR_READINESS)
+MONITOR = KodiMonitor(win=WIN, epg_sync=EPG_SYNC, scheduler=SCHEDULER, prefetcher=PREFETCHER, pvr_readiness=PVR_READINESS)
+EPG_SYNC_INTERVAL = 60
+STARTUP_WARM_DELAY = 10
 
-refresh = 0
+# serve the widgets of the home screen from warm data after startup
+SCHEDULER.requestAll(STARTUP_WARM_DELAY)
+
+next_epg_sync = 0
 while not MONITOR.abortRequested():
-    if refresh > REFRESH_INTERVAL:
-        WIN.setProperty("widgetreload-timers", time.strftime("%Y%m%d%H%M%S", time.gmtime()))
-        WIN.setProperty("widgetreload-runningat", time.strftime("%Y%m%d%H%M%S", time.gmtime()))
-        refresh = 0
-    else:
-        refresh += 1
-    # sleep for 60 seconds
-    MONITOR.waitForAbort(60)
+    pvr_ready = PVR_READINESS.tick()
+    if pvr_ready and time.time() >= next_epg_sync:
+        EPG_SYNC.tick()
+        next_epg_sync = time.time() + EPG_SYNC_INTERVAL
+    SCHEDULER.tick()
+    flush_trace()
+    # sleep until the next widget deadline, epg sync or pvr probe is due
+    wakeup = min(SCHEDULER.nextWakeup(), max(next_epg_sync - time.time(), 1))
+    # a reload requested by a notification wakes the loop up early
+    SCHEDULER.wait(min(wakeup, PVR_READINESS.nextWakeup() or wakeup), MONITOR)
 
+PVR_READINESS.close()
+EPG_SYNC.store.close()
 del MONITOR
 del WIN